@@ -2,15 +2,22 @@
 """
 Auction Bid Button Finder
 Tests if the bid button is present in a Copart auction dashboard
-Usage: python auction_bid_button_finder.py <auction_id>
+Usage: python auction_bid_button_finder.py <auction_id> [<auction_id> ...]
 Example: python auction_bid_button_finder.py 366-A
 """
 
 import asyncio
-import json
 import os
 import sys
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auction_monitor'))
+from context_pool import ContextPool
+from session_store import SessionStore
+from navigation import goto_ready, COPART_LOGIN, COPART_AUCTION
+from selector_race import race
+
+session_store = SessionStore()
 
 def load_env():
     """Load environment variables from .env file"""
@@ -22,29 +29,6 @@ def load_env():
                     key, value = line.split('=', 1)
                     os.environ[key.strip()] = value.strip()
 
-async def save_session_cookies(context):
-    """Save authentication cookies for session persistence"""
-    try:
-        cookies = await context.cookies()
-        with open('copart_session.json', 'w') as f:
-            json.dump(cookies, f, indent=2)
-        print('Session cookies saved')
-    except Exception as e:
-        print(f'Failed to save session cookies: {e}')
-
-async def load_session_cookies(context):
-    """Load saved session cookies"""
-    try:
-        if os.path.exists('copart_session.json'):
-            with open('copart_session.json', 'r') as f:
-                cookies = json.load(f)
-            await context.add_cookies(cookies)
-            print('Session cookies loaded')
-            return True
-    except Exception as e:
-        print(f'Failed to load session cookies: {e}')
-    return False
-
 async def login_to_copart(page, context):
     """Login to Copart with session reuse"""
     USERNAME = os.environ.get('COPART_USERNAME')
@@ -53,23 +37,12 @@ async def login_to_copart(page, context):
     if not USERNAME or not PASSWORD:
         raise ValueError("COPART_USERNAME and COPART_PASSWORD environment variables must be set")
 
-    # Try to load saved session first
-    if await load_session_cookies(context):
-        print('Attempting to use saved session...')
-        await page.goto("https://www.copart.com/dashboard", timeout=60000)
-        await asyncio.sleep(2)
-
-        # Check if we're logged in by checking if we stayed on dashboard (not redirected to login)
-        current_url = page.url
-        if 'login' not in current_url.lower():
-            print('Successfully logged in using saved session')
-            return
-        else:
-            print('Session expired - redirected to login, proceeding with fresh login')
+    # Reuse the shared saved session; no verification page load while it was verified recently
+    if await session_store.resume(context):
+        return
 
     print('Logging in to Copart...')
-    await page.goto("https://www.copart.com/login", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
+    await goto_ready(page, "https://www.copart.com/login", COPART_LOGIN)
 
     # Handle cookie consent
     try:
@@ -90,180 +63,173 @@ async def login_to_copart(page, context):
     print("Login successful!")
 
     # Save session cookies for future use
-    await save_session_cookies(context)
+    await session_store.save_context(context)
+
+async def find_bid_button(page, auction_id):
+    """Open the auction dashboard on a logged-in page and find/highlight the bid button"""
+    auction_url = f"https://www.copart.com/auctionDashboard?auctionDetails={auction_id}"
+    print(f'Navigating to: {auction_url}')
+    await goto_ready(page, auction_url, COPART_AUCTION)
+    print(f'Current URL after navigation: {page.url}')
+    print(f'Page title: {await page.title()}')
+    # Take screenshot for debugging
+    await page.screenshot(path='debug_auction_page.png')
+    print('Screenshot saved as debug_auction_page.png')
+
+    # Wait for iframe to be present in DOM
+    print('Waiting for auction iframe to load...')
+    await page.wait_for_selector('iframe[src*="g2auction.copart.com"]', timeout=30000)
+    print('Iframe element found in DOM')
+
+    # Find iframe
+    target_frame = None
+    frames = page.frames
+    for frame in frames:
+        if 'g2auction.copart.com' in frame.url:
+            target_frame = frame
+            break
+
+    if not target_frame:
+        print("❌ Auction iframe not found by URL")
+        # Try to find any iframe and wait for it to load
+        try:
+            all_iframes = page.locator('iframe')
+            iframe_count = await all_iframes.count()
+            print(f"Found {iframe_count} iframes on page")
+            if iframe_count > 0:
+                # Wait for first iframe to load
+                first_iframe = all_iframes.first
+                await page.wait_for_timeout(5000)  # Wait 5 seconds
+                frames = page.frames
+                for frame in frames:
+                    if frame != page.main_frame and frame.url:
+                        print(f"Frame URL: {frame.url}")
+                        if 'g2auction' in frame.url:
+                            target_frame = frame
+                            break
+        except Exception as e:
+            print(f"Error checking iframes: {e}")
+        if not target_frame:
+            return
+
+    print(f"✅ Found auction iframe: {target_frame.url}")
+    # Wait for frame content to load
+    await target_frame.wait_for_load_state('domcontentloaded', timeout=60000)
+    print("Frame content loaded")
+
+    # Debug: Print iframe HTML snippet to check for nested iframes
+    iframe_html = await target_frame.content()
+    print(f"Target frame HTML snippet: {iframe_html[:2000]}")
+
+    # Debug: Check iframes
+    iframe_count = await page.locator('iframe[src*="g2auction.copart.com"]').count()
+    print(f"📊 Iframes with g2auction src found: {iframe_count}")
+
+    # Check for sub-iframes in the target_frame
+    sub_iframes = await target_frame.locator('iframe').all()
+    print(f"📊 Sub-iframes in auction iframe: {len(sub_iframes)}")
+
+    button_frame = target_frame  # Default to target_frame
+
+    candidate_frames = []
+    for i, sub_iframe_locator in enumerate(sub_iframes):
+        try:
+            sub_frame = await sub_iframe_locator.content_frame()
+            if sub_frame:
+                print(f"  Sub-iframe {i}: {sub_frame.url}")
+                candidate_frames.append((f"sub-iframe {i}", sub_frame))
+        except Exception as e:
+            print(f"Error accessing sub-iframe {i}: {e}")
+    candidate_frames.append(("main auction iframe", target_frame))
+
+    # Wait for the bid button in every frame at once instead of 5s per sub-iframe before the main frame
+    print("Waiting for bid button in all auction frames...")
+    frame_name, _ = await race(((name, frame.locator('button[data-uname="bidCurrentLot"]').first)
+                                for name, frame in candidate_frames), timeout=30000)
+    if not frame_name:
+        print("❌ Bid button not found in any auction frame")
+        return
+    button_frame = dict(candidate_frames)[frame_name]
+    bid_button = button_frame.locator('button[data-uname="bidCurrentLot"]')
+    print(f"✅ Bid button found in {frame_name}")
+
+    # Check count
+    count = await bid_button.count()
+    print(f"📊 Bid button elements found: {count}")
+
+    if count > 0:
+        bid_button = bid_button.first
+        is_visible = await bid_button.is_visible(timeout=2000)
+        print(f"👁️ Button visibility: {is_visible}")
+
+        button_text = await bid_button.text_content()
+        print(f"📋 Button text: '{button_text}'")
+
+        button_outer_html = await bid_button.evaluate('element => element.outerHTML')
+        print(f"📋 Button outer HTML: '{button_outer_html}'")
+
+        # Highlight the bid button by changing its color
+        try:
+            print("🎨 Highlighting bid button...")
+            await bid_button.evaluate("""
+                (element) => {
+                    console.log('🎨 Starting bid button highlighting...');
+                    const originalStyles = {
+                        backgroundColor: element.style.backgroundColor,
+                        border: element.style.border,
+                        color: element.style.color,
+                        background: element.style.background
+                    };
+                    console.log('Original styles stored:', originalStyles);
+
+                    // Apply bright highlighting
+                    element.style.setProperty('background-color', '#00ff00', 'important');
+                    element.style.setProperty('border', '3px solid #ff0000', 'important');
+                    element.style.setProperty('color', '#000000', 'important');
+                    element.style.setProperty('font-weight', 'bold', 'important');
+
+                    console.log('✅ Bid button highlighting applied');
+
+                    // Reset after 3 seconds
+                    setTimeout(() => {
+                        console.log('🔄 Resetting bid button to original state...');
+                        element.style.setProperty('background-color', originalStyles.backgroundColor, 'important');
+                        element.style.setProperty('border', originalStyles.border, 'important');
+                        element.style.setProperty('color', originalStyles.color, 'important');
+                        element.style.setProperty('font-weight', '', 'important');
+                        console.log('✅ Bid button reset complete');
+                    }, 3000);
+                }
+            """)
+            print("🎨 Bid button highlighting script executed successfully")
+        except Exception as e:
+            print(f"❌ Could not highlight bid button: {e}")
+
+        # Keep browser open to see the color change
+        print("🔍 Browser will remain open for 10 seconds to view the color change...")
+        await asyncio.sleep(10)
+        print("🔍 Done with this auction")
 
 async def main():
-    if len(sys.argv) != 2:
-        print("Usage: python auction_bid_button_finder.py <auction_id>")
+    if len(sys.argv) < 2:
+        print("Usage: python auction_bid_button_finder.py <auction_id> [<auction_id> ...]")
         print("Example: python auction_bid_button_finder.py 366-A")
         sys.exit(1)
 
-    auction_id = sys.argv[1]
     load_env()
+    # Browser launch and login happen once; each further auction starts on a warm, logged-in page
+    pool = ContextPool(login_to_copart, size=1)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
-        page = await context.new_page()
-
-        try:
-            await login_to_copart(page, context)
-            
-            auction_url = f"https://www.copart.com/auctionDashboard?auctionDetails={auction_id}"
-            print(f'Navigating to: {auction_url}')
-            await page.goto(auction_url, timeout=60000)
-            await page.wait_for_load_state('load', timeout=30000)
-            print(f'Current URL after navigation: {page.url}')
-            print(f'Page title: {await page.title()}')
-            # Take screenshot for debugging
-            await page.screenshot(path='debug_auction_page.png')
-            print('Screenshot saved as debug_auction_page.png')
-
-            # Wait for iframe to be present in DOM
-            print('Waiting for auction iframe to load...')
-            await page.wait_for_selector('iframe[src*="g2auction.copart.com"]', timeout=30000)
-            print('Iframe element found in DOM')
-
-            # Find iframe
-            target_frame = None
-            frames = page.frames
-            for frame in frames:
-                if 'g2auction.copart.com' in frame.url:
-                    target_frame = frame
-                    break
-
-            if not target_frame:
-                print("❌ Auction iframe not found by URL")
-                # Try to find any iframe and wait for it to load
-                try:
-                    all_iframes = page.locator('iframe')
-                    iframe_count = await all_iframes.count()
-                    print(f"Found {iframe_count} iframes on page")
-                    if iframe_count > 0:
-                        # Wait for first iframe to load
-                        first_iframe = all_iframes.first
-                        await page.wait_for_timeout(5000)  # Wait 5 seconds
-                        frames = page.frames
-                        for frame in frames:
-                            if frame != page.main_frame and frame.url:
-                                print(f"Frame URL: {frame.url}")
-                                if 'g2auction' in frame.url:
-                                    target_frame = frame
-                                    break
-                except Exception as e:
-                    print(f"Error checking iframes: {e}")
-                if not target_frame:
-                    return
-
-            print(f"✅ Found auction iframe: {target_frame.url}")
-            # Wait for frame content to load
-            await target_frame.wait_for_load_state('domcontentloaded', timeout=60000)
-            print("Frame content loaded")
-
-            # Debug: Print iframe HTML snippet to check for nested iframes
-            iframe_html = await target_frame.content()
-            print(f"Target frame HTML snippet: {iframe_html[:2000]}")
-
-            # Debug: Check iframes
-            iframe_count = await page.locator('iframe[src*="g2auction.copart.com"]').count()
-            print(f"📊 Iframes with g2auction src found: {iframe_count}")
-
-            # Check for sub-iframes in the target_frame
-            sub_iframes = await target_frame.locator('iframe').all()
-            print(f"📊 Sub-iframes in auction iframe: {len(sub_iframes)}")
-
-            button_frame = target_frame  # Default to target_frame
-            bid_button_found = False
-
-            for i, sub_iframe_locator in enumerate(sub_iframes):
-                try:
-                    sub_frame = await sub_iframe_locator.content_frame()
-                    if sub_frame:
-                        print(f"  Sub-iframe {i}: {sub_frame.url}")
-                        # Try to find button in sub_frame
-                        bid_button = sub_frame.locator('button[data-uname="bidCurrentLot"]')
-                        try:
-                            await bid_button.wait_for(timeout=5000)
-                            print("✅ Found bid button in sub-iframe")
-                            button_frame = sub_frame
-                            bid_button_found = True
-                            break
-                        except PlaywrightTimeoutError:
-                            print("❌ Bid button not in sub-iframe")
-                except Exception as e:
-                    print(f"Error accessing sub-iframe {i}: {e}")
-
-            if not bid_button_found:
-                print("Checking for bid button in main auction iframe...")
-                bid_button = target_frame.locator('button[data-uname="bidCurrentLot"]')
-                try:
-                    await bid_button.wait_for(timeout=30000)
-                    print("✅ Bid button found in main auction iframe")
-                except PlaywrightTimeoutError:
-                    print("❌ Bid button not found in main auction iframe either")
-                    return
-
-            # Check count
-            count = await bid_button.count()
-            print(f"📊 Bid button elements found: {count}")
-
-            if count > 0:
-                bid_button = bid_button.first
-                is_visible = await bid_button.is_visible(timeout=2000)
-                print(f"👁️ Button visibility: {is_visible}")
-
-                button_text = await bid_button.text_content()
-                print(f"📋 Button text: '{button_text}'")
-
-                button_outer_html = await bid_button.evaluate('element => element.outerHTML')
-                print(f"📋 Button outer HTML: '{button_outer_html}'")
-
-                # Highlight the bid button by changing its color
-                try:
-                    print("🎨 Highlighting bid button...")
-                    await bid_button.evaluate("""
-                        (element) => {
-                            console.log('🎨 Starting bid button highlighting...');
-                            const originalStyles = {
-                                backgroundColor: element.style.backgroundColor,
-                                border: element.style.border,
-                                color: element.style.color,
-                                background: element.style.background
-                            };
-                            console.log('Original styles stored:', originalStyles);
-
-                            // Apply bright highlighting
-                            element.style.setProperty('background-color', '#00ff00', 'important');
-                            element.style.setProperty('border', '3px solid #ff0000', 'important');
-                            element.style.setProperty('color', '#000000', 'important');
-                            element.style.setProperty('font-weight', 'bold', 'important');
-
-                            console.log('✅ Bid button highlighting applied');
-
-                            // Reset after 3 seconds
-                            setTimeout(() => {
-                                console.log('🔄 Resetting bid button to original state...');
-                                element.style.setProperty('background-color', originalStyles.backgroundColor, 'important');
-                                element.style.setProperty('border', originalStyles.border, 'important');
-                                element.style.setProperty('color', originalStyles.color, 'important');
-                                element.style.setProperty('font-weight', '', 'important');
-                                console.log('✅ Bid button reset complete');
-                            }, 3000);
-                        }
-                    """)
-                    print("🎨 Bid button highlighting script executed successfully")
-                except Exception as e:
-                    print(f"❌ Could not highlight bid button: {e}")
-
-                # Keep browser open to see the color change
-                print("🔍 Browser will remain open for 10 seconds to view the color change...")
-                await asyncio.sleep(10)
-                print("🔍 Closing browser...")
-
-        except Exception as e:
-            print(f"Error: {e}")
-        finally:
-            await browser.close()
+    try:
+        for auction_id in sys.argv[1:]:
+            started = time.perf_counter()
+            async with pool.lease() as leased:
+                print(f'Logged-in page ready in {time.perf_counter() - started:.2f}s')
+                await find_bid_button(leased.page, auction_id)
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        await pool.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Copart Auction Monitor Web Application - async server mode
+aiohttp + python-socketio AsyncServer: HTTP routes, Socket.IO and every auction monitor run on
+one event loop, so requests await monitor commands directly instead of creating loops or blocking threads.
+Same API and dashboard as app_simple.py.
+
+Usage: python app_async.py
+"""
+
+import asyncio
+import os
+import time
+from aiohttp import web
+import socketio
+from monitor_simple import AuctionMonitor, copart_login, selector_cache
+from monitor_manager import MonitorManager, auction_id_from_url
+from event_store import query_history, list_lots
+from metrics import (MetricsRegistry, manager_collector, outbox_collector, context_pool_collector,
+                     selector_cache_collector)
+from context_pool import ContextPool, POOL_SIZE
+from outbox import EmitOutbox
+from state_stream import (AsyncStateWaiter, catch_up, etag_for, version_from_request, sse_updates, sent_version,
+                          KEEPALIVE_SECONDS, LONG_POLL_SECONDS)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+sio = socketio.AsyncServer(cors_allowed_origins='*', async_mode='aiohttp')
+app = web.Application()
+sio.attach(app)
+routes = web.RouteTableDef()
+
+
+# Monitors keep their synchronous emit(): it only queues into per-client outboxes, and a task on the
+# shared loop sends the coalesced updates
+outbox = EmitOutbox()
+manager = MonitorManager(outbox)
+context_pool = ContextPool(copart_login)  # logged-in contexts for one-off actions (warm if AUCTION_CONTEXT_POOL_SIZE > 0)
+
+metrics = MetricsRegistry()
+metrics.register(manager_collector(manager))
+metrics.register(outbox_collector(outbox))
+metrics.register(context_pool_collector(context_pool))
+metrics.register(selector_cache_collector(selector_cache))
+
+
+async def read_json(request):
+    """Request body as a dict (empty for missing or non-JSON bodies)"""
+    if request.can_read_body:
+        try:
+            data = await request.json()
+            return data if isinstance(data, dict) else {}
+        except ValueError:
+            pass
+    if request.content_type == 'application/x-www-form-urlencoded':
+        return dict(await request.post())
+    return {}
+
+
+def query_arg(request, name, default=None, type=str):
+    """Query parameter converted with `type`; `default` when missing or unparsable (Flask's args.get(type=))"""
+    if name not in request.query:
+        return default
+    try:
+        return type(request.query[name])
+    except ValueError:
+        return default
+
+
+def request_monitor(request, data):
+    """Monitor addressed by the request's auction_id, or the first active monitor"""
+    return manager.get_monitor(data.get('auction_id') or request.query.get('auction_id'))
+
+
+def active_monitor_or_error(monitor):
+    if not monitor:
+        return web.json_response({'success': False, 'message': 'No monitor instance available'})
+    if not monitor.is_monitoring:
+        return web.json_response({'success': False, 'message': 'No active auction monitoring'})
+    return None
+
+
+# ---- Socket.IO events ----
+
+@sio.event
+async def connect(sid, environ):
+    print('Client connected')
+    outbox.add_client(sid)
+    await sio.emit('status', {'message': 'Connected to auction monitor'}, to=sid)
+    # New clients start from a snapshot of every auction, then apply versioned deltas
+    for monitor in list(manager.monitors.values()):
+        await sio.emit('auction_snapshot', monitor.get_state_snapshot(), to=sid)
+
+
+@sio.event
+async def disconnect(sid):
+    print('Client disconnected')
+    outbox.remove_client(sid)
+
+
+@sio.event
+async def request_status(sid, data=None):
+    monitor = manager.get_monitor()
+    if monitor:
+        await sio.emit('auction_snapshot', monitor.get_state_snapshot(), to=sid)
+    else:
+        await sio.emit('auction_update', {'is_monitoring': False, 'current_auction': None, 'last_update': None},
+                       to=sid)
+
+
+@sio.event
+async def request_snapshot(sid, data):
+    """Client missed a version: replay the deltas it lacks, or send a snapshot if they are gone"""
+    data = data if isinstance(data, dict) else {}
+    monitor = manager.get_monitor(data.get('auction_id'))
+    if not monitor:
+        # Always answer: the client ignores deltas for this auction until it hears back
+        await sio.emit('auction_unknown', {'auction_id': data.get('auction_id')}, to=sid)
+        return
+    deltas = monitor.state.deltas_since(int(data.get('version') or 0))
+    if not deltas:
+        await sio.emit('auction_snapshot', monitor.get_state_snapshot(), to=sid)
+        return
+    for delta in deltas:
+        await sio.emit('auction_delta', dict(delta, is_monitoring=monitor.is_monitoring,
+                                             last_update=monitor.last_update), to=sid)
+
+
+@sio.event
+async def render_ack(sid, data):
+    """Dashboard rendered a bid change - record the receipt-to-emit, emit-to-render and end-to-end latency"""
+    if not isinstance(data, dict):
+        return
+    monitor = manager.get_monitor(data.get('auction_id'))
+    # Only the first tab to render a change counts, so N open tabs do not record it N times
+    if monitor and monitor.latency.first_ack(data.get('id')):
+        data['ackEpochMs'] = time.time() * 1000
+        monitor.latency.observe(data, stages=('receipt_to_emit', 'emit_to_render_ack', 'source_to_render_ack'))
+
+
+# ---- HTTP routes ----
+
+@routes.get('/')
+async def index(request):
+    """Main dashboard page"""
+    return web.FileResponse(os.path.join(TEMPLATE_DIR, 'index_simple.html'))
+
+
+@routes.get('/api/status')
+async def get_status(request):
+    """Get current monitoring status"""
+    monitor = request_monitor(request, {})
+    return web.json_response({
+        'is_monitoring': monitor.is_monitoring if monitor else False,
+        'current_auction': monitor.current_auction_data if monitor else None,
+        'last_update': monitor.last_update if monitor else None,
+        'auctions': manager.status(),
+        'context_pool': context_pool.status()
+    })
+
+
+@routes.get('/api/state')
+async def get_state(request):
+    """Conditional long-poll: answers once the auction's state version moves past the client's (ETag/?version=)"""
+    monitor = request_monitor(request, {})
+    if not monitor:
+        return web.json_response({'success': False, 'message': 'No monitor instance available'}, status=404)
+
+    waiter = request.app['state_waiter']
+    version = version_from_request(request.query.get('version'), request.headers.get('If-None-Match'), monitor)
+    deadline = time.monotonic() + min(query_arg(request, 'wait', LONG_POLL_SECONDS, float), 60)
+    generation = waiter.generation
+    updates = catch_up(monitor, version)
+    while not updates and time.monotonic() < deadline:
+        generation = await waiter.wait(generation, deadline - time.monotonic())
+        updates = catch_up(monitor, version)
+
+    version = sent_version(updates, version)
+    headers = {'ETag': etag_for(monitor, version), 'Cache-Control': 'no-cache'}
+    if not updates:
+        return web.Response(status=304, headers=headers)
+    return web.json_response({
+        'auction_id': monitor.state.auction_id,
+        'version': version,
+        'updates': [{'event': event, 'data': payload} for event, payload in updates]
+    }, headers=headers)
+
+
+@routes.get('/api/stream')
+async def stream_state(request):
+    """Server-Sent Events: a snapshot per auction, then versioned deltas as they are published"""
+    auction_id = request.query.get('auction_id')
+    waiter = request.app['state_waiter']
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache',
+                                           'X-Accel-Buffering': 'no'})
+    await response.prepare(request)
+    await response.write(b'retry: 3000\n\n')
+
+    versions = {}
+    try:
+        while True:
+            generation = waiter.generation
+            monitors = [(key, monitor) for key, monitor in list(manager.monitors.items())
+                        if not auction_id or key == auction_id]
+            for chunk in sse_updates(versions, monitors):
+                await response.write(chunk.encode('utf-8'))
+            if await waiter.wait(generation, KEEPALIVE_SECONDS) == generation:
+                await response.write(b': keepalive\n\n')
+    except (ConnectionResetError, asyncio.CancelledError):
+        pass
+    return response
+
+
+@routes.post('/api/start')
+async def start_monitoring(request):
+    """Start monitoring an auction (several auctions can be monitored at once)"""
+    data = await read_json(request)
+    auction_url = data.get('auction_url')
+    if not auction_url:
+        return web.json_response({'success': False, 'message': 'Auction URL is required'})
+
+    auction_id = auction_id_from_url(auction_url)
+    existing = manager.get_monitor(auction_id)
+    if existing and existing.is_monitoring:
+        return web.json_response({'success': False, 'message': f'Already monitoring auction {auction_id}'})
+
+    # Browser launch and login can take a while - run them as a task and answer right away
+    task = asyncio.ensure_future(manager.add_auction(auction_url))
+    task.add_done_callback(
+        lambda t: not t.cancelled() and t.exception() and
+        print(f"❌ Failed to start monitoring {auction_id}: {t.exception()}"))
+    return web.json_response({'success': True, 'auction_id': auction_id,
+                              'message': f'Started monitoring: {auction_url}'})
+
+
+@routes.post('/api/stop')
+async def stop_monitoring(request):
+    """Stop monitoring one auction, or all auctions when no auction_id is given"""
+    data = await read_json(request)
+    auction_id = data.get('auction_id')
+
+    if auction_id:
+        if not await manager.remove_auction(auction_id):
+            return web.json_response({'success': False, 'message': f'Not monitoring auction {auction_id}'})
+        return web.json_response({'success': True, 'message': f'Stopped monitoring {auction_id}'})
+
+    await asyncio.gather(*(manager.remove_auction(key) for key in list(manager.monitors)))
+    return web.json_response({'success': True, 'message': 'Stopped monitoring'})
+
+
+@routes.post('/api/bid')
+async def place_bid(request):
+    """Place a bid on the current auction"""
+    data = await read_json(request)
+    monitor = request_monitor(request, data)
+    error = active_monitor_or_error(monitor)
+    if error:
+        return error
+
+    bid_amount = data.get('bid_amount')
+    if not bid_amount:
+        return web.json_response({'success': False, 'message': 'Bid amount is required'})
+    try:
+        bid_amount = float(bid_amount)  # forms send strings
+    except (TypeError, ValueError):
+        return web.json_response({'success': False, 'message': f'Invalid bid amount: {bid_amount}'}, status=400)
+    if bid_amount <= 0:
+        return web.json_response({'success': False, 'message': 'Bid amount must be greater than 0'})
+
+    try:
+        # Same loop as the monitor: the command is awaited, not re-run on a fresh loop
+        success = await monitor._highlight_bid_button_manual()
+        if success:
+            return web.json_response({'success': True, 'message': f'Bid button highlighted for: ${bid_amount}'})
+        return web.json_response({'success': False, 'message': 'Failed to highlight bid button'})
+    except Exception as e:
+        print(f"💥 Bid endpoint error: {str(e)}")
+        return web.json_response({'success': False, 'message': f'Bid failed: {str(e)}'})
+
+
+@routes.post('/api/find_bid_button')
+async def find_bid_button(request):
+    """Run the complete bid button finder functionality"""
+    data = await read_json(request)
+    auction_url = data.get('auction_url')
+    if not auction_url:
+        return web.json_response({'success': False, 'message': 'Auction URL is required'})
+
+    try:
+        # Leases a logged-in context; with a warm pool there is no browser launch or login on the request path
+        async with context_pool.lease() as leased:
+            success = await AuctionMonitor(outbox).find_bid_button(auction_url, leased=leased)
+            if not success:
+                leased.needs_check = True
+        if success:
+            return web.json_response({'success': True, 'message': f'Bid button finder completed for: {auction_url}'})
+        return web.json_response({'success': False, 'message': 'Bid button finder failed'})
+    except Exception as e:
+        print(f"💥 Find bid button endpoint error: {str(e)}")
+        return web.json_response({'success': False, 'message': f'Find bid button failed: {str(e)}'})
+
+
+@routes.post('/api/highlight_bid_button')
+async def highlight_bid_button(request):
+    """Manually highlight the bid button with blue color during active monitoring"""
+    return await _highlight(request, 'bid')
+
+
+@routes.post('/api/highlight_plus_button')
+async def highlight_plus_button(request):
+    """Manually highlight the plus button with red color during active monitoring"""
+    return await _highlight(request, 'plus')
+
+
+async def _highlight(request, button):
+    data = await read_json(request)
+    monitor = request_monitor(request, data)
+    error = active_monitor_or_error(monitor)
+    if error:
+        return error
+
+    try:
+        if button == 'bid':
+            success = await monitor._highlight_bid_button_manual()
+        else:
+            success = await monitor._highlight_plus_button_manual()
+        if success:
+            return web.json_response({'success': True, 'message': 'Bid button highlighted successfully'})
+        return web.json_response({'success': False, 'message': 'Bid button highlight failed'})
+    except Exception as e:
+        print(f"💥 Highlight {button} button endpoint error: {str(e)}")
+        return web.json_response({'success': False, 'message': f'Highlight failed: {str(e)}'})
+
+
+@routes.get('/api/history')
+async def get_history(request):
+    """Recorded bid events for an auction, filtered by lot and epoch-second time range (latest page without since;
+    pass next_since/next_after_id back as since/after_id for the next page)"""
+    auction_id = request.query.get('auction_id')
+    if not auction_id:
+        monitor = manager.get_monitor()
+        auction_id = monitor.event_store.auction_id if monitor and monitor.event_store else None
+    if not auction_id:
+        return web.json_response({'success': False, 'message': 'auction_id is required'}, status=400)
+
+    try:
+        lot_number = request.query.get('lot_number')
+        since = query_arg(request, 'since', type=float)
+        until = query_arg(request, 'until', type=float)
+        after_id = query_arg(request, 'after_id', type=int)
+        limit = min(query_arg(request, 'limit', 1000, int), 10000)
+        loop = asyncio.get_event_loop()
+        # SQLite reads are blocking - keep them off the shared loop
+        page = await loop.run_in_executor(
+            None, lambda: query_history(auction_id, lot_number=lot_number, start=since, end=until, limit=limit,
+                                        after_id=after_id))
+        lots = await loop.run_in_executor(None, list_lots, auction_id) if not lot_number else None
+        return web.json_response({'success': True, 'auction_id': auction_id, 'lots': lots, **page})
+    except Exception as e:
+        print(f"History query failed: {str(e)}")
+        return web.json_response({'success': False, 'message': f'History query failed: {str(e)}'}, status=500)
+
+
+@routes.get('/api/latency')
+async def get_latency(request):
+    """Bid-change latency histograms (p50/p95/p99 per stage) for every monitored auction"""
+    return web.json_response({key: monitor.latency.summary() for key, monitor in list(manager.monitors.items())})
+
+
+@routes.get('/metrics')
+async def get_metrics(request):
+    """Prometheus text-format metrics"""
+    # psutil process walks are blocking; run the scrape off the loop
+    body = await asyncio.get_event_loop().run_in_executor(None, metrics.render)
+    return web.Response(text=body, content_type='text/plain', charset='utf-8')
+
+
+def report_pool_warmup(task):
+    if not task.cancelled() and task.exception():
+        print(f"❌ Context pool warm-up failed (contexts are created on first use): {task.exception()}")
+
+
+async def on_startup(app):
+    manager.use_running_loop()
+    app['state_waiter'] = AsyncStateWaiter()
+    app['outbox_flusher'] = asyncio.ensure_future(
+        outbox.run_forever_async(lambda event, data, sid: sio.emit(event, data, to=sid)))
+    if POOL_SIZE > 0:
+        warmup = asyncio.ensure_future(context_pool.start())
+        warmup.add_done_callback(report_pool_warmup)
+    print("✅ Async server mode: HTTP, Socket.IO and monitors share one event loop")
+
+
+async def on_cleanup(app):
+    outbox.stop()
+    app['outbox_flusher'].cancel()
+    await manager.stop_all()
+    await context_pool.close()
+
+
+app.add_routes(routes)
+app.on_startup.append(on_startup)
+app.on_cleanup.append(on_cleanup)
+
+
+if __name__ == '__main__':
+    web.run_app(app, host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
@@ -6,12 +6,19 @@ Uses polling instead of WebSocket for compatibility
 
 import os
 import asyncio
-import threading
 import time
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
 from flask_socketio import SocketIO, emit
-from monitor_simple import AuctionMonitor
+from monitor_simple import AuctionMonitor, copart_login, selector_cache
+from monitor_manager import MonitorManager, auction_id_from_url
+from event_store import query_history, list_lots
+from metrics import (MetricsRegistry, manager_collector, outbox_collector, context_pool_collector,
+                     selector_cache_collector, CONTENT_TYPE as METRICS_CONTENT_TYPE)
+from context_pool import ContextPool, POOL_SIZE
+from outbox import EmitOutbox
+from state_stream import (StateWaiter, catch_up, etag_for, version_from_request, sse_updates, sent_version,
+                          KEEPALIVE_SECONDS, LONG_POLL_SECONDS)
 
 # Initialize SocketIO first (before decorators)
 socketio = SocketIO(cors_allowed_origins="*", async_mode='threading')
@@ -23,33 +30,69 @@ app.config['SECRET_KEY'] = 'auction-monitor-secret-key'
 # Initialize SocketIO with the app
 socketio.init_app(app)
 
-# Global monitor instance
-monitor = None
-monitor_thread = None
-
 # Store socketio instance for monitor to use
 socketio_instance = socketio
 
+# Monitors emit into per-client outboxes; a background task sends coalesced updates every window
+outbox = EmitOutbox()
+socketio.start_background_task(outbox.run_forever, lambda event, data, sid: socketio.emit(event, data, to=sid),
+                               socketio.sleep)
+
+# All auction monitors run on the manager's event loop and share one browser
+manager = MonitorManager(outbox)
+manager.start_in_thread()
+
+# Logged-in contexts on the manager loop for one-off actions (find bid button); warmed at startup only
+# when AUCTION_CONTEXT_POOL_SIZE > 0, otherwise the first lease logs one in
+context_pool = ContextPool(copart_login)
+
+
+def report_pool_warmup(future):
+    if not future.cancelled() and future.exception():
+        print(f"❌ Context pool warm-up failed (contexts are created on first use): {future.exception()}")
+
+
+if POOL_SIZE > 0:
+    asyncio.run_coroutine_threadsafe(context_pool.start(), manager.loop).add_done_callback(report_pool_warmup)
+
+# Prometheus metrics, collected from the monitors' counters only when scraped
+metrics = MetricsRegistry()
+metrics.register(manager_collector(manager))
+metrics.register(outbox_collector(outbox))
+metrics.register(context_pool_collector(context_pool))
+metrics.register(selector_cache_collector(selector_cache))
+
+# Wakes long-poll and SSE requests when any auction publishes a new state version
+state_waiter = StateWaiter()
+
+
+def get_request_monitor():
+    """Monitor addressed by the request's auction_id, or the first active monitor"""
+    data = request.get_json(silent=True) or {}
+    return manager.get_monitor(data.get('auction_id') or request.args.get('auction_id'))
+
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
     print('Client connected')
+    outbox.add_client(request.sid)
     emit('status', {'message': 'Connected to auction monitor'})
+    # New clients start from a snapshot of every auction, then apply versioned deltas
+    for monitor in list(manager.monitors.values()):
+        emit('auction_snapshot', monitor.get_state_snapshot())
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     print('Client disconnected')
+    outbox.remove_client(request.sid)
 
 @socketio.on('request_status')
 def handle_request_status():
     """Send current status to client"""
+    monitor = manager.get_monitor()
     if monitor:
-        emit('auction_update', {
-            'is_monitoring': monitor.is_monitoring,
-            'current_auction': monitor.current_auction_data,
-            'last_update': monitor.last_update
-        })
+        emit('auction_snapshot', monitor.get_state_snapshot())
     else:
         emit('auction_update', {
             'is_monitoring': False,
@@ -57,6 +100,33 @@ def handle_request_status():
             'last_update': None
         })
 
+@socketio.on('request_snapshot')
+def handle_request_snapshot(data):
+    """Client missed a version: replay the deltas it lacks, or send a snapshot if they are gone"""
+    data = data if isinstance(data, dict) else {}
+    monitor = manager.get_monitor(data.get('auction_id'))
+    if not monitor:
+        # Always answer: the client ignores deltas for this auction until it hears back
+        emit('auction_unknown', {'auction_id': data.get('auction_id')})
+        return
+    deltas = monitor.state.deltas_since(int(data.get('version') or 0))
+    if not deltas:
+        emit('auction_snapshot', monitor.get_state_snapshot())
+    else:
+        for delta in deltas:
+            emit('auction_delta', dict(delta, is_monitoring=monitor.is_monitoring, last_update=monitor.last_update))
+
+@socketio.on('render_ack')
+def handle_render_ack(data):
+    """Dashboard rendered a bid change - record the receipt-to-emit, emit-to-render and end-to-end latency"""
+    if not isinstance(data, dict):
+        return
+    monitor = manager.get_monitor(data.get('auction_id'))
+    # Only the first tab to render a change counts, so N open tabs do not record it N times
+    if monitor and monitor.latency.first_ack(data.get('id')):
+        data['ackEpochMs'] = time.time() * 1000
+        monitor.latency.observe(data, stages=('receipt_to_emit', 'emit_to_render_ack', 'source_to_render_ack'))
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -65,19 +135,67 @@ def index():
 @app.route('/api/status')
 def get_status():
     """Get current monitoring status"""
-    print("API /api/status called")  # Debug logging
+    monitor = get_request_monitor()
     response_data = {
         'is_monitoring': monitor.is_monitoring if monitor else False,
         'current_auction': monitor.current_auction_data if monitor else None,
-        'last_update': monitor.last_update if monitor else None
+        'last_update': monitor.last_update if monitor else None,
+        'auctions': manager.status(),
+        'context_pool': context_pool.status()
     }
-    print(f"Returning status: {response_data}")  # Debug logging
     return jsonify(response_data)
 
+@app.route('/api/state')
+def get_state():
+    """Conditional long-poll: answers once the auction's state version moves past the client's (ETag/?version=)"""
+    monitor = get_request_monitor()
+    if not monitor:
+        return jsonify({'success': False, 'message': 'No monitor instance available'}), 404
+
+    version = version_from_request(request.args.get('version'), request.headers.get('If-None-Match'), monitor)
+    deadline = time.monotonic() + min(request.args.get('wait', LONG_POLL_SECONDS, type=float), 60)
+    generation = state_waiter.generation
+    updates = catch_up(monitor, version)
+    while not updates and time.monotonic() < deadline:
+        generation = state_waiter.wait(generation, deadline - time.monotonic())
+        updates = catch_up(monitor, version)
+
+    version = sent_version(updates, version)
+    if not updates:
+        response = Response(status=304)
+    else:
+        response = jsonify({
+            'auction_id': monitor.state.auction_id,
+            'version': version,
+            'updates': [{'event': event, 'data': payload} for event, payload in updates]
+        })
+    response.headers['ETag'] = etag_for(monitor, version)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/stream')
+def stream_state():
+    """Server-Sent Events: a snapshot per auction, then versioned deltas as they are published"""
+    auction_id = request.args.get('auction_id')
+
+    def generate():
+        versions = {}
+        yield 'retry: 3000\n\n'
+        while True:
+            generation = state_waiter.generation
+            monitors = [(key, monitor) for key, monitor in list(manager.monitors.items())
+                        if not auction_id or key == auction_id]
+            for chunk in sse_updates(versions, monitors):
+                yield chunk
+            if state_waiter.wait(generation, KEEPALIVE_SECONDS) == generation:
+                yield ': keepalive\n\n'
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/start', methods=['POST'])
 def start_monitoring():
-    """Start monitoring an auction"""
-    global monitor, monitor_thread
+    """Start monitoring an auction (several auctions can be monitored at once)"""
     print("🚀🚀🚀 API /api/start called 🚀🚀🚀")  # Debug logging
     import sys
     sys.stdout.flush()  # Force flush
@@ -95,34 +213,20 @@ def start_monitoring():
     if not auction_url:
         return jsonify({'success': False, 'message': 'Auction URL is required'})
 
-    if monitor and monitor.is_monitoring:
-        return jsonify({'success': False, 'message': 'Already monitoring an auction'})
+    auction_id = auction_id_from_url(auction_url)
+    existing = manager.get_monitor(auction_id)
+    if existing and existing.is_monitoring:
+        return jsonify({'success': False, 'message': f'Already monitoring auction {auction_id}'})
 
     try:
-        print(f"📝 Auction URL: {auction_url}")  # Debug logging
-        print(f"🔍 Checking if already monitoring...")  # Debug logging
+        # Schedule the monitor on the shared manager loop; the browser is launched and logged in on first use
+        print(f"🧵 Adding auction {auction_id} to monitor manager...")  # Debug logging
+        future = asyncio.run_coroutine_threadsafe(manager.add_auction(auction_url), manager.loop)
+        future.add_done_callback(
+            lambda f: f.exception() and print(f"❌ Failed to start monitoring {auction_id}: {f.exception()}"))
+        print("✅ Monitoring task scheduled successfully")  # Debug logging
 
-        if monitor and monitor.is_monitoring:
-            print("❌ Already monitoring, returning error")  # Debug logging
-            return jsonify({'success': False, 'message': 'Already monitoring an auction'})
-
-        print("✅ Not already monitoring, proceeding...")  # Debug logging
-        print("🏗️ Creating monitor instance...")  # Debug logging
-
-        # Initialize monitor with socketio instance
-        global socketio_instance
-        socketio_instance = socketio
-        monitor = AuctionMonitor(socketio_instance)
-        print("✅ Monitor created successfully")  # Debug logging
-
-        # Start monitoring in background thread
-        print("🧵 Starting monitoring thread...")  # Debug logging
-        monitor_thread = threading.Thread(target=start_monitoring_thread, args=(auction_url,))
-        monitor_thread.daemon = True
-        monitor_thread.start()
-        print("✅ Monitoring thread started successfully")  # Debug logging
-
-        return jsonify({'success': True, 'message': f'Started monitoring: {auction_url}'})
+        return jsonify({'success': True, 'auction_id': auction_id, 'message': f'Started monitoring: {auction_url}'})
 
     except Exception as e:
         print(f"Error starting monitoring: {str(e)}")  # Debug logging
@@ -132,24 +236,65 @@ def start_monitoring():
 
 @app.route('/api/stop', methods=['POST'])
 def stop_monitoring():
-    """Stop monitoring"""
-    global monitor, monitor_thread
+    """Stop monitoring one auction, or all auctions when no auction_id is given"""
+    data = request.get_json(silent=True) or {}
+    auction_id = data.get('auction_id') or request.form.get('auction_id')
 
-    if monitor:
-        monitor.stop_monitoring()
-        monitor = None
+    if auction_id:
+        stopped = manager.run_coroutine(manager.remove_auction(auction_id), timeout=10)
+        if not stopped:
+            return jsonify({'success': False, 'message': f'Not monitoring auction {auction_id}'})
+        return jsonify({'success': True, 'message': f'Stopped monitoring {auction_id}'})
 
-    if monitor_thread:
-        monitor_thread.join(timeout=5)
-        monitor_thread = None
+    for key in list(manager.monitors):
+        manager.run_coroutine(manager.remove_auction(key), timeout=10)
 
     return jsonify({'success': True, 'message': 'Stopped monitoring'})
 
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus text-format metrics"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/latency')
+def get_latency():
+    """Bid-change latency histograms (p50/p95/p99 per stage) for every monitored auction"""
+    return jsonify({key: monitor.latency.summary() for key, monitor in list(manager.monitors.items())})
+
+@app.route('/api/history')
+def get_history():
+    """Recorded bid events for an auction, filtered by lot and epoch-second time range (latest page without since;
+    pass next_since/next_after_id back as since/after_id for the next page)"""
+    auction_id = request.args.get('auction_id')
+    if not auction_id:
+        monitor = manager.get_monitor()
+        auction_id = monitor.event_store.auction_id if monitor and monitor.event_store else None
+    if not auction_id:
+        return jsonify({'success': False, 'message': 'auction_id is required'}), 400
+
+    try:
+        lot_number = request.args.get('lot_number')
+        since = request.args.get('since', type=float)
+        until = request.args.get('until', type=float)
+        after_id = request.args.get('after_id', type=int)
+        limit = min(request.args.get('limit', 1000, type=int), 10000)
+        page = query_history(auction_id, lot_number=lot_number, start=since, end=until, limit=limit,
+                             after_id=after_id)
+        return jsonify({
+            'success': True,
+            'auction_id': auction_id,
+            'lots': list_lots(auction_id) if not lot_number else None,
+            **page
+        })
+    except Exception as e:
+        print(f"History query failed: {str(e)}")
+        return jsonify({'success': False, 'message': f'History query failed: {str(e)}'}), 500
+
 @app.route('/api/bid', methods=['POST'])
 def place_bid():
     """Place a bid on the current auction"""
     print("🔥 API /api/bid endpoint called")
-    global monitor
+    monitor = get_request_monitor()
 
     if not monitor:
         print("❌ No monitor instance available")
@@ -179,8 +324,8 @@ def place_bid():
 
         print(f"🔵 Triggering manual bid button highlight for amount: ${bid_amount}")
 
-        # Trigger manual bid button highlight (same as highlight button)
-        success = asyncio.run(monitor._highlight_bid_button_manual())
+        # Trigger manual bid button highlight (same as highlight button) on the monitor's own loop
+        success = monitor.submit_command('highlight_bid').result(timeout=30)
         print(f"📊 Manual highlight trigger result: {success}")
 
         if success:
@@ -196,6 +341,14 @@ def place_bid():
         traceback.print_exc()
         return jsonify({'success': False, 'message': f'Bid failed: {str(e)}'})
 
+async def find_bid_button_on_pool(auction_url):
+    """Lease a pooled context and run the bid button finder on its page"""
+    async with context_pool.lease() as leased:
+        success = await AuctionMonitor(socketio_instance).find_bid_button(auction_url, leased=leased)
+        if not success:
+            leased.needs_check = True
+        return success
+
 @app.route('/api/find_bid_button', methods=['POST'])
 def find_bid_button():
     """Run the complete bid button finder functionality"""
@@ -215,11 +368,8 @@ def find_bid_button():
 
         print(f"🚀 Running bid button finder for: {auction_url}")
 
-        # Create a temporary monitor instance for bid button finding
-        temp_monitor = AuctionMonitor(socketio_instance)
-
-        # Run bid button finder asynchronously
-        success = asyncio.run(temp_monitor.find_bid_button(auction_url))
+        # Run on a logged-in context from the pool instead of launching a browser and logging in each time
+        success = manager.run_coroutine(find_bid_button_on_pool(auction_url), timeout=180)
         print(f"📊 Bid button finder result: {success}")
 
         if success:
@@ -239,7 +389,7 @@ def find_bid_button():
 def highlight_bid_button():
     """Manually highlight the bid button with blue color during active monitoring"""
     print("🔵 API /api/highlight_bid_button endpoint called")
-    global monitor
+    monitor = get_request_monitor()
 
     if not monitor:
         print("❌ No monitor instance available")
@@ -252,8 +402,8 @@ def highlight_bid_button():
     try:
         print("🔵 Triggering manual bid button highlight...")
 
-        # Run highlight asynchronously
-        success = asyncio.run(monitor._highlight_bid_button_manual())
+        # Queue the highlight on the monitor's loop and wait for its result
+        success = monitor.submit_command('highlight_bid').result(timeout=30)
         print(f"📊 Manual highlight result: {success}")
 
         if success:
@@ -273,7 +423,7 @@ def highlight_bid_button():
 def highlight_plus_button():
     """Manually highlight the bid button with blue color during active monitoring"""
     print("🔵 API /api/highlight_plus_button endpoint called")
-    global monitor
+    monitor = get_request_monitor()
 
     if not monitor:
         print("❌ No monitor instance available")
@@ -286,8 +436,8 @@ def highlight_plus_button():
     try:
         print("🔵 Triggering manual bid button highlight...")
 
-        # Run highlight asynchronously
-        success = asyncio.run(monitor._highlight_plus_button_manual())
+        # Queue the highlight on the monitor's loop and wait for its result
+        success = monitor.submit_command('highlight_plus').result(timeout=30)
         print(f"📊 Manual highlight result: {success}")
 
         if success:
@@ -304,30 +454,5 @@ def highlight_plus_button():
         return jsonify({'success': False, 'message': f'Highlight failed: {str(e)}'})
 
 
-def start_monitoring_thread(auction_url):
-    """Start monitoring in a separate thread"""
-    global monitor
-
-    print(f"🔄 Monitoring thread started for URL: {auction_url}")
-    try:
-        print("🚀 About to call monitor.start_monitoring()...")
-
-        # Create new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        try:
-            loop.run_until_complete(monitor.start_monitoring(auction_url))
-            print("✅ Monitoring completed successfully")
-        finally:
-            loop.close()
-
-    except Exception as e:
-        print(f'❌ Monitoring error: {str(e)}')
-        import traceback
-        traceback.print_exc()
-    finally:
-        print("🔚 Monitoring thread finished")
-
 if __name__ == '__main__':
     socketio.run(app, host='0.0.0.0', port=5000, debug=True, allow_unsafe_werkzeug=True)
\ No newline at end of file
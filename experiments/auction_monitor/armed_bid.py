@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Pre-armed one-shot bid
+The step-by-step bid path (find the input, type, click, sleep, search for the confirm button)
+spends most of its time in Playwright round trips after the decision to bid has been made.
+ArmedBid resolves the bid input and bid button ahead of time and installs a small in-page
+routine holding their handles; fire() is then one evaluate(): set the amount, click, wait for
+the confirm button with a MutationObserver, click it and wait for a confirmation message to
+appear (only nodes added or shown after the confirm click count). The confirm button must be one
+that became visible after the bid click, and a text match only counts inside a dialog that opened
+after it, so a cookie banner's "Confirm choices" is never clicked as the bid confirmation.
+The routine timestamps each step with performance.now(), so every fire reports its
+click-to-confirmation latency as measured inside the page.
+"""
+
+import asyncio
+import time
+from selector_race import race_selectors
+
+# The confirm dialog only exists after the bid button is clicked, so it is found in-page (plain CSS + text)
+CONFIRM_CSS = ['button[ng-click*="increaseBidForLot"]', '.modal .btn-yellow-norm']
+CONFIRM_DIALOG_CSS = '.modal, [role="dialog"]'
+CONFIRM_TEXT = ['confirm your bid']
+SUCCESS_CSS = ['.bid-success', '.alert-success']
+SUCCESS_TEXT = ['bid placed successfully', 'bid submitted']
+
+ARM_JS = """
+({input, button, config}) => {
+    function isVisible(el) {
+        if (!el || !el.isConnected) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        return el.getClientRects().length > 0;
+    }
+
+    function shown(css) {
+        try { return new Set([...document.querySelectorAll(css)].filter(isVisible)); } catch (e) { return new Set(); }
+    }
+
+    // Confirm button of the dialog the bid click opened: anything already visible before the click
+    // (the bid button itself, a cookie banner, another dialog) is skipped, and text only matches
+    // buttons inside a dialog that was not showing before the click
+    function findConfirm(before) {
+        const fresh = el => !before.buttons.has(el) && isVisible(el);
+        for (const selector of config.confirmCss) {
+            let matches = [];
+            try { matches = document.querySelectorAll(selector); } catch (e) { continue; }
+            for (const el of matches) { if (fresh(el)) return el; }
+        }
+        for (const dialog of document.querySelectorAll(config.dialogCss)) {
+            if (before.dialogs.has(dialog) || !isVisible(dialog)) continue;
+            for (const el of dialog.querySelectorAll('button')) {
+                const text = (el.textContent || '').trim().toLowerCase();
+                if (config.confirmText.some(t => text.includes(t)) && fresh(el)) return el;
+            }
+        }
+        return null;
+    }
+
+    function waitFor(check, timeout) {
+        const found = check();
+        if (found) return Promise.resolve(found);
+        return new Promise(resolve => {
+            const observer = new MutationObserver(() => {
+                const el = check();
+                if (el) { observer.disconnect(); clearTimeout(timer); resolve(el); }
+            });
+            const timer = setTimeout(() => { observer.disconnect(); resolve(null); }, timeout);
+            // No characterData: the dialog appears through added nodes or class/style changes, and the live
+            // timers would otherwise re-run the scan on every tick
+            observer.observe(document, {childList: true, subtree: true, attributes: true,
+                                        attributeFilter: ['class', 'style', 'hidden']});
+        });
+    }
+
+    // Success is only what appears after the confirm click: added nodes (an element matching the success
+    // CSS, or an alert / leaf element with the success text) and alerts that become visible. Text that was
+    // already on the page, or that only an outer wrapper's textContent contains, does not count.
+    const ALERT_CSS = '.alert, .message, [role="alert"]';
+    function watchForSuccess(timeout) {
+        const successCss = config.successCss.join(', ');
+        const watchedCss = successCss + ', ' + ALERT_CSS;
+        const hasText = text => config.successText.some(t => (text || '').toLowerCase().includes(t));
+        const match = el => {
+            if (!el || !isVisible(el)) return null;
+            if (el.matches(successCss)) return el;
+            return (el.matches(ALERT_CSS) || el.childElementCount === 0) && hasText(el.textContent) ? el : null;
+        };
+        const shownBefore = new Set([...document.querySelectorAll(watchedCss)].filter(el => match(el)));
+        const inAdded = node => {
+            if (node.nodeType === Node.TEXT_NODE) return hasText(node.data) ? match(node.parentElement) : null;
+            if (node.nodeType !== Node.ELEMENT_NODE) return null;
+            if (match(node)) return node;
+            for (const el of node.querySelectorAll(watchedCss)) { if (match(el)) return el; }
+            const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+            while (walker.nextNode()) {
+                if (hasText(walker.currentNode.data) && match(walker.currentNode.parentElement)) {
+                    return walker.currentNode.parentElement;
+                }
+            }
+            return null;
+        };
+        let observer = null;
+        const found = new Promise(resolve => {
+            const timer = setTimeout(() => { observer.disconnect(); resolve(null); }, timeout);
+            observer = new MutationObserver(mutations => {
+                for (const mutation of mutations) {
+                    let el = null;
+                    if (mutation.type === 'childList') {
+                        for (const node of mutation.addedNodes) { if ((el = inAdded(node))) break; }
+                    } else if (mutation.target.matches(watchedCss) && !shownBefore.has(mutation.target)) {
+                        el = match(mutation.target);  // a hidden alert shown by a class/style change
+                    }
+                    if (el) { observer.disconnect(); clearTimeout(timer); resolve(el); return; }
+                }
+            });
+            observer.observe(document, {childList: true, subtree: true, attributes: true,
+                                        attributeFilter: ['class', 'style', 'hidden']});
+        });
+        return found;
+    }
+
+    window.__armedBid = {
+        input, button,
+        fire: async (amount) => {
+            if (!input.isConnected || !button.isConnected) return {stale: true};
+            const t0 = performance.now();
+            const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+            input.focus();
+            setValue.call(input, String(amount));
+            input.dispatchEvent(new Event('input', {bubbles: true}));
+            input.dispatchEvent(new Event('change', {bubbles: true}));
+            const before = {buttons: shown('button, ' + config.confirmCss.join(', ')), dialogs: shown(config.dialogCss)};
+            button.click();
+            const clickedAt = performance.now();
+            const result = {amount, fillMs: clickedAt - t0, confirmShownMs: null, confirmClickedMs: null,
+                            confirmationMs: null, confirmed: false};
+
+            // The bid button was visible before the click, so it is skipped even though it can carry the
+            // same classes as the dialog's confirm button
+            const confirm = await waitFor(() => findConfirm(before), config.timeout);
+            if (!confirm) return result;
+            result.confirmShownMs = performance.now() - clickedAt;
+            const successShown = watchForSuccess(config.timeout);  // watching starts before the click
+            confirm.click();
+            result.confirmClickedMs = performance.now() - clickedAt;
+
+            const success = await successShown;
+            if (success) {
+                result.confirmed = true;
+                result.confirmationMs = performance.now() - clickedAt;
+            }
+            return result;
+        }
+    };
+    return true;
+}
+"""
+
+FIRE_JS = "(amount) => window.__armedBid ? window.__armedBid.fire(amount) : {stale: true}"
+
+
+class ArmedBid:
+    """Bid controls on a Copart lot page resolved ahead of time; fire() places the bid in one in-page call"""
+
+    def __init__(self, page, input_selectors, button_selectors, cache=None, page_type='copart_lot', timeout=5000):
+        self.page = page
+        self.input_selectors = input_selectors
+        self.button_selectors = button_selectors
+        self.cache = cache  # optional SelectorCache, so arming starts from the usual winners
+        self.page_type = page_type
+        self.timeout = timeout
+        self.handles = []
+        self.armed_at = None
+
+    async def _resolve(self, group, selectors):
+        if self.cache:
+            return await self.cache.race(self.page, self.page_type, group, selectors, self.timeout)
+        return await race_selectors(self.page, selectors, self.timeout)
+
+    async def arm(self):
+        """Resolve the input and bid button and install the in-page routine; False when either is missing"""
+        started = time.perf_counter()
+        await self.disarm()
+        (input_selector, bid_input), (button_selector, bid_button) = await asyncio.gather(
+            self._resolve('bid_input', self.input_selectors),
+            self._resolve('bid_button', self.button_selectors)
+        )
+        if not bid_input or not bid_button:
+            print(f"❌ Could not arm bid: input={input_selector}, button={button_selector}")
+            return False
+
+        self.handles = [await bid_input.element_handle(), await bid_button.element_handle()]
+        config = {'confirmCss': CONFIRM_CSS, 'dialogCss': CONFIRM_DIALOG_CSS, 'confirmText': CONFIRM_TEXT,
+                  'successCss': SUCCESS_CSS, 'successText': SUCCESS_TEXT, 'timeout': self.timeout}
+        await self.page.evaluate(ARM_JS, {'input': self.handles[0], 'button': self.handles[1], 'config': config})
+        self.armed_at = time.time()
+        print(f"🎯 Bid armed in {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"(input '{input_selector}', button '{button_selector}')")
+        return True
+
+    async def fire(self, amount):
+        """Place the bid with one evaluate(); re-arms once if the page re-rendered the controls"""
+        started = time.perf_counter()
+        result = await self.page.evaluate(FIRE_JS, int(amount))
+        if result.get('stale'):
+            print("⚠️ Armed bid controls went stale, re-arming")
+            if not await self.arm():
+                return {'amount': int(amount), 'confirmed': False, 'stale': True}
+            result = await self.page.evaluate(FIRE_JS, int(amount))
+        result['roundTripMs'] = (time.perf_counter() - started) * 1000
+
+        if result.get('confirmed'):
+            print(f"⚡ Bid ${result['amount']} confirmed {result['confirmationMs']:.0f} ms after the click "
+                  f"(confirm shown at {result['confirmShownMs']:.0f} ms, round trip {result['roundTripMs']:.0f} ms)")
+        elif result.get('confirmClickedMs') is not None:
+            print(f"⚠️ Bid ${result['amount']} confirm clicked at {result['confirmClickedMs']:.0f} ms, "
+                  f"no confirmation message within {self.timeout / 1000:.0f}s")
+        else:
+            print(f"❌ Bid ${result['amount']}: no confirm button within {self.timeout / 1000:.0f}s of the click")
+        return result
+
+    async def disarm(self):
+        for handle in self.handles:
+            try:
+                await handle.dispose()
+            except Exception:
+                pass
+        self.handles = []
+        self.armed_at = None
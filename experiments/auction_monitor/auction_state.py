@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Versioned auction state
+Every publish diffs the monitor's auction data against the last published copy and produces a
+delta that carries only the changed fields plus a monotonically increasing version.
+Clients apply deltas in order and ask for a snapshot when they notice a version gap.
+"""
+
+import threading
+from collections import deque
+
+_MISSING = object()
+
+# Called with (state, delta) after every publish - used to wake SSE streams and long-poll requests
+publish_listeners = []
+
+
+def add_publish_listener(listener):
+    publish_listeners.append(listener)
+    return listener
+
+
+class VersionedAuctionState:
+    """Last published auction data, its version and a short history of deltas"""
+
+    def __init__(self, auction_id=None, history=256):
+        self.auction_id = auction_id
+        self.version = 0
+        self.data = {}
+        self._deltas = deque(maxlen=history)
+        self._lock = threading.Lock()  # snapshots are requested from Socket.IO threads
+
+    def publish(self, current, **meta):
+        """Diff `current` against the published data; returns the delta, or None when nothing changed"""
+        with self._lock:
+            changes = {key: value for key, value in current.items() if self.data.get(key, _MISSING) != value}
+            removed = [key for key in self.data if key not in current]
+            if not changes and not removed:
+                return None
+
+            for key in removed:
+                del self.data[key]
+            self.data.update(changes)
+            self.version += 1
+            delta = {
+                'auction_id': self.auction_id,
+                'version': self.version,
+                'base_version': self.version - 1,
+                'changes': changes
+            }
+            if removed:
+                delta['removed'] = removed
+            self._deltas.append(delta)
+
+        for listener in publish_listeners:
+            try:
+                listener(self, delta)
+            except Exception as e:
+                print(f"Publish listener failed: {e}")
+        return dict(delta, **meta)
+
+    def snapshot(self, **meta):
+        with self._lock:
+            return dict({'auction_id': self.auction_id, 'version': self.version, 'data': dict(self.data)}, **meta)
+
+    def deltas_since(self, version):
+        """Deltas after `version`, or None if they are no longer in the history (send a snapshot instead)"""
+        with self._lock:
+            if version >= self.version:
+                return []
+            if not self._deltas or self._deltas[0]['base_version'] > version:
+                return None
+            return [delta for delta in self._deltas if delta['version'] > version]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Armed Bid Benchmark
+Places bids on the saved copart_place_bid.html lot page, served locally through context.route (no
+network, no login), once with the step-by-step place_bid_on_lot() path and once with --armed, and
+compares how long each takes from touching the bid input to the confirmation message.
+The snapshot is Chrome's view-source capture of the lot page: its source is recovered from the line
+cells, its scripts are dropped, and a stand-in bid panel is added (current bid, increment, max-bid
+input, bid button) whose confirm dialog opens --modal-ms after the click and whose success message
+appears --server-ms after confirming. Timestamps are taken inside the page, so both paths are timed
+by the same clock.
+
+Usage: python benchmark_armed_bid.py [--runs 5] [--modal-ms 150] [--server-ms 300] [--headless]
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import time
+from playwright.async_api import async_playwright
+from saved_pages import SAVED_PAGES_DIR, page_source
+
+SNAPSHOT = 'copart_place_bid.html'
+LOT_NUMBER = '81178215'  # the lot in the snapshot
+
+os.environ['AUCTION_SELECTOR_STATS'] = ''  # keep benchmark lookups out of the real selector stats
+sys.path.insert(0, SAVED_PAGES_DIR)
+from copart_bid import place_bid_on_lot
+
+BID_PANEL = """
+<div id="bench-bid-panel" style="position:fixed;top:140px;left:20px;z-index:99998;background:#fff;padding:12px">
+  <div>Current Bid: <span class="current-bid-amount">$1,250.00</span></div>
+  <div class="dynamic-bid-inc">($50.00 Bid increment)</div>
+  <input id="your-max-bid" type="text" name="maxBid">
+  <button class="btn btn-yellow-norm" ng-click="openIncreaseBidModal()">Bid now</button>
+</div>
+<div class="modal" id="bench-confirm" style="display:none;position:fixed;top:140px;left:400px;z-index:99999;background:#fff">
+  <button class="btn btn-yellow-norm" ng-click="increaseBidForLot()">Confirm your bid</button>
+</div>
+<script>
+(function () {
+  const timeline = window.__bidTimeline = {};
+  const mark = key => { if (timeline[key] === undefined) timeline[key] = performance.now(); };
+  const input = document.getElementById('your-max-bid');
+  const modal = document.getElementById('bench-confirm');
+  input.addEventListener('focus', () => mark('touched'));
+  input.addEventListener('click', () => mark('touched'));
+  document.querySelector('#bench-bid-panel button').addEventListener('click', () => {
+    mark('bidClicked');
+    setTimeout(() => { modal.style.display = 'block'; }, {modal_ms});
+  });
+  modal.querySelector('button').addEventListener('click', () => {
+    mark('confirmClicked');
+    timeline.amount = input.value;
+    setTimeout(() => {
+      document.body.insertAdjacentHTML('beforeend', '<div class="alert alert-success">Bid placed successfully</div>');
+      mark('confirmed');
+    }, {server_ms});
+  });
+})();
+</script>
+"""
+
+
+def lot_page_source(modal_ms, server_ms):
+    """Original lot page HTML from the view-source snapshot, without scripts, plus the stand-in bid panel"""
+    source = re.sub(r'<script\b.*?</script>', '', page_source(SNAPSHOT), flags=re.S | re.I)
+    panel = BID_PANEL.replace('{modal_ms}', str(modal_ms)).replace('{server_ms}', str(server_ms))
+    return source.replace('</body>', panel + '</body>', 1)
+
+
+async def serve_lot_page(context, body):
+    async def handle(route):
+        if route.request.url.startswith(f'https://www.copart.com/lot/{LOT_NUMBER}'):
+            await route.fulfill(content_type='text/html', body=body)
+        else:
+            await route.abort()  # stylesheets, fonts, trackers: nothing leaves the machine
+
+    await context.route('**/*', handle)
+
+
+async def run_once(page, armed):
+    started = time.perf_counter()
+    ok = await place_bid_on_lot(page, LOT_NUMBER, armed=armed)
+    wall_s = time.perf_counter() - started
+    timeline = await page.evaluate("() => window.__bidTimeline")
+    if not ok or 'confirmed' not in timeline:
+        print(f"  ⚠️ {'armed' if armed else 'step-by-step'} run did not confirm: {timeline}")
+        return None
+    return {
+        'touch_to_confirmed': timeline['confirmed'] - timeline['touched'],
+        'click_to_confirmed': timeline['confirmed'] - timeline['bidClicked'],
+        'wall': wall_s * 1000,
+        'amount': timeline.get('amount'),
+    }
+
+
+async def run_benchmark(runs, modal_ms, server_ms, headless):
+    body = lot_page_source(modal_ms, server_ms)
+    snapshot_kib = os.path.getsize(os.path.join(SAVED_PAGES_DIR, SNAPSHOT)) / 1024
+    print(f"Lot page source: {len(body) / 1024:.0f} KiB (snapshot {snapshot_kib:.0f} KiB)")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        await serve_lot_page(context, body)
+        page = await context.new_page()
+
+        results = {'step-by-step': [], 'armed': []}
+        for _ in range(runs):
+            for label, armed in (('step-by-step', False), ('armed', True)):
+                result = await run_once(page, armed)
+                if result:
+                    results[label].append(result)
+        await browser.close()
+
+    print(f"\nConfirm dialog after {modal_ms} ms, confirmation after {server_ms} ms (stand-in server time)")
+    print(f"{'path':<14}{'input→confirmed':>17}{'click→confirmed':>17}{'whole call':>12}{'amount':>8}")
+    for label, rows in results.items():
+        if not rows:
+            print(f"{label:<14}{'no confirmed runs':>17}")
+            continue
+        print(f"{label:<14}{statistics.median(r['touch_to_confirmed'] for r in rows):>14.0f} ms"
+              f"{statistics.median(r['click_to_confirmed'] for r in rows):>14.0f} ms"
+              f"{statistics.median(r['wall'] for r in rows):>9.0f} ms{str(rows[-1]['amount']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bid latency of place_bid_on_lot with and without --armed')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--modal-ms', type=int, default=150, help='Delay before the confirm dialog opens')
+    parser.add_argument('--server-ms', type=int, default=300, help='Delay before the bid is confirmed')
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.runs, args.modal_ms, args.server_ms, args.headless))
+
+
+if __name__ == '__main__':
+    main()
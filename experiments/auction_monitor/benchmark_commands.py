@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Command Round-Trip Benchmark
+Measures how long an operator command (e.g. a highlight request from the web app) waits before the
+monitoring loop runs it and returns the result: the command queue versus the old flag polled every second.
+No browser is needed - the command is the built-in no-op 'ping'.
+
+Usage: python benchmark_commands.py [--commands 30] [--max-gap 0.5]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+from monitor_simple import AuctionMonitor
+
+
+def start_loop_thread(coro_factory):
+    """Run coro_factory() on a fresh event loop in a background thread (like MonitorManager does)"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=lambda: loop.run_until_complete(coro_factory(loop)), daemon=True)
+    thread.start()
+    return thread
+
+
+def bench_command_queue(commands, max_gap):
+    monitor = AuctionMonitor()
+    monitor.is_monitoring = True
+    ready = threading.Event()
+
+    async def monitoring_loop(loop):
+        asyncio.set_event_loop(loop)
+        monitor._open_command_queue()
+        ready.set()
+        try:
+            while monitor.is_monitoring:
+                await monitor._wait_for_commands(1)
+        finally:
+            monitor._close_command_queue()
+
+    thread = start_loop_thread(monitoring_loop)
+    ready.wait()
+
+    samples = []
+    for _ in range(commands):
+        time.sleep(random.uniform(0, max_gap))
+        started = time.perf_counter()
+        monitor.submit_command('ping').result(timeout=5)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    monitor.is_monitoring = False
+    thread.join(timeout=5)
+    return samples
+
+
+def bench_flag_polling(commands, max_gap):
+    """The previous design: the request sets a flag, the loop checks it after asyncio.sleep(1)"""
+    state = {'requested': False, 'running': True}
+    done = threading.Event()
+
+    async def monitoring_loop(loop):
+        asyncio.set_event_loop(loop)
+        while state['running']:
+            await asyncio.sleep(1)
+            if state['requested']:
+                state['requested'] = False
+                done.set()
+
+    thread = start_loop_thread(monitoring_loop)
+
+    samples = []
+    for _ in range(commands):
+        time.sleep(random.uniform(0, max_gap))
+        done.clear()
+        started = time.perf_counter()
+        state['requested'] = True
+        done.wait(timeout=5)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    state['running'] = False
+    thread.join(timeout=5)
+    return samples
+
+
+def summarize(label, samples):
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<14} mean={statistics.mean(samples):8.2f} ms  p50={statistics.median(samples):8.2f} ms  "
+          f"p95={p95:8.2f} ms  max={ordered[-1]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark operator command round-trip latency')
+    parser.add_argument('--commands', type=int, default=30, help='Commands per mode')
+    parser.add_argument('--max-gap', type=float, default=0.5, help='Max random pause between commands (s)')
+    args = parser.parse_args()
+
+    print(f"Sending {args.commands} commands per mode...")
+    queue_samples = bench_command_queue(args.commands, args.max_gap)
+    polling_samples = bench_flag_polling(args.commands, args.max_gap)
+
+    print()
+    summarize('flag polling', polling_samples)
+    summarize('command queue', queue_samples)
+    print(f"Command queue round trip is {statistics.mean(polling_samples) / statistics.mean(queue_samples):.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Extraction Latency Benchmark
+Compares selector-by-selector extraction with the batched extraction plan.
+Copart and g2auction URLs are served from local stand-in pages through page.route,
+so no network or login is needed.
+
+Usage: python benchmark_extraction.py [--iterations 20] [--headless]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from playwright.async_api import async_playwright
+from monitor_simple import AuctionMonitor
+
+AUCTION_URL = 'https://www.copart.com/auctionDashboard?auctionDetails=833-A'
+FRAME_URL = 'https://g2auction.copart.com/g2/#/'
+
+MAIN_PAGE_HTML = f"""
+<html><body>
+<h2>Auction is live</h2>
+<iframe src="{FRAME_URL}" width="900" height="600"></iframe>
+</body></html>
+"""
+
+# Mirrors the markup the monitor reads inside the live g2auction iframe
+FRAME_HTML = """
+<html><body>
+<div class="itempair">
+  <a class="titlelbl ellipsis" title="2019 TOYOTA CAMRY SE">2019 TOYOTA CAMRY SE</a>
+  <a class="titlelbl ellipsis" href="/lot/58231374">Lot #58231374</a>
+</div>
+<div class="auctionrunningdiv-MACRO">
+  <svg width="400" height="160">
+    <text fill="#0757ac" x="10" y="40">$1,250</text>
+    <text fill="black" x="10" y="80">Bid!</text>
+    <text fill="black" x="10" y="120">CA - Online Bidder</text>
+  </svg>
+</div>
+<input name="bidAmount" value="$1,275">
+</body></html>
+"""
+
+
+def summarize(label, samples):
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<12} mean={statistics.mean(samples):8.1f} ms  p50={statistics.median(samples):8.1f} ms  "
+          f"p95={p95:8.1f} ms  max={ordered[-1]:8.1f} ms")
+
+
+async def run_benchmark(iterations, headless):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        await context.route('https://www.copart.com/**',
+                            lambda route: route.fulfill(content_type='text/html', body=MAIN_PAGE_HTML))
+        await context.route('https://g2auction.copart.com/**',
+                            lambda route: route.fulfill(content_type='text/html', body=FRAME_HTML))
+
+        monitor = AuctionMonitor(context=context)
+        await monitor._attach_to_context(context)
+        await monitor.page.goto(AUCTION_URL)
+        monitor.auction_frame = monitor.page.frame_locator('iframe[src*="g2auction.copart.com"]')
+        await monitor.auction_frame.locator('.auctionrunningdiv-MACRO').wait_for()
+
+        results = {}
+        for label, batched in (('sequential', False), ('batched', True)):
+            samples = []
+            data = None
+            for _ in range(iterations):
+                started = time.perf_counter()
+                data = await monitor._extract_auction_data(batched=batched)
+                samples.append((time.perf_counter() - started) * 1000)
+            results[label] = (samples, data)
+
+        await browser.close()
+
+    print()
+    for label, (samples, data) in results.items():
+        summarize(label, samples)
+    for label, (samples, data) in results.items():
+        fields = {k: data[k] for k in ('current_bid', 'current_bidder', 'lot_title', 'lot_number', 'status')}
+        print(f"{label:<12} {fields}")
+
+    speedup = statistics.mean(results['sequential'][0]) / statistics.mean(results['batched'][0])
+    print(f"Batched extraction is {speedup:.1f}x faster per call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark auction data extraction latency')
+    parser.add_argument('--iterations', type=int, default=20, help='Extractions per mode')
+    parser.add_argument('--headless', action='store_true', help='Run the browser headless')
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.iterations, args.headless))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Lot Details Benchmark
+Reads the lot on the saved copart_place_bid.html snapshot (745 KB view-source capture, served locally
+through context.route with every other request aborted) three ways and reports time and fields found:
+  selectors  - the old open_lot_details() probes: one locator per field, is_visible() + text_content()
+  json       - read_lot_details(): the embedded cachedSolrLotDetailsStr record in one evaluate()
+  dom plan   - read_lot_details() with the record removed: the batched DOM selector fallback
+The snapshot is the server-rendered shell, so the elements Angular would render (title, lot number,
+current bid) are added from the same record before timing. parse_lot_html() is also timed offline.
+
+Usage: python benchmark_lot_details.py [--runs 20] [--headless]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from playwright.async_api import async_playwright
+from saved_pages import page_source
+from lot_details import parse_lot_html, read_lot_details
+
+SNAPSHOT = 'copart_place_bid.html'
+RENDERED = """<div id="bench-rendered">
+  <h1 class="lot-title">{title}</h1>
+  <span class="lot-number">Lot #{lot_number}</span>
+  <span class="current-bid">{current_bid}</span>
+</div>"""
+
+
+async def selector_lot_details(page):
+    """The per-field locator probes open_lot_details() used before the embedded record"""
+    details = {}
+    for field, css in (('title', '.lot-title, .vehicle-title, h1'),
+                       ('lot_number', '.lot-number, .lot-num, #LotNumber, span[data-uname="lotdetailVinvalue"]'),
+                       ('current_bid', '.current-bid, .bid-amount, .bid-price')):
+        elem = page.locator(css).first
+        details[field] = await elem.text_content() if await elem.is_visible() else None
+    return {key: value for key, value in details.items() if value}
+
+
+async def timed(coroutine_factory, runs):
+    times, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = await coroutine_factory()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+async def run_benchmark(runs, headless):
+    started = time.perf_counter()
+    source = page_source(SNAPSHOT)
+    recover_ms = (time.perf_counter() - started) * 1000
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        lot = parse_lot_html(source)
+        times.append((time.perf_counter() - started) * 1000)
+    offline_ms = statistics.median(times)
+    print(f"Snapshot source {len(source) / 1024:.0f} KiB (view-source recovery {recover_ms:.1f} ms)")
+    print(f"parse_lot_html (no browser): {offline_ms:.2f} ms per page, {1000 / offline_ms:,.0f} pages/s, "
+          f"lot {lot.lot_number}, current bid {lot.current_bid}")
+
+    rendered = RENDERED.format(title=lot.title, lot_number=lot.lot_number, current_bid=f"${lot.current_bid:,.2f}")
+    body = source.replace('</body>', rendered + '</body>', 1)
+    lot_url = f"https://www.copart.com/lot/{lot.lot_number}"
+
+    async def handle(route):
+        if route.request.url == lot_url:
+            await route.fulfill(content_type='text/html', body=body)
+        else:
+            await route.abort()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        await context.route('**/*', handle)
+        page = await context.new_page()
+        await page.goto(lot_url, wait_until='domcontentloaded')
+
+        rows = []
+        selectors_ms, fields = await timed(lambda: selector_lot_details(page), runs)
+        rows.append(('selectors', selectors_ms, len(fields)))
+        json_ms, json_lot = await timed(lambda: read_lot_details(page), runs)
+        rows.append(('json', json_ms, sum(1 for v in json_lot.summary().values() if v != 'N/A') - 1))
+        await page.evaluate("() => { delete window.appInit.cachedSolrLotDetailsStr; }")
+        dom_ms, dom_lot = await timed(lambda: read_lot_details(page), runs)
+        rows.append(('dom plan', dom_ms, sum(1 for v in dom_lot.summary().values() if v != 'N/A') - 1))
+        await browser.close()
+
+    print(f"\n{'path':<12}{'median':>10}{'fields':>8}")
+    for label, ms, count in rows:
+        print(f"{label:<12}{ms:>7.2f} ms{count:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lot details: per-field selectors vs embedded lot JSON')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.runs, args.headless))
+
+
+if __name__ == '__main__':
+    main()
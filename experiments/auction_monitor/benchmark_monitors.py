@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Monitor Scaling Benchmark
+Measures memory and CPU per monitored auction as the number of monitors grows.
+All monitors run through MonitorManager, so they share one browser and one login.
+
+Usage: python benchmark_monitors.py <auction_id> [<auction_id> ...] [--steps 1,5,10,20] [--settle 60]
+Example: python benchmark_monitors.py 833-A 366-A --steps 1,5,10,20
+
+When fewer auction ids than monitors are given, the ids are reused on extra pages
+(each page is still a separate monitor with its own observer and health checks).
+"""
+
+import argparse
+import asyncio
+import time
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError as e:
+    PSUTIL_AVAILABLE = False
+    print(f"psutil not available: {e}")
+    print("Install with: pip install psutil")
+
+from monitor_manager import MonitorManager
+
+
+def process_tree():
+    """This process plus every child (the Playwright driver and all Chromium processes)"""
+    me = psutil.Process()
+    return [me] + me.children(recursive=True)
+
+
+def sample_usage(interval):
+    """Total RSS (MB) and CPU (% of one core) of the whole process tree over an interval"""
+    procs = process_tree()
+    for proc in procs:
+        try:
+            proc.cpu_percent(None)
+        except psutil.Error:
+            pass
+
+    time.sleep(interval)
+
+    rss = 0
+    cpu = 0.0
+    for proc in procs:
+        try:
+            rss += proc.memory_info().rss
+            cpu += proc.cpu_percent(None)
+        except psutil.Error:
+            continue
+    return rss / (1024 * 1024), cpu
+
+
+async def run_benchmark(auction_ids, steps, settle, sample_interval, headless, login):
+    manager = MonitorManager(headless=headless)
+    loop = asyncio.get_running_loop()
+    results = []
+
+    baseline_rss, baseline_cpu = await loop.run_in_executor(None, sample_usage, sample_interval)
+    print(f"Baseline (no browser): RSS={baseline_rss:.1f} MB, CPU={baseline_cpu:.1f}%")
+
+    try:
+        count = 0
+        for target in steps:
+            while count < target:
+                auction_id = auction_ids[count % len(auction_ids)]
+                await manager.add_auction(auction_id, key=f"{auction_id}#{count}", login=login)
+                count += 1
+
+            print(f"⏳ {count} monitors running, settling for {settle}s...")
+            await asyncio.sleep(settle)
+
+            rss, cpu = await loop.run_in_executor(None, sample_usage, sample_interval)
+            active = sum(1 for m in manager.monitors.values() if m.is_monitoring)
+            results.append((count, active, rss, cpu))
+            print(f"📊 {count} monitors ({active} active): RSS={rss:.1f} MB, CPU={cpu:.1f}%")
+    finally:
+        await manager.stop_all()
+
+    print()
+    print(f"{'monitors':>8} {'active':>6} {'RSS MB':>9} {'MB/auction':>11} {'CPU %':>7} {'CPU %/auction':>14}")
+    for count, active, rss, cpu in results:
+        per_auction_rss = (rss - baseline_rss) / count
+        per_auction_cpu = (cpu - baseline_cpu) / count
+        print(f"{count:>8} {active:>6} {rss:>9.1f} {per_auction_rss:>11.1f} {cpu:>7.1f} {per_auction_cpu:>14.2f}")
+
+    # Marginal cost between consecutive steps is the number that matters for capacity planning
+    for (c1, _, r1, u1), (c2, _, r2, u2) in zip(results, results[1:]):
+        print(f"Marginal {c1}->{c2}: {(r2 - r1) / (c2 - c1):.1f} MB and {(u2 - u1) / (c2 - c1):.2f}% CPU per added auction")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure memory and CPU per monitored auction')
+    parser.add_argument('auction_ids', nargs='+', help='Auction ids to monitor, e.g. 833-A')
+    parser.add_argument('--steps', default='1,5,10,20', help='Comma-separated monitor counts to measure')
+    parser.add_argument('--settle', type=float, default=60, help='Seconds to let monitors settle before sampling')
+    parser.add_argument('--sample', type=float, default=10, help='CPU sampling window in seconds')
+    parser.add_argument('--headless', action='store_true', help='Run the shared browser headless')
+    parser.add_argument('--no-login', action='store_true', help='Skip Copart login (for local stand-in pages)')
+    args = parser.parse_args()
+
+    if not PSUTIL_AVAILABLE:
+        raise SystemExit(1)
+
+    steps = sorted(int(step) for step in args.steps.split(','))
+    asyncio.run(run_benchmark(args.auction_ids, steps, args.settle, args.sample,
+                              args.headless, not args.no_login))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Navigation Wait Benchmark
+Replays the navigation steps of copart_tests.py, copart_bid.py and iaai_tests.py against stand-in pages
+(served through context.route, no network or login) and compares the old waits - goto, networkidle and
+the fixed sleeps that followed - with goto_ready() readiness predicates.
+Each stand-in renders the element its flow reads after --render-ms and keeps polling its server for
+--busy-ms, like the analytics beacons and long-polls on the live sites that keep networkidle from settling.
+
+Usage: python benchmark_navigation.py [--runs 3] [--render-ms 800] [--busy-ms 6000] [--idle-timeout 15000] [--headless]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from navigation import (goto_ready, COPART_LOGIN, COPART_VEHICLE_FINDER, COPART_LOT, COPART_LOT_BID_PANEL,
+                        COPART_WATCHLIST, COPART_TODAYS_AUCTIONS, IAAI_DASHBOARD, IAAI_LIVE_CALENDAR)
+
+ADD_HTML = "document.body.insertAdjacentHTML('beforeend', {html})"
+
+# (flow, url, readiness predicate, JS that makes the page ready, old wait after goto, old fixed sleep in seconds)
+STEPS = [
+    ('copart_tests', 'https://www.copart.com/login', COPART_LOGIN,
+     ADD_HTML.format(html=json.dumps('<input name="username">')), 'networkidle', 0),
+    ('copart_tests', 'https://www.copart.com/vehicleFinder', COPART_VEHICLE_FINDER,
+     ADD_HTML.format(html=json.dumps('<input id="input-search">')), 'networkidle', 0),
+    ('copart_tests', 'https://www.copart.com/lot/58231374', COPART_LOT,
+     "window.appInit = {cachedSolrLotDetailsStr: '{}'}", 'networkidle', 0),
+    ('copart_tests', 'https://www.copart.com/watchList', COPART_WATCHLIST,
+     ADD_HTML.format(html=json.dumps('<div class="search_result_lot_number"><a>58231374</a></div>')), 'networkidle', 0),
+    ('copart_tests', 'https://www.copart.com/lot/58231374', COPART_LOT,
+     "window.appInit = {cachedSolrLotDetailsStr: '{}'}", 'networkidle', 0),
+    ('copart_tests', 'https://www.copart.com/todaysAuction', COPART_TODAYS_AUCTIONS,
+     ADD_HTML.format(html=json.dumps('<a href="/auctionDashboard?auctionDetails=833-A">Join</a>')), 'networkidle', 5),
+    ('copart_bid', 'https://www.copart.com/login', COPART_LOGIN,
+     ADD_HTML.format(html=json.dumps('<input name="username">')), 'networkidle', 0),
+    ('copart_bid', 'https://www.copart.com/lot/58231374', COPART_LOT_BID_PANEL,
+     ADD_HTML.format(html=json.dumps('<input id="your-max-bid">')), 'networkidle', 3),
+    ('iaai_tests', 'https://www.iaai.com/Dashboard/Default', IAAI_DASHBOARD,
+     ADD_HTML.format(html=json.dumps('<a href="/login/gbplogout">Log out</a>')), 'domcontentloaded', 5),
+    ('iaai_tests', 'https://www.iaai.com/LiveAuctionsCalendar', IAAI_LIVE_CALENDAR,
+     ADD_HTML.format(html=json.dumps('<div class="auction-item">Auction</div>')), 'networkidle', 5),
+]
+
+PAGE_TEMPLATE = """<html><body><h1>stand-in</h1><script>
+const started = Date.now();
+(function poll() {{
+  if (Date.now() - started < {busy_ms}) fetch('/__poll?' + Math.random()).finally(() => setTimeout(poll, 300));
+}})();
+setTimeout(() => {{ {make_ready}; }}, {render_ms});
+</script></body></html>"""
+
+
+async def install_stand_ins(context, render_ms, busy_ms):
+    scripts = {}
+    for _, url, _, make_ready, _, _ in STEPS:
+        scripts.setdefault(url, []).append(make_ready)  # a lot page renders what every flow reads from it
+    pages = {url: PAGE_TEMPLATE.format(busy_ms=busy_ms, render_ms=render_ms, make_ready='; '.join(parts))
+             for url, parts in scripts.items()}
+
+    async def handle(route):
+        url = route.request.url
+        if '/__poll' in url:
+            await asyncio.sleep(0.1)
+            await route.fulfill(content_type='application/json', body='{}')
+        else:
+            await route.fulfill(content_type='text/html', body=pages.get(url.split('#')[0], '<html></html>'))
+
+    await context.route('https://www.copart.com/**', handle)
+    await context.route('https://www.iaai.com/**', handle)
+
+
+async def old_wait(page, url, load_state, sleep_seconds, idle_timeout):
+    await page.goto(url, timeout=60000)
+    try:
+        await page.wait_for_load_state(load_state, timeout=idle_timeout)
+    except PlaywrightTimeoutError:
+        pass
+    await asyncio.sleep(sleep_seconds)
+
+
+async def run_benchmark(runs, render_ms, busy_ms, idle_timeout, headless):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        await install_stand_ins(context, render_ms, busy_ms)
+        page = await context.new_page()
+
+        totals = {}
+        for _ in range(runs):
+            for flow, url, ready, _, load_state, sleep_seconds in STEPS:
+                started = time.perf_counter()
+                await old_wait(page, url, load_state, sleep_seconds, idle_timeout)
+                old_s = time.perf_counter() - started
+
+                started = time.perf_counter()
+                await goto_ready(page, url, ready)
+                new_s = time.perf_counter() - started
+
+                flow_totals = totals.setdefault(flow, [0.0, 0.0])
+                flow_totals[0] += old_s / runs
+                flow_totals[1] += new_s / runs
+        await browser.close()
+
+    print(f"\n{'flow':<14}{'networkidle+sleep':>20}{'readiness':>12}{'saved':>10}")
+    old_total = new_total = 0.0
+    for flow, (old_s, new_s) in totals.items():
+        old_total += old_s
+        new_total += new_s
+        print(f"{flow:<14}{old_s:>19.1f}s{new_s:>11.1f}s{old_s - new_s:>9.1f}s")
+    print(f"{'total':<14}{old_total:>19.1f}s{new_total:>11.1f}s{old_total - new_total:>9.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wall-clock of networkidle+sleep vs readiness predicates')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--render-ms', type=int, default=800, help='When the stand-in renders what the flow reads')
+    parser.add_argument('--busy-ms', type=int, default=6000, help='How long the stand-in keeps polling')
+    parser.add_argument('--idle-timeout', type=int, default=15000, help='networkidle timeout (the flows use 60000)')
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.runs, args.render_ms, args.busy_ms, args.idle_timeout, args.headless))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Page Parser Benchmark
+Parses the saved fixtures without a browser and reports pages per second:
+  iaai_MyVehiclesNew.html      -> parse_my_vehicles()     (one record per vehicle row)
+  iaai.com_VehicleDetail.html  -> parse_vehicle_detail()
+  copart_place_bid.html        -> parse_lot_html()
+Each kind is timed on its own in this process, then a mixed batch of --pages pages goes through
+parse_many() serially and in a process pool of --workers. --stdlib forces the html.parser tree
+(AUCTION_PAGE_PARSER=stdlib) even when lxml is installed, to compare the two.
+
+Usage: python benchmark_page_parsers.py [--runs 5] [--pages 120] [--workers 4] [--stdlib]
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import time
+from saved_pages import page_source
+
+FIXTURES = [
+    ('iaai_my_vehicles', 'iaai_MyVehiclesNew.html'),
+    ('iaai_vehicle_detail', 'iaai.com_VehicleDetail.html'),
+    ('copart_lot', 'copart_place_bid.html'),
+]
+
+
+def records_in(result):
+    if result is None:
+        return 0
+    return len(result) if isinstance(result, list) else 1
+
+
+def run_benchmark(runs, pages, workers):
+    sources = {kind: page_source(name) for kind, name in FIXTURES}
+    import page_parsers  # after main() has set AUCTION_PAGE_PARSER, which pool workers inherit too
+    print(f"Parser: {'lxml' if page_parsers.USE_LXML else 'html.parser'}")
+
+    print(f"\n{'page':<22}{'source':>10}{'median':>11}{'pages/s':>10}{'records':>9}")
+    for kind, page_html in sources.items():
+        times, result = [], None
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = page_parsers.parse_page(kind, page_html)
+            times.append(time.perf_counter() - started)
+        median = statistics.median(times)
+        print(f"{kind:<22}{len(page_html) / 1024:>6.0f} KiB{median * 1000:>8.1f} ms"
+              f"{1 / median:>10.1f}{records_in(result):>9}")
+
+    batch = list(itertools.islice(itertools.cycle(sources.items()), pages))
+    batch_kib = sum(len(page_html) for _, page_html in batch) / 1024
+    print(f"\nMixed batch: {pages} pages, {batch_kib / 1024:.1f} MiB")
+    rows = []
+    for label, pool_size in (('serial', 1), (f'pool x{workers}', workers)):
+        started = time.perf_counter()
+        results = page_parsers.parse_many(batch, workers=pool_size)
+        elapsed = time.perf_counter() - started
+        rows.append((label, elapsed, sum(records_in(result) for result in results)))
+
+    print(f"\n{'path':<12}{'total':>10}{'pages/s':>10}{'records':>9}")
+    for label, elapsed, records in rows:
+        print(f"{label:<12}{elapsed:>8.2f} s{pages / elapsed:>10.1f}{records:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline page parsing throughput over the saved fixtures')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--pages', type=int, default=120, help='Pages in the mixed batch')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--stdlib', action='store_true', help='Use html.parser even when lxml is installed')
+    args = parser.parse_args()
+    if args.stdlib:
+        os.environ['AUCTION_PAGE_PARSER'] = 'stdlib'
+    run_benchmark(args.runs, args.pages, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Resource Policy Benchmark
+Loads each page with the resource policy off and on (fresh context per load, so no cache either way)
+and reports load time, request count and transferred bytes.
+Without URLs the saved pages in experiments/ are served from a local HTTP server (view-source captures
+as their recovered source); their third-party tags (tag.js, Google Tag Manager, pixels) still go to the
+network, which is what the policy removes.
+
+Usage: python benchmark_resource_policy.py [url ...] [--runs 5] [--headless] [--wait load|networkidle]
+"""
+
+import argparse
+import asyncio
+import http.server
+import statistics
+import threading
+import time
+from playwright.async_api import async_playwright
+from resource_policy import ResourcePolicy
+from saved_pages import page_source
+
+SAVED_PAGES = ['Api.html', 'iaai.com_VehicleDetail.html', 'copart_place_bid.html']
+
+
+class SavedPageHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the saved pages by name; view-source captures are served as the page they show"""
+
+    def do_GET(self):
+        name = self.path.lstrip('/').split('?')[0]
+        if name not in SAVED_PAGES:
+            self.send_error(404)
+            return
+        body = page_source(name).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_saved_pages():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SavedPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def load_once(browser, url, policy, wait_until):
+    context = await browser.new_context()
+    if policy:
+        await policy.apply(context)
+    page = await context.new_page()
+    finished = []
+    page.on('requestfinished', lambda request: finished.append(request))
+
+    started = time.perf_counter()
+    try:
+        await page.goto(url, wait_until=wait_until, timeout=60000)
+    except Exception as e:
+        print(f"  ⚠️ {url}: {e}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    transferred = 0
+    for request in finished:
+        try:
+            sizes = await request.sizes()
+            transferred += sizes['responseBodySize'] + sizes['responseHeadersSize']
+        except Exception:
+            continue
+    await context.close()
+    return elapsed_ms, len(finished), transferred
+
+
+async def run_benchmark(urls, runs, headless, wait_until):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        for url in urls:
+            print(f"\n{url}")
+            for label in ('off', 'on'):
+                times, counts, sizes = [], [], []
+                policy = ResourcePolicy() if label == 'on' else None  # counters accumulate over the runs
+                for _ in range(runs):
+                    elapsed_ms, requests, transferred = await load_once(browser, url, policy, wait_until)
+                    times.append(elapsed_ms)
+                    counts.append(requests)
+                    sizes.append(transferred)
+                print(f"  policy {label:<3} load p50={statistics.median(times):8.1f} ms  "
+                      f"mean={statistics.mean(times):8.1f} ms  requests={statistics.median(counts):5.0f}  "
+                      f"bytes={statistics.median(sizes) / 1024:9.1f} KiB")
+                if policy:
+                    print(f"             blocked per load: {dict((k, v // runs) for k, v in policy.blocked.items())}")
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Page load time and bytes with the resource policy off and on')
+    parser.add_argument('urls', nargs='*', help='Pages to load (default: saved pages served locally)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--wait', default='load', choices=['load', 'domcontentloaded', 'networkidle'])
+    args = parser.parse_args()
+
+    server = None
+    urls = args.urls
+    if not urls:
+        server, base = serve_saved_pages()
+        urls = [f"{base}/{name}" for name in SAVED_PAGES]
+    try:
+        asyncio.run(run_benchmark(urls, args.runs, args.headless, args.wait))
+    finally:
+        if server:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+WebSocket Buffer Memory Benchmark
+Simulates a monitor running for 12 hours (simulated clock, runs in seconds) and checks
+that the captured-frame buffer stays bounded while the old plain list keeps growing.
+Also times the "messages in the last 30 seconds" health-check query.
+
+Usage: python benchmark_ring_buffer.py [--hours 12] [--rate 20] [--capacity 5000]
+Exits with status 1 if memory keeps growing after the buffer is full.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from ring_buffer import TimedRingBuffer
+
+FRAME = '42["bid",{"lotNumber":"58231374","currentBid":1250,"bidder":"CA - Online Bidder"}]'
+
+
+def make_message(sim_time, start):
+    """Same shape as AuctionMonitor._record_ws_frame stores"""
+    return {
+        'url': 'wss://g2auction.copart.com/socket',
+        'data': FRAME,
+        'timestamp': (start + timedelta(seconds=sim_time)).isoformat()
+    }
+
+
+def run_soak(hours, rate, capacity, checkpoints=12):
+    clock = {'now': 0.0}
+    buffer = TimedRingBuffer(capacity=capacity, clock=lambda: clock['now'])
+    start = datetime.now()
+    total = int(hours * 3600 * rate)
+    step = 1.0 / rate
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    samples = []
+    query_times = []
+
+    for i in range(total):
+        clock['now'] = i * step
+        buffer.append(make_message(clock['now'], start))
+
+        # Health check every 30 simulated seconds, as in _monitor_auction
+        if i % int(30 * rate) == 0:
+            began = time.perf_counter()
+            buffer.count_since(30)
+            buffer.latest(3)
+            query_times.append((time.perf_counter() - began) * 1e6)
+
+        if i and i % (total // checkpoints) == 0:
+            current = tracemalloc.get_traced_memory()[0] - baseline
+            samples.append((clock['now'] / 3600, len(buffer), current))
+
+    current = tracemalloc.get_traced_memory()[0] - baseline
+    samples.append((clock['now'] / 3600, len(buffer), current))
+    tracemalloc.stop()
+    return samples, query_times, total
+
+
+def list_growth_estimate(total):
+    """Memory the previous unbounded list would hold after `total` frames"""
+    start = datetime.now()
+    sample_count = 10000
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    messages = [make_message(i * 0.05, start) for i in range(sample_count)]
+    per_message = (tracemalloc.get_traced_memory()[0] - baseline) / sample_count
+    tracemalloc.stop()
+    del messages
+    return per_message * total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulated long-running memory check for the WebSocket buffer')
+    parser.add_argument('--hours', type=float, default=12, help='Simulated monitoring duration')
+    parser.add_argument('--rate', type=float, default=20, help='WebSocket frames per second')
+    parser.add_argument('--capacity', type=int, default=5000, help='Ring buffer capacity')
+    args = parser.parse_args()
+
+    print(f"Simulating {args.hours}h at {args.rate} frames/s with capacity {args.capacity}...")
+    samples, query_times, total = run_soak(args.hours, args.rate, args.capacity)
+
+    print(f"{'hour':>6} {'buffered':>9} {'memory MB':>10}")
+    for hour, size, memory in samples:
+        print(f"{hour:>6.1f} {size:>9} {memory / 1024 / 1024:>10.2f}")
+
+    query_times.sort()
+    print(f"Health-check query: p50={query_times[len(query_times) // 2]:.1f} us, max={query_times[-1]:.1f} us")
+    print(f"Unbounded list would hold {total} frames, about {list_growth_estimate(total) / 1024 / 1024:.0f} MB")
+
+    # Once full, memory must stay flat; allow 10% noise between the first and last checkpoint
+    first_full = samples[0][2]
+    last = samples[-1][2]
+    if last > first_full * 1.10:
+        print(f"❌ Memory grew from {first_full / 1024 / 1024:.2f} MB to {last / 1024 / 1024:.2f} MB")
+        sys.exit(1)
+    print("✅ Buffer memory stayed bounded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Local bid-increment schedule
+The minimum raise on a lot depends only on the band its current bid falls in, so the next bid can
+be computed from the current bid alone instead of scraping `.dynamic-bid-inc` (and giving up when
+it is missing). When the page does show an increment it is cross-checked against the schedule;
+on disagreement the page wins and the mismatch is logged, so a changed schedule is noticed.
+next_bids() and steps_to_reach() work on whole sale lists at once (vectorized with numpy when it
+is installed) for planning.
+
+AUCTION_BID_INCREMENTS may point to a JSON file of [band_floor, increment] pairs, e.g.
+    [[0, 25], [1000, 50], [5000, 100], [10000, 250]]
+"""
+
+import bisect
+import json
+import math
+import os
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError as e:
+    NUMPY_AVAILABLE = False
+    print(f"numpy not available, sale-list bid planning runs in pure Python: {e}")
+    print("Install with: pip install numpy")
+
+# (lowest current bid in the band, minimum raise in that band)
+DEFAULT_BANDS = [
+    (0, 25),
+    (1000, 50),
+    (5000, 100),
+    (10000, 250),
+]
+
+
+class IncrementSchedule:
+    """Price bands -> minimum bid increment"""
+
+    def __init__(self, bands=None, name='default'):
+        bands = sorted((float(floor), float(increment)) for floor, increment in (bands or DEFAULT_BANDS))
+        self.floors = [floor for floor, _ in bands]
+        self.increments = [increment for _, increment in bands]
+        self.name = name
+        self.checks = 0
+        self.mismatches = []  # (current bid, schedule increment, page increment)
+
+    @classmethod
+    def from_env(cls):
+        """Schedule from AUCTION_BID_INCREMENTS, or the default bands"""
+        path = os.getenv('AUCTION_BID_INCREMENTS')
+        if not path:
+            return cls()
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f), name=os.path.basename(path))
+        except Exception as e:
+            print(f"⚠️ Could not load bid increments {path}, using the default bands: {e}")
+            return cls()
+
+    def increment_for(self, current_bid):
+        band = bisect.bisect_right(self.floors, current_bid) - 1
+        return self.increments[max(band, 0)]
+
+    def next_bid(self, current_bid):
+        """Lowest valid bid over `current_bid`, in whole dollars"""
+        return round(current_bid + self.increment_for(current_bid))
+
+    def check(self, current_bid, page_increment):
+        """Increment to use: the page's when it shows one (a disagreement is logged), else the schedule's"""
+        expected = self.increment_for(current_bid)
+        if not page_increment:
+            return expected
+        self.checks += 1
+        if abs(page_increment - expected) >= 0.01:
+            self.mismatches.append((current_bid, expected, page_increment))
+            print(f"⚠️ Increment schedule '{self.name}' says ${expected:.2f} at ${current_bid:.2f}, "
+                  f"page shows ${page_increment:.2f} - using the page value")
+        return page_increment
+
+    def next_bids(self, current_bids):
+        """next_bid() for a whole sale list"""
+        if not NUMPY_AVAILABLE:
+            return [self.next_bid(bid) for bid in current_bids]
+        bids = np.asarray(current_bids, dtype=float)
+        bands = np.maximum(np.searchsorted(self.floors, bids, side='right') - 1, 0)
+        return np.rint(bids + np.asarray(self.increments)[bands]).astype(int).tolist()
+
+    def steps_to_reach(self, current_bids, targets):
+        """Minimum raises needed from each current bid until the bid reaches its target (0 when already there)"""
+        if not NUMPY_AVAILABLE:
+            return [self._steps(bid, target) for bid, target in zip(current_bids, targets)]
+        prices = np.asarray(current_bids, dtype=float).copy()
+        targets = np.asarray(targets, dtype=float)
+        steps = np.zeros(prices.shape, dtype=int)
+        # Prices only rise, so one pass over the bands in order walks every lot through its bands
+        for index, (floor, increment) in enumerate(zip(self.floors, self.increments)):
+            ceiling = self.floors[index + 1] if index + 1 < len(self.floors) else np.inf
+            active = (prices >= floor if index else True) & (prices < ceiling) & (prices < targets)
+            band_steps = np.where(active, np.ceil((np.minimum(targets, ceiling) - prices) / increment), 0).astype(int)
+            prices += band_steps * increment
+            steps += band_steps
+        return steps.tolist()
+
+    def _steps(self, price, target):
+        steps = 0
+        for index, (floor, increment) in enumerate(zip(self.floors, self.increments)):
+            ceiling = self.floors[index + 1] if index + 1 < len(self.floors) else math.inf
+            if (price >= floor or not index) and price < ceiling and price < target:
+                band_steps = math.ceil((min(target, ceiling) - price) / increment)
+                price += band_steps * increment
+                steps += band_steps
+        return steps
+
+    def stats(self):
+        return {'name': self.name, 'checks': self.checks, 'mismatches': len(self.mismatches)}
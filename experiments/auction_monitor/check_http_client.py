@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+HTTP Client Check
+Runs the pooled session client against a local stand-in server that behaves like the auction sites
+for read-only views: /login sets a session cookie, and the watch list, a Copart lot page
+(copart_place_bid.html), IAAI My Vehicles (iaai_MyVehiclesNew.html) and a JSON endpoint answer only
+with that cookie - otherwise they redirect to /login. The browser logs in, the client imports its
+cookies, and the check verifies the parsed results, keep-alive reuse (requests vs TCP connections
+seen by the server), the fallback to the browser when the session is rejected, and times an HTTP
+fetch + parse against a browser page load of the same lot.
+--no-browser skips Playwright and hands the client the cookie a login would have set.
+
+Usage: python check_http_client.py [--runs 5] [--concurrency 12] [--no-browser] [--headless]
+"""
+
+import argparse
+import asyncio
+import http.server
+import json
+import statistics
+import sys
+import threading
+import time
+from saved_pages import page_source
+from http_client import SessionHttpClient, fetch_lot_details, fetch_my_vehicles, fetch_watchlist
+
+LOT_NUMBER = '81178215'  # the lot in copart_place_bid.html
+WATCHED_LOTS = [LOT_NUMBER, '80524871', '79933012']
+SESSION_COOKIE = ('copart_session', 'stand-in-session')
+WATCHLIST_PAGE = """<html><body><table id="serverSideDataTable"><tbody>
+{rows}
+</tbody></table></body></html>"""
+WATCHLIST_ROW = '<tr><td><span class="search_result_lot_number"><a href="/lot/{lot}">{lot}</a></span></td></tr>'
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Session-protected stand-ins for the read-only pages"""
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+    pages = {}
+    connections = set()
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            StandInHandler.requests += 1
+            StandInHandler.connections.add(self.client_address)
+        path = self.path.split('?')[0]
+        if path == '/login':
+            self.send_body(b'<html><body>Signed in</body></html>', 'text/html',
+                           {'Set-Cookie': f'{SESSION_COOKIE[0]}={SESSION_COOKIE[1]}; Path=/'})
+            return
+        if path not in self.pages:
+            self.send_error(404)
+            return
+        if f'{SESSION_COOKIE[0]}={SESSION_COOKIE[1]}' not in (self.headers.get('Cookie') or ''):
+            self.send_response(302)
+            self.send_header('Location', f'/login?returnUrl={path}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body, content_type = self.pages[path]
+        self.send_body(body, content_type)
+
+    def send_body(self, body, content_type, headers=None):
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_stand_in():
+    watchlist = WATCHLIST_PAGE.format(rows='\n'.join(WATCHLIST_ROW.format(lot=lot) for lot in WATCHED_LOTS))
+    StandInHandler.pages = {
+        '/watchList': (watchlist.encode('utf-8'), 'text/html'),
+        f'/lot/{LOT_NUMBER}': (page_source('copart_place_bid.html').encode('utf-8'), 'text/html'),
+        '/MyVehiclesNew': (page_source('iaai_MyVehiclesNew.html').encode('utf-8'), 'text/html'),
+        '/data/watchlist.json': (json.dumps({'lots': WATCHED_LOTS}).encode('utf-8'), 'application/json'),
+    }
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class Checks:
+    def __init__(self):
+        self.failed = 0
+
+    def check(self, label, ok, detail=''):
+        print(f"{'✅' if ok else '❌'} {label}{f' - {detail}' if detail else ''}")
+        if not ok:
+            self.failed += 1
+
+
+async def timed(coroutine_factory, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await coroutine_factory()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+async def check_client(checks, client, base_url, runs, concurrency):
+    lots = await fetch_watchlist(client, url=f'{base_url}/watchList')
+    checks.check('watch list over HTTP', lots == WATCHED_LOTS, str(lots))
+    lot = await fetch_lot_details(client, LOT_NUMBER, url=f'{base_url}/lot/{LOT_NUMBER}')
+    checks.check('lot details over HTTP', lot is not None and lot.lot_number == LOT_NUMBER,
+                 f'lot {lot.lot_number}, current bid {lot.current_bid}' if lot else 'no lot')
+    rows = await fetch_my_vehicles(client, url=f'{base_url}/MyVehiclesNew')
+    checks.check('My Vehicles over HTTP', bool(rows), f'{len(rows or [])} rows')
+    data = await client.get_json(f'{base_url}/data/watchlist.json')
+    checks.check('JSON over HTTP', data.get('lots') == WATCHED_LOTS)
+
+    StandInHandler.connections.clear()
+    StandInHandler.requests = 0
+    lot_url = f'{base_url}/lot/{LOT_NUMBER}'
+    for _ in range(2):
+        await asyncio.gather(*[fetch_lot_details(client, LOT_NUMBER, url=lot_url) for _ in range(concurrency)])
+    connections = len(StandInHandler.connections)
+    checks.check('keep-alive reuse', connections <= client.per_host < StandInHandler.requests,
+                 f'{StandInHandler.requests} requests over {connections} connections (per-host cap {client.per_host})')
+
+    async with SessionHttpClient() as anonymous:
+        rejected = await fetch_lot_details(anonymous, LOT_NUMBER, url=lot_url)
+    checks.check('rejected session returns None without a page', rejected is None)
+
+    http_ms = await timed(lambda: fetch_lot_details(client, LOT_NUMBER, url=lot_url), runs)
+    print(f"⏱️ HTTP fetch + parse of the lot page: {http_ms:.1f} ms (median of {runs})")
+    return lot_url, http_ms
+
+
+async def run_check(runs, concurrency, use_browser, headless):
+    server, base_url = serve_stand_in()
+    checks = Checks()
+    try:
+        if not use_browser:
+            cookie = {'name': SESSION_COOKIE[0], 'value': SESSION_COOKIE[1], 'domain': '127.0.0.1', 'path': '/'}
+            async with SessionHttpClient([cookie]) as client:
+                await check_client(checks, client, base_url, runs, concurrency)
+                print(f"📊 {client.stats()}")
+            return checks.failed
+
+        from playwright.async_api import async_playwright
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless)
+            context = await browser.new_context()
+            page = await context.new_page()
+            await page.goto(f'{base_url}/login')
+            client = await SessionHttpClient.from_context(context)
+            try:
+                lot_url, http_ms = await check_client(checks, client, base_url, runs, concurrency)
+                print(f"📊 {client.stats()}")
+
+                async with SessionHttpClient() as anonymous:
+                    lot = await fetch_lot_details(anonymous, LOT_NUMBER, page=page, url=lot_url)
+                checks.check('rejected session falls back to the browser', lot is not None and lot.lot_number == LOT_NUMBER)
+
+                browser_ms = await timed(lambda: page.goto(lot_url, wait_until='domcontentloaded'), runs)
+                print(f"⏱️ Browser load of the lot page: {browser_ms:.1f} ms (median of {runs}), "
+                      f"{browser_ms / http_ms:.1f}x the HTTP path")
+            finally:
+                await client.aclose()
+                await browser.close()
+        return checks.failed
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Session HTTP client against a local stand-in server')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=12, help='Simultaneous lot fetches in the reuse check')
+    parser.add_argument('--no-browser', action='store_true', help='Skip Playwright; use a stand-in session cookie')
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+    failed = asyncio.run(run_check(args.runs, args.concurrency, not args.no_browser, args.headless))
+    print(f"\n{'All checks passed' if not failed else f'{failed} check(s) failed'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Warm pool of logged-in browser contexts
+Launching Chromium and logging in to Copart takes tens of seconds. The pool does it once per context,
+keeps `size` contexts idle and logged in (re-checking each session in the background), and leases them
+to callers so a one-off action starts on an authenticated page in well under a second.
+The pool is opt-in: with AUCTION_CONTEXT_POOL_SIZE=0 (the default) nothing is launched until the first
+lease, which logs in a single context.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from session_store import session_is_live
+
+POOL_SIZE = int(os.getenv('AUCTION_CONTEXT_POOL_SIZE', '0'))
+CHECK_INTERVAL = float(os.getenv('AUCTION_CONTEXT_CHECK_SECONDS', '300'))
+LEASE_TIMEOUT = float(os.getenv('AUCTION_CONTEXT_LEASE_SECONDS', '60'))
+LEASE_POLL_SECONDS = 1.0  # how often a waiting lease re-checks that the pool still has contexts
+
+
+class PooledContext:
+    """One browser context, its reusable page and bookkeeping"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.created_at = time.monotonic()
+        self.checked_at = time.monotonic()
+        self.leases = 0
+        self.needs_check = False
+
+
+class ContextPool:
+    """Keeps `size` logged-in contexts warm; `login(page, context)` is the caller's Copart login"""
+
+    def __init__(self, login, size=POOL_SIZE, headless=False, check_interval=CHECK_INTERVAL,
+                 liveness_check=session_is_live, lease_timeout=LEASE_TIMEOUT):
+        self.login = login
+        self.size = size
+        self.headless = headless
+        self.check_interval = check_interval
+        self.lease_timeout = lease_timeout
+        self.liveness_check = liveness_check
+        self.playwright = None
+        self.browser = None
+        self.slots = []
+        self.stats = {'leases': 0, 'lease_wait_ms': 0.0, 'logins': 0, 'login_failures': 0,
+                      'liveness_checks': 0, 'expired': 0}
+        self._idle = None
+        self._start_lock = None
+        self._maintainer = None
+        self._refiller = None
+
+    async def start(self):
+        """Launch the browser and log in `size` contexts; safe to call more than once"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._idle = asyncio.Queue()
+
+        async with self._start_lock:
+            if self.browser and self.browser.is_connected() and self.slots:
+                return
+
+            started = time.perf_counter()
+            if not self.playwright:
+                self.playwright = await async_playwright().start()
+            if self.browser:
+                try:
+                    await self.browser.close()
+                except Exception:
+                    pass
+            print(f"🚀 Warming {self.size} browser context(s)...")
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self.slots = []
+            while not self._idle.empty():  # drop slots of the old browser; waiting leases keep this queue
+                self._idle.get_nowait()
+
+            for _ in range(max(1, self.size)):
+                slot = await self._new_slot()
+                if slot:
+                    self.slots.append(slot)
+                    self._idle.put_nowait(slot)
+
+            if not self.slots:
+                raise RuntimeError("Context pool could not log in any browser context")
+            if self._maintainer is None or self._maintainer.done():
+                self._maintainer = asyncio.ensure_future(self._maintain())
+            print(f"✅ Context pool ready: {len(self.slots)} context(s) in {time.perf_counter() - started:.1f}s")
+
+    async def _new_slot(self):
+        context = await self.browser.new_context()
+        page = await context.new_page()
+        try:
+            await self.login(page, context)
+            self.stats['logins'] += 1
+        except Exception as e:
+            self.stats['login_failures'] += 1
+            print(f"❌ Context pool login failed: {e}")
+            await context.close()
+            return None
+        slot = PooledContext(context, page)
+        await self._reset_page(slot)
+        return slot
+
+    async def _reset_page(self, slot):
+        """Leave one blank page so an idle context holds no auction page, sockets or timers"""
+        for page in list(slot.context.pages):
+            if page is not slot.page:
+                await page.close()
+        if slot.page.is_closed():
+            slot.page = await slot.context.new_page()
+        await slot.page.goto('about:blank')
+
+    @asynccontextmanager
+    async def lease(self):
+        """Borrow a logged-in context: `async with pool.lease() as slot:` then use slot.page / slot.context
+
+        Raises RuntimeError when no context frees up within `lease_timeout` seconds, or when every
+        context is gone and logging in again fails.
+        """
+        waited = time.perf_counter()
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            # Re-checked while waiting: failed re-logins can empty the pool under a waiting lease
+            if not self.slots or not self.browser or not self.browser.is_connected():
+                await self.start()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(f"No pooled browser context became free within {self.lease_timeout:.0f}s")
+            try:
+                slot = await asyncio.wait_for(self._idle.get(), timeout=min(remaining, LEASE_POLL_SECONDS))
+            except asyncio.TimeoutError:
+                continue
+            if slot in self.slots:
+                break
+            await self._release(slot)  # left over from a relaunched browser
+        self.stats['leases'] += 1
+        self.stats['lease_wait_ms'] += (time.perf_counter() - waited) * 1000
+        slot.leases += 1
+        try:
+            yield slot
+        except Exception:
+            slot.needs_check = True  # the caller may have failed because the session is gone
+            raise
+        finally:
+            await self._release(slot)
+
+    async def _release(self, slot):
+        if slot not in self.slots:
+            # Leased before the browser was relaunched; its replacement is already in the pool
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+            return
+        try:
+            await self._reset_page(slot)
+            if slot.needs_check and not await self._check(slot):
+                slot = await self._replace(slot)
+        except Exception as e:
+            print(f"⚠️ Leased context is unusable, replacing it: {e}")
+            slot = await self._replace(slot)
+        if slot:
+            self._idle.put_nowait(slot)
+
+    async def _check(self, slot):
+        self.stats['liveness_checks'] += 1
+        live = await self.liveness_check(slot.context)
+        slot.checked_at = time.monotonic()
+        slot.needs_check = False
+        if not live:
+            self.stats['expired'] += 1
+        return live
+
+    async def _replace(self, slot):
+        """Swap a dead or logged-out context for a freshly logged-in one"""
+        if slot in self.slots:
+            self.slots.remove(slot)
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+        if not self.browser.is_connected():
+            return None  # the next lease relaunches the browser
+        fresh = await self._new_slot()
+        if fresh:
+            self.slots.append(fresh)
+        elif self._refiller is None or self._refiller.done():
+            self._refiller = asyncio.ensure_future(self._refill())
+        return fresh
+
+    async def _refill(self):
+        """Log in contexts until the pool is back to `size`; stops at the first failure (the maintainer retries)"""
+        browser = self.browser
+        while browser and browser.is_connected() and len(self.slots) < max(1, self.size):
+            try:
+                slot = await self._new_slot()
+            except Exception as e:
+                print(f"⚠️ Context pool refill failed: {e}")
+                return
+            if not slot:
+                return
+            if self.browser is not browser:
+                await slot.context.close()  # relaunched meanwhile; start() filled the new browser
+                return
+            self.slots.append(slot)
+            self._idle.put_nowait(slot)
+
+    async def _maintain(self):
+        """Background check of idle contexts; only contexts that are not leased are touched"""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for _ in range(self._idle.qsize()):
+                try:
+                    slot = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                try:
+                    if not await self._check(slot):
+                        print("🔄 Pooled session expired, logging in again")
+                        slot = await self._replace(slot)
+                except Exception as e:
+                    print(f"⚠️ Context pool maintenance failed: {e}")
+                if slot:
+                    self._idle.put_nowait(slot)
+            await self._refill()
+
+    def status(self):
+        return dict(self.stats, size=self.size, contexts=len(self.slots),
+                    idle=self._idle.qsize() if self._idle else 0)
+
+    async def close(self):
+        if self._maintainer:
+            self._maintainer.cancel()
+            self._maintainer = None
+        if self._refiller:
+            self._refiller.cancel()
+            self._refiller = None
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        self.slots = []
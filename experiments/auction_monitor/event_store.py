@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Durable bid-event store
+Append-only SQLite (WAL mode) history of bid / lot / sold events, one database file per auction.
+Appends go into an in-memory queue and a writer thread commits them in batches, so the
+monitoring loop never waits on disk.
+"""
+
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+HISTORY_DIR = os.getenv('AUCTION_HISTORY_DIR', 'auction_history')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bid_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lot_number TEXT,
+    recorded_at REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    amount REAL,
+    bidder TEXT,
+    source TEXT,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bid_events_lot_time ON bid_events (lot_number, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_bid_events_time ON bid_events (recorded_at);
+"""
+
+COLUMNS = ('id', 'lot_number', 'recorded_at', 'event_type', 'amount', 'bidder', 'source', 'payload')
+
+
+def auction_partition(auction):
+    """File-safe partition name for an auction id or dashboard URL, e.g. '833-A'"""
+    if 'auctionDetails=' in auction:
+        auction = auction.split('auctionDetails=')[1].split('&')[0]
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', auction).strip('_') or 'default'
+
+
+def history_path(auction, directory=None):
+    return os.path.join(directory or HISTORY_DIR, f"{auction_partition(auction)}.db")
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')  # WAL + NORMAL: durable across app crashes, fast commits
+    return connection
+
+
+class BidEventStore:
+    """Write-behind appender for one auction's event history"""
+
+    def __init__(self, auction, directory=None, batch_size=1000, flush_interval=0.5, max_queue=50000):
+        self.auction_id = auction_partition(auction)
+        self.path = history_path(auction, directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.appended = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = _connect(self.path)
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._thread = threading.Thread(target=self._writer, name=f'event-store-{self.auction_id}', daemon=True)
+        self._thread.start()
+
+    def append(self, event_type, lot_number=None, amount=None, bidder=None, source=None, payload=None,
+               recorded_at=None):
+        """Queue one event; never blocks (events are dropped and counted if the writer falls far behind)"""
+        row = (
+            str(lot_number) if lot_number not in (None, '', 'N/A') else None,
+            recorded_at if recorded_at is not None else time.time(),
+            event_type,
+            amount,
+            bidder if bidder not in ('', 'N/A') else None,
+            source,
+            json.dumps(payload, default=str) if payload is not None else None
+        )
+        try:
+            self._queue.put_nowait(row)
+            self.appended += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _writer(self):
+        connection = _connect(self.path)
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            item = first
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(
+                            'INSERT INTO bid_events (lot_number, recorded_at, event_type, amount, bidder, source, payload) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?)', batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except sqlite3.Error as e:
+                    self.dropped += len(batch)
+                    print(f"⚠️ Event store write failed for {self.auction_id}: {e}")
+        connection.close()
+
+    def close(self, timeout=5):
+        """Flush queued events and stop the writer thread"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'appended': self.appended,
+            'written': self.written,
+            'queued': self._queue.qsize(),
+            'dropped': self.dropped,
+            'batches': self.batches
+        }
+
+
+def query_history(auction, lot_number=None, start=None, end=None, limit=1000, directory=None, after_id=None):
+    """{'events', 'truncated', 'next_since', 'next_after_id'} for an auction (optionally one lot), events oldest
+    first: the latest `limit` events, or with `start` (epoch seconds) the first `limit` from there.
+    Pages are cut on (recorded_at, id): passing next_since/next_after_id back as start/after_id resumes
+    after the last event sent, even when several events share its recorded_at"""
+    path = history_path(auction, directory)
+    if not os.path.exists(path):
+        return {'events': [], 'truncated': False, 'next_since': None, 'next_after_id': None}
+
+    clauses, params = [], []
+    if lot_number:
+        clauses.append('lot_number = ?')
+        params.append(str(lot_number))
+    if start is not None and after_id is not None:
+        clauses.append('(recorded_at > ? OR (recorded_at = ? AND id > ?))')
+        params.extend([float(start), float(start), int(after_id)])
+    elif start is not None:
+        clauses.append('recorded_at >= ?')
+        params.append(float(start))
+    if end is not None:
+        clauses.append('recorded_at <= ?')
+        params.append(float(end))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    order = 'recorded_at, id' if start is not None else 'recorded_at DESC, id DESC'
+    params.append(int(limit) + 1)  # one extra row tells whether the page is truncated
+
+    # Readers get their own connection; WAL lets them run alongside the writer thread
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM bid_events {where} ORDER BY {order} LIMIT ?", params
+        ).fetchall()
+    finally:
+        connection.close()
+
+    truncated = len(rows) > limit
+    next_since = next_after_id = None
+    if truncated:
+        rows.pop()
+        if start is not None:
+            last = dict(zip(COLUMNS, rows[-1]))
+            next_since, next_after_id = last['recorded_at'], last['id']
+    if start is None:
+        rows.reverse()
+
+    events = []
+    for row in rows:
+        event = dict(zip(COLUMNS, row))
+        if event['payload']:
+            event['payload'] = json.loads(event['payload'])
+        events.append(event)
+    return {'events': events, 'truncated': truncated, 'next_since': next_since, 'next_after_id': next_after_id}
+
+
+def list_lots(auction, directory=None):
+    """Per-lot summary: event count, first/last time and highest amount"""
+    path = history_path(auction, directory)
+    if not os.path.exists(path):
+        return []
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(
+            'SELECT lot_number, COUNT(*), MIN(recorded_at), MAX(recorded_at), MAX(amount) '
+            'FROM bid_events GROUP BY lot_number ORDER BY MIN(recorded_at)'
+        ).fetchall()
+    finally:
+        connection.close()
+    return [{'lot_number': lot, 'events': count, 'first_at': first, 'last_at': last, 'high_amount': high}
+            for lot, count, first, last, high in rows]
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Compiled extraction plan for auction pages
+The whole selector fallback table is sent into a frame once and resolved by a single
+evaluate() call, instead of one Playwright round trip per selector.
+"""
+
+# Each field maps to an ordered list of candidates; the first visible, non-empty match wins.
+#   css:            selector to query
+#   attr:           read this attribute first, falling back to the text content
+#   all:            scan every match instead of only the first one
+#   exclude:        values to skip (e.g. the "Bid!" label next to the bidder name)
+#   exclude_prefix: skip values starting with this prefix (e.g. "$" amounts)
+#   regex:          keep only the first capture group
+FRAME_FIELDS = {
+    'current_bid': [
+        {'css': '.auctionrunningdiv-MACRO text[fill="#0757ac"]'},
+        {'css': '.current-bid'},
+        {'css': '.bid-amount'},
+        {'css': '.bid-price'},
+        {'css': '[data-uname*="bid"]'},
+        {'css': 'input[name="bidAmount"]', 'attr': 'value'},
+    ],
+    'current_bidder': [
+        {'css': '.auctionrunningdiv-MACRO text[fill="black"]', 'all': True,
+         'exclude': ['Bid!'], 'exclude_prefix': '$'},
+        {'css': '.current-bidder'},
+        {'css': '.bidder-name'},
+        {'css': '.winning-bidder'},
+    ],
+    'time_remaining': [
+        {'css': selector} for selector in [
+            '.time-remaining', '.countdown', '.time-left', '[data-uname*="time"]',
+            '.countdown-timer', '.auction-timer', '.time-display',
+            '[class*="countdown"]', '[class*="timer"]'
+        ]
+    ],
+    'lot_title': [
+        {'css': '.titlelbl.ellipsis[title]', 'attr': 'title'},
+        {'css': '.lot-title', 'attr': 'title'},
+        {'css': '.vehicle-title', 'attr': 'title'},
+        {'css': 'h1', 'attr': 'title'},
+        {'css': '[data-uname*="title"]', 'attr': 'title'},
+    ],
+    'lot_number': [
+        {'css': selector, 'regex': r'(\d+)'} for selector in [
+            '.itempair .titlelbl.ellipsis[href*="lot/"]',
+            '.lot-number',
+            '.lot-num',
+            '#LotNumber',
+            'span[data-uname="lotdetailVinvalue"]',
+            '[data-uname*="lot"]'
+        ]
+    ],
+    'active_bidders': [
+        {'css': selector, 'regex': r'(\d+)'} for selector in [
+            '.active-bidders', '.bidder-count', '.bidders-online'
+        ]
+    ],
+}
+
+# Status indicators checked on the main Copart page ("ended" wins over "active"); a text phrase must be
+# an element's entire text (case-insensitive), not a substring of the page
+PAGE_STATUS = {
+    'active_text': ['auction is live', 'auction in progress', 'bidding is open', 'auction running'],
+    'active_css': ['.auction-status', '.live-auction'],
+    'ended_text': ['auction has ended', 'auction closed', 'bidding closed'],
+}
+
+FRAME_PLAN = {'fields': FRAME_FIELDS}
+PAGE_PLAN = {'fields': {}, 'status': PAGE_STATUS}
+
+EXTRACTION_PLAN_JS = """
+(plan) => {
+    const started = performance.now();
+    const result = { fields: {}, matched: {}, status: null };
+
+    function isVisible(el) {
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        return el.getClientRects().length > 0;
+    }
+
+    function readValue(el, rule) {
+        let value = rule.attr ? el.getAttribute(rule.attr) : null;
+        if (!value) value = el.textContent;
+        return value ? value.trim() : '';
+    }
+
+    function resolve(rule) {
+        let elements;
+        try {
+            elements = rule.all ? Array.from(document.querySelectorAll(rule.css))
+                                : [document.querySelector(rule.css)];
+        } catch (e) {
+            return null;  // invalid selector in this document
+        }
+        for (const el of elements) {
+            if (!el || !isVisible(el)) continue;
+            let value = readValue(el, rule);
+            if (!value) continue;
+            if (rule.exclude && rule.exclude.includes(value)) continue;
+            if (rule.exclude_prefix && value.startsWith(rule.exclude_prefix)) continue;
+            if (rule.regex) {
+                const match = value.match(new RegExp(rule.regex));
+                if (!match) continue;
+                value = match[1];
+            }
+            return value;
+        }
+        return null;
+    }
+
+    for (const [field, rules] of Object.entries(plan.fields || {})) {
+        for (const rule of rules) {
+            const value = resolve(rule);
+            if (value !== null) {
+                result.fields[field] = value;
+                result.matched[field] = rule.css;
+                break;
+            }
+        }
+    }
+
+    // An element whose whole text is one of the phrases (like the old text="..." locators), so a lot
+    // description, footer or chat line that merely mentions "auction closed" does not count
+    function hasStatusText(phrases) {
+        if (!document.body) return false;
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const node = walker.currentNode;
+            const data = node.data.toLowerCase();
+            if (!phrases.some(phrase => data.includes(phrase))) continue;
+            const text = (node.parentElement.textContent || '').replace(/\s+/g, ' ').trim().toLowerCase();
+            if (phrases.includes(text)) return true;
+        }
+        return false;
+    }
+
+    if (plan.status) {
+        if (hasStatusText(plan.status.active_text) ||
+            plan.status.active_css.some(css => document.querySelector(css))) {
+            result.status = 'active';
+        }
+        if (hasStatusText(plan.status.ended_text)) {
+            result.status = 'ended';
+        }
+    }
+
+    result.elapsedMs = performance.now() - started;
+    return result;
+}
+"""
+
+
+def apply_plan_result(data, result):
+    """Merge one evaluate() result into the auction data dict"""
+    if not result:
+        return
+    for field, value in result.get('fields', {}).items():
+        if field == 'active_bidders':
+            data[field] = int(value)
+        else:
+            data[field] = value
+    if result.get('status'):
+        data['status'] = result['status']
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP client on the browser's session
+Read-only views (watch list, lot details, IAAI My Vehicles) do not need a rendered page: the
+client takes the cookies of a logged-in Playwright context, fetches the HTML (or JSON) over pooled
+keep-alive connections and hands it to the browserless parsers. Every fetch helper takes the page
+as an optional fallback and goes back to the browser when the request fails or the session is
+rejected; interactive steps (bidding, watch list buttons, login) stay in the browser.
+
+AUCTION_HTTP_MAX_CONNECTIONS / AUCTION_HTTP_PER_HOST / AUCTION_HTTP_KEEPALIVE_SECONDS /
+AUCTION_HTTP_TIMEOUT tune the pool.
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+from lot_details import parse_lot_html, read_lot_details
+from navigation import goto_ready, COPART_LOT, COPART_WATCHLIST
+from page_parsers import parse_my_vehicles, parse_watchlist
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError as e:
+    HTTPX_AVAILABLE = False
+    print(f"httpx not available, read-only views are loaded in the browser: {e}")
+    print("Install with: pip install httpx")
+
+MAX_CONNECTIONS = int(os.getenv('AUCTION_HTTP_MAX_CONNECTIONS', '20'))
+PER_HOST = int(os.getenv('AUCTION_HTTP_PER_HOST', '6'))
+KEEPALIVE_SECONDS = float(os.getenv('AUCTION_HTTP_KEEPALIVE_SECONDS', '30'))
+TIMEOUT = float(os.getenv('AUCTION_HTTP_TIMEOUT', '15'))
+
+COPART_WATCHLIST_URL = 'https://www.copart.com/watchList'
+COPART_LOT_URL = 'https://www.copart.com/lot/{lot_number}'
+IAAI_MY_VEHICLES_URL = 'https://www.iaai.com/MyVehiclesNew'
+LOGIN_HINTS = ('login', 'signin', 'identity/account')
+
+
+class SessionRejected(Exception):
+    """The site sent the request to its login page: the imported cookies are no longer valid"""
+
+
+class SessionHttpClient:
+    """httpx.AsyncClient carrying a Playwright context's cookies, at most `per_host` requests in flight per host"""
+
+    def __init__(self, cookies=None, user_agent=None, max_connections=MAX_CONNECTIONS, per_host=PER_HOST,
+                 keepalive_seconds=KEEPALIVE_SECONDS, timeout=TIMEOUT):
+        headers = {'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+                   'Accept-Language': 'en-US,en;q=0.9'}
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        # httpx keeps a keep-alive pool per origin; the semaphores cap concurrency per host on top
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                              keepalive_expiry=keepalive_seconds)
+        self.client = httpx.AsyncClient(headers=headers, limits=limits, timeout=timeout, follow_redirects=True)
+        self.per_host = per_host
+        self._host_slots = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self.requests = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.failures = 0
+        if cookies:
+            self.set_cookies(cookies)
+
+    @classmethod
+    async def from_context(cls, context, **kwargs):
+        """Client with the context's cookies and its browser's user agent"""
+        user_agent = kwargs.pop('user_agent', None)
+        if user_agent is None and context.pages:
+            try:
+                user_agent = await context.pages[0].evaluate('navigator.userAgent')
+            except Exception as e:
+                print(f"⚠️ Could not read the browser user agent: {e}")
+        return cls(await context.cookies(), user_agent=user_agent, **kwargs)
+
+    def set_cookies(self, cookies):
+        """Load Playwright cookie dicts (context.cookies()) into the client's jar"""
+        for cookie in cookies:
+            self.client.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''),
+                                    path=cookie.get('path', '/'))
+
+    async def refresh_cookies(self, context):
+        """Pick up cookies the browser has renewed since the client was made"""
+        self.set_cookies(await context.cookies())
+
+    async def get(self, url, **kwargs):
+        """GET `url` with the session; raises SessionRejected when it lands on a login page"""
+        started = time.perf_counter()
+        async with self._host_slots[urlsplit(url).netloc]:
+            try:
+                response = await self.client.get(url, **kwargs)
+                response.raise_for_status()
+            except Exception:
+                self.failures += 1
+                raise
+        self.requests += 1
+        self.bytes += len(response.content)
+        self.total_ms += (time.perf_counter() - started) * 1000
+        final_url = str(response.url).lower()
+        if final_url != url.lower() and any(hint in final_url for hint in LOGIN_HINTS):
+            self.failures += 1
+            raise SessionRejected(f"{url} redirected to {response.url}")
+        return response
+
+    async def get_html(self, url, **kwargs):
+        return (await self.get(url, **kwargs)).text
+
+    async def get_json(self, url, **kwargs):
+        response = await self.get(url, headers={'Accept': 'application/json'}, **kwargs)
+        return response.json()
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'bytes': self.bytes,
+            'avg_ms': round(self.total_ms / self.requests, 1) if self.requests else None,
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def _fetch(client, url, parse, what):
+    """parse(html of url), or None when there is no client or the fetch fails"""
+    if client is None:
+        return None
+    try:
+        started = time.perf_counter()
+        result = parse(await client.get_html(url))
+        print(f"🌐 {what} over HTTP in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return result
+    except SessionRejected as e:
+        print(f"⚠️ Session rejected for {what}: {e}")
+    except Exception as e:
+        print(f"⚠️ HTTP fetch of {what} failed: {e}")
+    return None
+
+
+async def fetch_watchlist(client, page=None, url=COPART_WATCHLIST_URL):
+    """Lot numbers on the Copart watch list; loads the page in the browser when HTTP fails or finds none"""
+    lots = await _fetch(client, url, parse_watchlist, 'watch list')
+    # An empty list may just be a table the page renders client-side: let the browser confirm it
+    if lots or page is None:
+        return lots
+    await goto_ready(page, url, COPART_WATCHLIST)
+    lots = []
+    links = page.locator('.search_result_lot_number a')
+    for i in range(await links.count()):
+        text = (await links.nth(i).text_content() or '').strip()
+        if text.isdigit():
+            lots.append(text)
+    return lots
+
+
+async def fetch_lot_details(client, lot_number, page=None, url=None):
+    """LotDetails of a Copart lot from its page HTML; opens the lot in the browser when HTTP fails"""
+    url = url or COPART_LOT_URL.format(lot_number=lot_number)
+    lot = await _fetch(client, url, parse_lot_html, f'lot {lot_number}')
+    if lot is not None or page is None:
+        return lot
+    await goto_ready(page, url, COPART_LOT)
+    return await read_lot_details(page)
+
+
+async def fetch_my_vehicles(client, page=None, url=IAAI_MY_VEHICLES_URL):
+    """IAAI My Vehicles rows; parses the browser's copy of the page when HTTP fails or finds none"""
+    rows = await _fetch(client, url, parse_my_vehicles, 'My Vehicles')
+    if rows or page is None:
+        return rows
+    await page.goto(url, wait_until='domcontentloaded')
+    return parse_my_vehicles(await page.content())
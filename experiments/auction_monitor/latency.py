@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Bid-change latency instrumentation
+Each bid change is timestamped at every stage (in-frame mutation or WebSocket frame, Python receipt,
+Socket.IO emit, dashboard render ack) and the stage-to-stage delays go into per-stage histograms.
+"""
+
+import threading
+from collections import deque
+
+# Cumulative histogram bucket upper bounds in milliseconds (Prometheus-style, +Inf implied)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Stage name -> (start timestamp key, end timestamp key); all timestamps are epoch milliseconds
+STAGES = {
+    'source_to_receipt': ('sourceEpochMs', 'receivedEpochMs'),
+    'receipt_to_emit': ('receivedEpochMs', 'emitEpochMs'),
+    'emit_to_render_ack': ('emitEpochMs', 'ackEpochMs'),
+    'source_to_render_ack': ('sourceEpochMs', 'ackEpochMs'),
+}
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram plus a window of recent samples for exact percentiles"""
+
+    def __init__(self, buckets=BUCKETS_MS, window=2048):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value_ms):
+        value_ms = max(0.0, value_ms)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                index = i
+                break
+        self.bucket_counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        self.recent.append(value_ms)
+
+    def percentile(self, q):
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def cumulative_buckets(self):
+        """[(upper bound, cumulative count)] including ('+Inf', count)"""
+        running, result = 0, []
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.bucket_counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def summary(self):
+        summary = {'count': self.count}
+        if self.count:
+            summary.update({
+                'mean_ms': round(self.total / self.count, 2),
+                'p50_ms': round(self.percentile(0.50), 2),
+                'p95_ms': round(self.percentile(0.95), 2),
+                'p99_ms': round(self.percentile(0.99), 2),
+                'max_recent_ms': round(max(self.recent), 2)
+            })
+        return summary
+
+
+class LatencyTracker:
+    """Per-monitor histograms for every bid-change stage; acks arrive on Socket.IO threads"""
+
+    def __init__(self, acked_window=1024):
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self._acked = deque(maxlen=acked_window)  # recent bid-change ids that already have a render ack
+        self._lock = threading.Lock()
+
+    def first_ack(self, change_id):
+        """True for the first render ack of a bid change; every open dashboard tab acks the same id"""
+        if change_id is None:
+            return False
+        with self._lock:
+            if change_id in self._acked:
+                return False
+            self._acked.append(change_id)
+            return True
+
+    def observe(self, timestamps, stages=None):
+        """Record every stage whose start and end timestamps are both present"""
+        with self._lock:
+            for stage in stages or STAGES:
+                start_key, end_key = STAGES[stage]
+                start, end = timestamps.get(start_key), timestamps.get(end_key)
+                if start is None or end is None:
+                    continue
+                try:
+                    self.histograms[stage].observe(float(end) - float(start))
+                except (TypeError, ValueError):
+                    continue
+
+    def summary(self):
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Copart lot details from the embedded lot JSON
+Lot pages ship the full Solr lot record as `appInit.cachedSolrLotDetailsStr`, so one evaluate()
+returns every field (year, make, VIN, damage, sale date, current bid...) instead of probing
+`.lot-title`, `.current-bid` and friends one locator at a time. When the JSON is missing the DOM
+selectors are still resolved, in a single batched extraction-plan call.
+parse_lot_html() reads the same record from page HTML without a browser.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+from extraction_plan import EXTRACTION_PLAN_JS
+from ws_feed import parse_amount, format_amount
+
+LOT_JSON_JS = """
+() => {
+    const raw = window.appInit && window.appInit.cachedSolrLotDetailsStr;
+    if (!raw) return null;
+    try { return JSON.parse(raw); } catch (e) { return null; }
+}
+"""
+
+# DOM fallback, resolved in one call by the extraction plan (first visible, non-empty match wins)
+LOT_DOM_PLAN = {'fields': {
+    'title': [{'css': css} for css in ['.lot-title', '.vehicle-title', 'h1']],
+    'lot_number': [{'css': css, 'regex': r'(\d+)'} for css in ['.lot-number', '.lot-num', '#LotNumber']],
+    'vin': [{'css': 'span[data-uname="lotdetailVinvalue"]'}],
+    'current_bid': [{'css': css} for css in [
+        '.current-bid-amount', '.current-bid', '.bid-amount', '.currentBid', '[data-uname*="currentBid"]',
+        '.bid-price', '.lot-current-bid'
+    ]],
+}}
+
+_LOT_JSON_LITERAL = re.compile(r'cachedSolrLotDetailsStr\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+@dataclass
+class LotDetails:
+    """One Copart lot; `source` is 'json' (embedded lot record) or 'dom' (selector fallback)"""
+    lot_number: Optional[str] = None
+    title: Optional[str] = None
+    year: Optional[int] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    vin: Optional[str] = None
+    odometer: Optional[float] = None
+    odometer_status: Optional[str] = None
+    primary_damage: Optional[str] = None
+    secondary_damage: Optional[str] = None
+    condition: Optional[str] = None
+    title_type: Optional[str] = None
+    title_state: Optional[str] = None
+    color: Optional[str] = None
+    fuel: Optional[str] = None
+    has_keys: Optional[bool] = None
+    vehicle_type: Optional[str] = None
+    location: Optional[str] = None
+    seller: Optional[str] = None
+    highlights: Optional[List[str]] = None
+    currency: Optional[str] = None
+    current_bid: Optional[float] = None
+    buy_now_price: Optional[float] = None
+    estimated_value: Optional[float] = None
+    repair_cost: Optional[float] = None
+    sale_date: Optional[datetime] = None
+    sale_status: Optional[str] = None
+    bid_status: Optional[str] = None
+    reserve_met: Optional[bool] = None
+    sold: Optional[bool] = None
+    thumbnail_url: Optional[str] = None
+    source: str = 'json'
+    raw: Any = None
+
+    def summary(self):
+        """Printable dict without the raw record (amounts formatted, missing values as 'N/A')"""
+        details = {key: value for key, value in asdict(self).items() if key != 'raw'}
+        for key in ('current_bid', 'buy_now_price', 'estimated_value', 'repair_cost'):
+            details[key] = format_amount(details[key])
+        if self.sale_date:
+            details['sale_date'] = self.sale_date.isoformat()
+        return {key: 'N/A' if value is None else value for key, value in details.items()}
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def lot_from_solr(record):
+    """LotDetails from the decoded cachedSolrLotDetailsStr record"""
+    dynamic = record.get('dynamicLotDetails') or {}
+    current_bid = parse_amount(dynamic.get('currentBid'))
+    if current_bid is None:
+        current_bid = parse_amount(record.get('hb'))
+    sale_date = None
+    if record.get('ad'):
+        sale_date = datetime.fromtimestamp(record['ad'] / 1000, tz=timezone.utc)
+    keys = _text(record.get('hk'))
+    return LotDetails(
+        lot_number=_text(record.get('lotNumberStr') or record.get('ln')),
+        title=_text(record.get('ld')),
+        year=record.get('lcy'),
+        make=_text(record.get('mkn')),
+        model=_text(record.get('lm') or record.get('mmod')),
+        vin=_text(record.get('fv')),
+        odometer=parse_amount(record.get('orr')),
+        odometer_status=_text(record.get('ord')),
+        primary_damage=_text(record.get('dd')),
+        secondary_damage=_text(record.get('sdd')),
+        condition=_text(record.get('lcd')),
+        title_type=_text(record.get('td')),
+        title_state=_text(record.get('ts')),
+        color=_text(record.get('clr')),
+        fuel=_text(record.get('ft')),
+        has_keys=None if keys is None else keys.upper() == 'YES',
+        vehicle_type=_text(record.get('vehTypDesc')),
+        location=_text(record.get('yn')),
+        seller=_text(record.get('scn')),
+        highlights=record.get('lfd'),
+        currency=_text(record.get('cuc')),
+        current_bid=current_bid,
+        buy_now_price=parse_amount(record.get('bnp')) or None,
+        estimated_value=parse_amount(record.get('la')),
+        repair_cost=parse_amount(record.get('rc')),
+        sale_date=sale_date,
+        sale_status=_text(dynamic.get('saleStatus') or record.get('ess')),
+        bid_status=_text(dynamic.get('bidStatus')),
+        reserve_met=dynamic.get('sellerReserveMet'),
+        sold=dynamic.get('lotSold', record.get('lotSold')),
+        thumbnail_url=_text(record.get('tims')),
+        source='json',
+        raw=record,
+    )
+
+
+def lot_from_dom(fields):
+    """LotDetails from an extraction-plan result over LOT_DOM_PLAN"""
+    return LotDetails(
+        lot_number=fields.get('lot_number'),
+        title=_text(fields.get('title')),
+        vin=_text(fields.get('vin')),
+        current_bid=parse_amount(fields.get('current_bid')),
+        source='dom',
+        raw=fields,
+    )
+
+
+def parse_lot_html(page_html):
+    """LotDetails from lot page HTML without a browser; None when the page embeds no lot record"""
+    match = _LOT_JSON_LITERAL.search(page_html, max(page_html.find('cachedSolrLotDetailsStr'), 0))
+    if not match:
+        return None
+    try:
+        # The value is a JS string literal holding JSON: unescape it as a JSON string, then decode it
+        return lot_from_solr(json.loads(json.loads(f'"{match.group(1)}"')))
+    except (ValueError, TypeError, AttributeError) as e:
+        print(f"⚠️ Embedded lot record could not be decoded: {e}")
+        return None
+
+
+async def read_lot_details(page):
+    """Lot details of the open lot page in one evaluate(); the DOM selectors (also one call) when the JSON is absent"""
+    started = time.perf_counter()
+    record = await page.evaluate(LOT_JSON_JS)
+    if record:
+        lot = lot_from_solr(record)
+    else:
+        result = await page.evaluate(EXTRACTION_PLAN_JS, LOT_DOM_PLAN)
+        fields = (result or {}).get('fields', {})
+        if not fields:
+            print("⚠️ No embedded lot record and no lot details in the DOM")
+            return None
+        lot = lot_from_dom(fields)
+    print(f"📄 Lot {lot.lot_number or '?'} details from {lot.source} in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return lot
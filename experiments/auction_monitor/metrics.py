@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Prometheus text-format metrics for the monitor web app
+Nothing is updated on the hot path: monitors keep plain integer counters and histograms,
+and collectors read them (plus process RSS) only when /metrics is scraped.
+"""
+
+import time
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError as e:
+    PSUTIL_AVAILABLE = False
+    print(f"psutil not available, browser RSS metrics disabled: {e}")
+    print("Install with: pip install psutil")
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricFamily:
+    """One metric name with its type, help text and labelled samples"""
+
+    def __init__(self, name, kind, help_text):
+        self.name = name
+        self.kind = kind  # 'counter', 'gauge' or 'histogram'
+        self.help_text = help_text
+        self.samples = []  # (name suffix, labels dict, value)
+
+    def add(self, value, suffix='', **labels):
+        self.samples.append((suffix, labels, value))
+        return self
+
+    def add_histogram(self, histogram, **labels):
+        """Add a latency.LatencyHistogram as _bucket/_sum/_count samples"""
+        for bound, count in histogram.cumulative_buckets():
+            self.add(count, '_bucket', le=str(bound), **labels)
+        self.add(round(histogram.total, 3), '_sum', **labels)
+        self.add(histogram.count, '_count', **labels)
+        return self
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + '}'
+
+
+class MetricsRegistry:
+    """Collectors are callables returning MetricFamily lists; they run only at scrape time"""
+
+    def __init__(self):
+        self._collectors = []
+
+    def register(self, collector):
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        lines = []
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                lines.append(f'# collector {getattr(collector, "__name__", collector)} failed: {e}')
+                continue
+            for family in families:
+                lines.append(f'# HELP {family.name} {family.help_text}')
+                lines.append(f'# TYPE {family.name} {family.kind}')
+                for suffix, labels, value in family.samples:
+                    lines.append(f'{family.name}{suffix}{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def process_tree_rss():
+    """RSS in bytes of this process and of its children (Playwright driver + Chromium), or None"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    me = psutil.Process()
+    own = me.memory_info().rss
+    children = 0
+    for child in me.children(recursive=True):
+        try:
+            children += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return own, children
+
+
+def manager_collector(manager):
+    """Collector for every monitor run by a MonitorManager"""
+    previous = {'time': None, 'ws_frames': 0, 'bid_changes': 0}
+
+    def collect():
+        monitors = list(manager.monitors.items())
+        active = MetricFamily('auction_monitor_active_monitors', 'gauge', 'Monitors currently watching an auction')
+        active.add(sum(1 for _, monitor in monitors if monitor.is_monitoring))
+
+        bid_changes = MetricFamily('auction_monitor_bid_changes_total', 'counter', 'Bid changes applied (after dedup)')
+        ws_frames = MetricFamily('auction_monitor_ws_frames_total', 'counter', 'g2auction WebSocket frames received')
+        failures = MetricFamily('auction_monitor_health_check_failures_total', 'counter', 'Failed periodic health checks')
+        extraction_errors = MetricFamily('auction_monitor_extraction_errors_total', 'counter', 'Extraction calls that raised')
+        reattach = MetricFamily('auction_monitor_frame_reattach_total', 'counter', 'Auction iframe re-attach attempts')
+        extraction = MetricFamily('auction_monitor_extraction_duration_ms', 'histogram', 'Auction data extraction duration')
+        store_queue = MetricFamily('auction_monitor_event_store_queue_depth', 'gauge', 'Events waiting for the history writer')
+        store_dropped = MetricFamily('auction_monitor_event_store_dropped_total', 'counter', 'History events dropped')
+        latency = MetricFamily('auction_monitor_bid_change_latency_ms', 'histogram', 'Bid-change latency per stage')
+
+        total_frames = total_changes = 0
+        for key, monitor in monitors:
+            frames = monitor.ws_tap.frames_received if monitor.ws_tap else 0
+            total_frames += frames
+            total_changes += monitor.bid_changes_applied
+            bid_changes.add(monitor.bid_changes_applied, auction=key)
+            ws_frames.add(frames, auction=key)
+            failures.add(monitor.health_check_failures, auction=key)
+            extraction_errors.add(monitor.extraction_errors, auction=key)
+            reattach.add(monitor.frame_reattach_count, auction=key)
+            extraction.add_histogram(monitor.extraction_histogram, auction=key)
+            for stage, histogram in monitor.latency.histograms.items():
+                latency.add_histogram(histogram, auction=key, stage=stage)
+            if monitor.event_store:
+                store_stats = monitor.event_store.stats()
+                store_queue.add(store_stats['queued'], auction=key)
+                store_dropped.add(store_stats['dropped'], auction=key)
+
+        # Rates since the previous scrape, so dashboards without rate() still get events/second
+        now = time.monotonic()
+        rates = MetricFamily('auction_monitor_events_per_second', 'gauge', 'Events per second since the previous scrape')
+        if previous['time'] is not None and now > previous['time']:
+            elapsed = now - previous['time']
+            rates.add(round(max(0, total_frames - previous['ws_frames']) / elapsed, 3), source='ws_frames')
+            rates.add(round(max(0, total_changes - previous['bid_changes']) / elapsed, 3), source='bid_changes')
+        previous.update({'time': now, 'ws_frames': total_frames, 'bid_changes': total_changes})
+
+        families = [active, bid_changes, ws_frames, rates, failures, extraction_errors, reattach, extraction,
+                    latency, store_queue, store_dropped]
+
+        if manager.route_policy:
+            requests = MetricFamily('auction_monitor_routed_requests_total', 'counter',
+                                    'Requests seen by the resource policy')
+            for action, counts in (('allowed', manager.route_policy.allowed), ('blocked', manager.route_policy.blocked)):
+                for resource_type, count in sorted(counts.items()):
+                    requests.add(count, action=action, type=resource_type)
+            families.append(requests)
+
+        rss = process_tree_rss()
+        if rss is not None:
+            memory = MetricFamily('auction_monitor_process_rss_bytes', 'gauge', 'Resident memory at scrape time')
+            memory.add(rss[0], process='app')
+            memory.add(rss[1], process='browser')
+            families.append(memory)
+        return families
+
+    return collect
+
+
+def outbox_collector(outbox):
+    """Collector for the per-client emit outbox (queue depth and coalescing counters)"""
+
+    def collect():
+        depths = outbox.queue_depths()
+        clients = MetricFamily('auction_monitor_emit_clients', 'gauge', 'Connected dashboard clients')
+        clients.add(len(depths))
+        depth = MetricFamily('auction_monitor_emit_queue_depth', 'gauge', 'Events waiting in client outboxes')
+        depth.add(sum(depths.values()), stat='total')
+        depth.add(max(depths.values()) if depths else 0, stat='max_client')
+        events = MetricFamily('auction_monitor_emit_events_total', 'counter', 'Outbox events by outcome')
+        for outcome in ('queued', 'coalesced', 'dropped', 'sent'):
+            events.add(outbox.stats[outcome], outcome=outcome)
+        return [clients, depth, events]
+
+    return collect
+
+
+def context_pool_collector(pool):
+    """Collector for the warm context pool (leases, wait time, logins, expired sessions)"""
+
+    def collect():
+        status = pool.status()
+        contexts = MetricFamily('auction_monitor_context_pool_contexts', 'gauge', 'Logged-in contexts in the pool')
+        contexts.add(status['contexts'], state='total')
+        contexts.add(status['idle'], state='idle')
+        leases = MetricFamily('auction_monitor_context_pool_leases_total', 'counter', 'Contexts leased from the pool')
+        leases.add(status['leases'])
+        wait = MetricFamily('auction_monitor_context_pool_lease_wait_ms_total', 'counter', 'Time spent waiting for a lease')
+        wait.add(round(status['lease_wait_ms'], 3))
+        sessions = MetricFamily('auction_monitor_context_pool_sessions_total', 'counter', 'Pool session events')
+        for outcome in ('logins', 'login_failures', 'liveness_checks', 'expired'):
+            sessions.add(status[outcome], outcome=outcome)
+        return [contexts, leases, wait, sessions]
+
+    return collect
+
+
+def selector_cache_collector(cache):
+    """Collector for the adaptive selector cache (lookups answered by the cached winner vs fallbacks)"""
+
+    def collect():
+        lookups = MetricFamily('auction_monitor_selector_lookups_total', 'counter', 'Fallback-list lookups by outcome')
+        for page_type, groups in cache.stats().items():
+            for group, entry in groups.items():
+                for outcome in ('first_try', 'fallbacks', 'not_found'):
+                    lookups.add(entry[outcome], page_type=page_type, group=group, outcome=outcome)
+        return [lookups]
+
+    return collect
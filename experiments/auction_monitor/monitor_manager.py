@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Monitor Manager - Runs many auction monitors on one event loop
+All monitors share one Chromium browser and one logged-in context, each with its own page
+"""
+
+import asyncio
+import threading
+import logging
+from playwright.async_api import async_playwright
+from monitor_simple import AuctionMonitor
+from resource_policy import ResourcePolicy
+
+
+def auction_id_from_url(auction_url):
+    """Extract the auction id (e.g. '833-A') from an auction dashboard URL or return the input"""
+    if 'auctionDetails=' in auction_url:
+        return auction_url.split('auctionDetails=')[1].split('&')[0]
+    return auction_url
+
+
+def auction_url_from_id(auction_id):
+    """Build the auction dashboard path for an auction id"""
+    if auction_id.startswith('http') or auction_id.startswith('/'):
+        return auction_id
+    return f"/auctionDashboard?auctionDetails={auction_id}"
+
+
+class MonitorManager:
+    """Owns the shared browser and runs one AuctionMonitor task per auction"""
+
+    def __init__(self, socketio_instance=None, headless=False):
+        self.socketio = socketio_instance
+        self.headless = headless
+        self.monitors = {}  # auction key -> AuctionMonitor
+        self.tasks = {}     # auction key -> asyncio.Task
+        self.loop = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.logged_in = False
+        self.route_policy = None  # ResourcePolicy applied to the shared context (AUCTION_RESOURCE_POLICY)
+        self._thread = None
+        self._browser_lock = None
+        self._pending = set()  # auction keys waiting for the shared browser
+
+    def start_in_thread(self):
+        """Start the manager event loop in a background thread (used by the Flask app)"""
+        if self._thread and self._thread.is_alive():
+            return self.loop
+
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run_loop():
+            asyncio.set_event_loop(self.loop)
+            self.loop.call_soon(ready.set)
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(target=run_loop, name='monitor-manager', daemon=True)
+        self._thread.start()
+        ready.wait()
+        print("✅ Monitor manager event loop started")
+        return self.loop
+
+    def use_running_loop(self):
+        """Run monitors on the caller's event loop (async server mode) instead of a background thread"""
+        self.loop = asyncio.get_event_loop()
+        return self.loop
+
+    def run_coroutine(self, coro, timeout=None):
+        """Run a coroutine on the manager loop from another thread and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout=timeout)
+
+    async def _ensure_browser(self, login=True):
+        """Launch the shared browser and log in once, on first use"""
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+
+        async with self._browser_lock:
+            launched = False
+            if not (self.browser and self.browser.is_connected()):
+                # A browser that disconnected (or a launch that failed half-way) leaves a playwright driver behind
+                await self._close_browser()
+                print("🚀 Launching shared browser for all monitors...")
+                try:
+                    self.playwright = await async_playwright().start()
+                    self.browser = await self.playwright.chromium.launch(headless=self.headless)
+                    self.context = await self.browser.new_context()
+                    self.route_policy = ResourcePolicy.from_env()
+                    if self.route_policy:
+                        await self.route_policy.apply(self.context)
+                except Exception as e:
+                    print(f"❌ Shared browser launch failed: {e}")
+                    await self._close_browser()
+                    raise
+                launched = True
+
+            if login and not self.logged_in:
+                # Log in once through a throwaway page; cookies are shared by every page in the context
+                login_monitor = AuctionMonitor(self.socketio, context=self.context)
+                try:
+                    login_monitor._load_env()
+                    await login_monitor._attach_to_context(self.context)
+                    await login_monitor._login_to_copart()
+                    self.logged_in = True
+                except Exception as e:
+                    # Never keep a browser we just launched unauthenticated: the next add_auction starts over
+                    print(f"❌ Shared browser login failed: {e}")
+                    if login_monitor.page and not login_monitor.page.is_closed():
+                        await login_monitor.page.close()
+                    if launched:
+                        await self._close_browser()
+                    raise
+                finally:
+                    if login_monitor.page and not login_monitor.page.is_closed():
+                        await login_monitor.page.close()
+            if launched:
+                print("✅ Shared browser ready")
+
+    async def _close_browser(self):
+        """Close the shared context, browser and playwright driver, ignoring ones that are already gone"""
+        self.logged_in = False
+        for name, close in (('context', 'close'), ('browser', 'close'), ('playwright', 'stop')):
+            resource = getattr(self, name)
+            setattr(self, name, None)
+            if resource is None:
+                continue
+            try:
+                await getattr(resource, close)()
+            except Exception as e:
+                print(f"⚠️ Error closing shared {name}: {e}")
+
+    async def add_auction(self, auction_url, key=None, login=True):
+        """Start monitoring an auction on its own page; returns the auction key"""
+        key = key or auction_id_from_url(auction_url)
+        if key in self.tasks or key in self._pending:
+            raise ValueError(f"Already monitoring auction {key}")
+
+        self._pending.add(key)
+        try:
+            await self._ensure_browser(login=login)
+        finally:
+            self._pending.discard(key)
+
+        monitor = AuctionMonitor(self.socketio, context=self.context)
+        self.monitors[key] = monitor
+        task = asyncio.ensure_future(monitor.start_monitoring(auction_url_from_id(auction_url)))
+        task.add_done_callback(lambda t, key=key: self._on_monitor_done(key, t))
+        self.tasks[key] = task
+        print(f"✅ Monitoring task started for {key} ({len(self.tasks)} active)")
+        logging.info(f'Monitor started for {key}')
+        return key
+
+    def _on_monitor_done(self, key, task):
+        """Forget a monitor once its task has finished"""
+        if self.tasks.get(key) is task:
+            self.tasks.pop(key, None)
+            self.monitors.pop(key, None)
+        if not task.cancelled() and task.exception():
+            print(f"❌ Monitor {key} failed: {task.exception()}")
+        print(f"🔚 Monitor {key} finished ({len(self.tasks)} active)")
+
+    async def remove_auction(self, key):
+        """Stop monitoring one auction and close its page"""
+        monitor = self.monitors.get(key)
+        task = self.tasks.get(key)
+        if not monitor:
+            return False
+
+        monitor.stop_monitoring()
+        if task:
+            try:
+                await asyncio.wait_for(task, timeout=5)
+            except asyncio.TimeoutError:
+                task.cancel()
+            except Exception:
+                pass
+        return True
+
+    async def stop_all(self):
+        """Stop every monitor and close the shared browser"""
+        for key in list(self.monitors):
+            await self.remove_auction(key)
+
+        await self._close_browser()
+
+    def get_monitor(self, key=None):
+        """Return the monitor for an auction key, or the first active one when no key is given"""
+        if key:
+            return self.monitors.get(key)
+        for monitor in self.monitors.values():
+            if monitor.is_monitoring:
+                return monitor
+        return None
+
+    def status(self):
+        """Status of every monitored auction keyed by auction key"""
+        return {
+            key: {
+                'is_monitoring': monitor.is_monitoring,
+                'current_auction': monitor.current_auction_data,
+                'last_update': monitor.last_update,
+                'bid_channel': monitor.get_bid_channel_stats(),
+                'event_store': monitor.event_store.stats() if monitor.event_store else None
+            }
+            for key, monitor in list(self.monitors.items())
+        }
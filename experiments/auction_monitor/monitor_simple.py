@@ -5,13 +5,30 @@ Without WebSocket dependency
 """
 
 import asyncio
+import concurrent.futures
 import time
 import os
 import json
 import random
 import logging
+from collections import deque
 from datetime import datetime
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+from extraction_plan import EXTRACTION_PLAN_JS, FRAME_PLAN, PAGE_PLAN, apply_plan_result
+from ring_buffer import TimedRingBuffer
+from event_store import BidEventStore, auction_partition
+from latency import LatencyHistogram, LatencyTracker
+from auction_state import VersionedAuctionState
+from session_recording import SessionRecorder, recording_path
+from session_store import SessionStore
+from resource_policy import ResourcePolicy
+from navigation import goto_ready, COPART_LOGIN, COPART_AUCTION
+from selector_cache import SelectorCache, visible_text
+from selector_race import race
+from ws_feed import WebSocketTap, BidEvent, BidderEvent, LotChangeEvent, SoldEvent, format_amount, parse_amount
+
+# Winning fallback selectors per page type, shared by every monitor in the process
+selector_cache = SelectorCache()
 
 class RequestThrottler:
     """Throttle requests to avoid rate limiting"""
@@ -36,33 +53,82 @@ class RequestThrottler:
 class AuctionMonitor:
     """Monitors Copart auction pages and extracts real-time data"""
 
-    def __init__(self, socketio_instance=None):
+    def __init__(self, socketio_instance=None, context=None, event_store=None, recorder=None):
         self.is_monitoring = False
         self.current_auction_data = None
         self.last_update = None
         self.browser = None
+        self.context = context  # Shared, already logged-in context (set by MonitorManager)
+        self._owns_browser = context is None
         self.page = None
         self.auction_frame = None
         self.throttler = RequestThrottler()
         self.socketio = socketio_instance
         self._frame_navigation_handler = None  # Store navigation handler reference
-        self._manual_bid_highlight_requested = False  # Flag for manual highlight requests
-        self._manual_plus_highlight_requested = False  # Flag for manual plus highlight requests
+        self.loop = None
+        self._command_queue = None  # asyncio.Queue of (name, args, Future); lives on the monitor loop
+        self._command_getter = None
+        self._command_handlers = {
+            'highlight_bid': self._highlight_bid_button_manual_impl,
+            'highlight_plus': self._highlight_plus_button_manual_impl,
+            'ping': self._ping
+        }
+        self.last_extraction_ms = None  # Duration of the most recent _extract_auction_data call
+        self._bid_channel_ready = False  # __auctionBidChannel binding exposed on self.page
+        self._console_listener_installed = False
+        self._last_bid_seq = None
+        self.bid_channel_received = 0
+        self.bid_channel_missed = 0
+        self.bid_channel_delays_ms = deque(maxlen=1000)  # Mutation -> Python callback delays
+        self.websocket_messages = TimedRingBuffer(capacity=5000)  # Raw g2auction frames, newest 5000 only
+        self.ws_tap = None
+        self.ws_feed_state = {}  # Latest lot/bid/bidder/status decoded from WebSocket frames; 'verified' once it matched the DOM
+        self._last_applied_bid = None  # (amount, bidder) of the last bid change applied
+        self.event_store = event_store  # Durable bid history; opened per auction in start_monitoring
+        self.recorder = recorder  # SessionRecorder for offline replay; opt-in via AUCTION_MONITOR_RECORD_DIR
+        self.route_policy = None  # ResourcePolicy on a browser this monitor launched itself
+        self.session_store = SessionStore()  # copart_session.json shared with copart_bid.py and the bid button finder
+        self.snapshot_interval = float(os.environ.get('AUCTION_MONITOR_SNAPSHOT_INTERVAL', '10'))
+        self._last_snapshot = 0
+        self.auction_id = None
+        self.state = VersionedAuctionState()  # Published copy of current_auction_data, emitted as versioned deltas
+        self.latency = LatencyTracker()  # Per-stage bid-change latency histograms (see latency.STAGES)
+        self._bid_change_id = 0
+        # Plain counters read by the /metrics endpoint at scrape time
+        self.bid_changes_applied = 0
+        self.health_check_failures = 0
+        self.extraction_errors = 0
+        self.frame_reattach_count = 0
+        self.extraction_histogram = LatencyHistogram()
         logging.basicConfig(filename='auction_monitor.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
     async def start_monitoring(self, auction_url):
         """Start monitoring an auction"""
         self.is_monitoring = True
+        self.auction_id = auction_partition(auction_url)
+        self.state.auction_id = self.auction_id
+        if self.event_store is None:
+            self.event_store = BidEventStore(auction_url)
+        if self.recorder is None and os.environ.get('AUCTION_MONITOR_RECORD_DIR'):
+            self.recorder = SessionRecorder(recording_path(auction_url, os.environ['AUCTION_MONITOR_RECORD_DIR']),
+                                            auction_url=auction_url)
 
         try:
-            # Load environment variables
-            self._load_env()
+            if self._owns_browser:
+                # Load environment variables
+                self._load_env()
+
+                # Initialize browser
+                await self._init_browser()
 
-            # Initialize browser
-            await self._init_browser()
+                # Login to Copart
+                await self._login_to_copart()
+            else:
+                # Shared context is already logged in - just open our own page
+                await self._attach_to_context(self.context)
 
-            # Login to Copart
-            await self._login_to_copart()
+            # Tap the auction WebSocket before navigating so the iframe's socket is captured
+            self._setup_websocket_tap()
 
             # Navigate to auction
             await self._navigate_to_auction(auction_url)
@@ -79,8 +145,16 @@ class AuctionMonitor:
             print(f'Monitoring failed: {str(e)}')
             self.is_monitoring = False
         finally:
-            if self.browser:
-                await self.browser.close()
+            if self._owns_browser:
+                if self.browser:
+                    await self.browser.close()
+            elif self.page and not self.page.is_closed():
+                await self.page.close()
+            if self.event_store:
+                # Flush the write-behind queue off the event loop
+                await asyncio.get_event_loop().run_in_executor(None, self.event_store.close)
+            if self.recorder:
+                self.recorder.close()
 
     def stop_monitoring(self):
         """Stop monitoring and clean up listeners"""
@@ -140,29 +214,33 @@ class AuctionMonitor:
         self.is_monitoring = False
         print("Auction monitoring stopped")
 
-    async def find_bid_button(self, auction_url):
+    async def find_bid_button(self, auction_url, leased=None):
         """Complete bid button finder functionality - replicates auction_bid_button_finder.py"""
         try:
             print(f"🔍 Starting bid button finder for auction: {auction_url}")
 
-            # Load environment variables
-            self._load_env()
+            if leased:
+                # Warm, logged-in page from the ContextPool: no browser launch or login
+                self.context = leased.context
+                self.browser = leased.context.browser
+                self.page = leased.page
+            else:
+                # Load environment variables
+                self._load_env()
 
-            # Initialize browser if not already done
-            if not self.browser:
-                await self._init_browser()
+                # Initialize browser if not already done
+                if not self.browser:
+                    await self._init_browser()
 
-            # Login to Copart if not already logged in
-            await self._login_to_copart()
+                # Login to Copart if not already logged in
+                await self._login_to_copart()
 
             # Navigate to auction
             if not auction_url.startswith('http'):
                 auction_url = f"https://www.copart.com{auction_url}"
 
             print('Going to auction URL...')
-            await self.page.goto(auction_url, timeout=60000)
-            print('Waiting for page load...')
-            await self.page.wait_for_load_state('load', timeout=30000)
+            await goto_ready(self.page, auction_url, COPART_AUCTION)
 
             print(f'Page title after navigation: {await self.page.title()}')
             print(f'Current URL: {self.page.url}')
@@ -221,35 +299,28 @@ class AuctionMonitor:
             print(f"📊 Sub-iframes in auction iframe: {len(sub_iframes)}")
 
             button_frame = target_frame  # Default to target_frame
-            bid_button_found = False
 
+            candidate_frames = []
             for i, sub_iframe_locator in enumerate(sub_iframes):
                 try:
                     sub_frame = await sub_iframe_locator.content_frame()
                     if sub_frame:
                         print(f"  Sub-iframe {i}: {sub_frame.url}")
-                        # Try to find button in sub_frame
-                        bid_button = sub_frame.locator('button[data-uname="bidCurrentLot"]')
-                        try:
-                            await bid_button.wait_for(timeout=5000)
-                            print("✅ Found bid button in sub-iframe")
-                            button_frame = sub_frame
-                            bid_button_found = True
-                            break
-                        except PlaywrightTimeoutError:
-                            print("❌ Bid button not in sub-iframe")
+                        candidate_frames.append((f"sub-iframe {i}", sub_frame))
                 except Exception as e:
                     print(f"Error accessing sub-iframe {i}: {e}")
-
-            if not bid_button_found:
-                print("Checking for bid button in main auction iframe...")
-                bid_button = target_frame.locator('button[data-uname="bidCurrentLot"]')
-                try:
-                    await bid_button.wait_for(timeout=30000)
-                    print("✅ Bid button found in main auction iframe")
-                except PlaywrightTimeoutError:
-                    print("❌ Bid button not found in main auction iframe either")
-                    return False
+            candidate_frames.append(("main auction iframe", target_frame))
+
+            # Wait for the bid button in every frame at once instead of 5s per sub-iframe before the main frame
+            print("Waiting for bid button in all auction frames...")
+            frame_name, _ = await race(((name, frame.locator('button[data-uname="bidCurrentLot"]').first)
+                                        for name, frame in candidate_frames), timeout=30000)
+            if not frame_name:
+                print("❌ Bid button not found in any auction frame")
+                return False
+            button_frame = dict(candidate_frames)[frame_name]
+            bid_button = button_frame.locator('button[data-uname="bidCurrentLot"]')
+            print(f"✅ Bid button found in {frame_name}")
 
             # Check count
             count = await bid_button.count()
@@ -316,10 +387,8 @@ class AuctionMonitor:
 
     async def _highlight_bid_button_manual(self):
         """Manually highlight the bid button with blue color when triggered from UI"""
-        print("🔵 Manual bid button highlight requested - will run in monitoring thread")
-        # Set flag to trigger highlighting in the monitoring loop
-        self._manual_bid_highlight_requested = True
-        return True
+        print("🔵 Manual bid button highlight requested - queued for the monitoring loop")
+        return await self.run_command('highlight_bid')
 
     async def _highlight_bid_button_manual_impl(self):
         """Actual implementation of manual bid button highlighting - runs in monitoring thread"""
@@ -339,43 +408,18 @@ class AuctionMonitor:
             print(f"DEBUG: plus_selectors defined with {len(plus_selectors)} selectors")
 
             # Find the bid button in the current auction frame
-            bid_button = None
-
-            for selector in button_selectors:
-                print(f"🎯 Trying button selector: {selector}")
-                try:
-                    candidate_button = self.auction_frame.locator(selector).first
-                    count = await candidate_button.count()
-                    if count > 0:
-                        is_visible = await candidate_button.is_visible(timeout=1000)
-                        if is_visible:
-                            bid_button = candidate_button
-                            print(f"✅ Found button with selector: {selector}")
-                            break
-                except Exception as e:
-                    print(f"❌ Selector {selector} failed: {e}")
-                    continue
-
+            selector, bid_button = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'bid_button',
+                                                                button_selectors)
             if not bid_button:
                 print("❌ No bid button found with any selector")
                 return False
+            print(f"✅ Found button with selector: {selector}")
 
             # Find the plus button
-            plus_button = None
-            for selector in plus_selectors:
-                print(f"➕ Trying plus button selector: {selector}")
-                try:
-                    candidate_button = self.auction_frame.locator(selector).first
-                    count = await candidate_button.count()
-                    if count > 0:
-                        is_visible = await candidate_button.is_visible(timeout=1000)
-                        if is_visible:
-                            plus_button = candidate_button
-                            print(f"✅ Found plus button with selector: {selector}")
-                            break
-                except Exception as e:
-                    print(f"❌ Plus selector {selector} failed: {e}")
-                    continue
+            selector, plus_button = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'plus_button',
+                                                                 plus_selectors)
+            if plus_button:
+                print(f"✅ Found plus button with selector: {selector}")
 
             print("✅ Bid button found, applying highlight...")
 
@@ -416,10 +460,8 @@ class AuctionMonitor:
 
     async def _highlight_plus_button_manual(self):
         """Manually highlight the plus button with red color when triggered from UI"""
-        print("🔴 Manual plus button highlight requested - will run in monitoring thread")
-        # Set flag to trigger highlighting in the monitoring loop
-        self._manual_plus_highlight_requested = True
-        return True
+        print("🔴 Manual plus button highlight requested - queued for the monitoring loop")
+        return await self.run_command('highlight_plus')
 
     async def _highlight_plus_button_manual_impl(self):
         """Actual implementation of manual bid button highlighting - runs in monitoring thread"""
@@ -437,21 +479,10 @@ class AuctionMonitor:
             bid_button = None
 
             # Find the plus button
-            plus_button = None
-            for selector in plus_selectors:
-                print(f"➕ Trying plus button selector: {selector}")
-                try:
-                    candidate_button = self.auction_frame.locator(selector).first
-                    count = await candidate_button.count()
-                    if count > 0:
-                        is_visible = await candidate_button.is_visible(timeout=1000)
-                        if is_visible:
-                            plus_button = candidate_button
-                            print(f"✅ Found plus button with selector: {selector}")
-                            break
-                except Exception as e:
-                    print(f"❌ Plus selector {selector} failed: {e}")
-                    continue
+            selector, plus_button = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'plus_button',
+                                                                 plus_selectors)
+            if plus_button:
+                print(f"✅ Found plus button with selector: {selector}")
 
             print("✅ Plus button found, applying highlight...")
 
@@ -499,8 +530,6 @@ class AuctionMonitor:
 
             # Find the bid button in the current auction frame
             # Try multiple selectors for different button types
-            bid_button = None
-            plus_button = None
             button_selectors = [
                 'button[data-uname="bidCurrentLot"]',  # Active bidding button
                 'button:has-text("Max Bid")',         # Pre-auction Max Bid button
@@ -512,30 +541,12 @@ class AuctionMonitor:
                 'button[aria-label*="Increase bid"]',     # Plus button aria-label
             ]
 
-            for selector in button_selectors:
-                try:
-                    candidate_button = self.auction_frame.locator(selector).first
-                    count = await candidate_button.count()
-                    if count > 0:
-                        is_visible = await candidate_button.is_visible(timeout=1000)
-                        if is_visible:
-                            bid_button = candidate_button
-                            break
-                except Exception:
-                    continue
+            _, bid_button = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'bid_button',
+                                                         button_selectors)
 
             # Find the plus button
-            for selector in plus_selectors:
-                try:
-                    candidate_button = self.auction_frame.locator(selector).first
-                    count = await candidate_button.count()
-                    if count > 0:
-                        is_visible = await candidate_button.is_visible(timeout=1000)
-                        if is_visible:
-                            plus_button = candidate_button
-                            break
-                except Exception:
-                    continue
+            _, plus_button = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'plus_button',
+                                                          plus_selectors)
 
             if not bid_button:
                 return
@@ -661,7 +672,6 @@ class AuctionMonitor:
                     sub_frames = []
 
                 button_frame = target_frame  # Default to target_frame
-                bid_button_found = False
 
                 # Try multiple selectors for different button types
                 button_selectors = [
@@ -670,44 +680,23 @@ class AuctionMonitor:
                     'button.btn-auctions:has-text("Max Bid")',  # More specific Max Bid selector
                 ]
 
-                for selector in button_selectors:
-                    print(f"🎯 Trying button selector: {selector}")
-
-                    # Try in sub-frames first
-                    for i, sub_frame in enumerate(sub_frames):
-                        try:
-                            bid_button = sub_frame.locator(selector)
-                            try:
-                                await bid_button.wait_for(timeout=2000)
-                                print(f"✅ Found bid button in sub-frame {i} with selector: {selector}")
-                                button_frame = sub_frame
-                                bid_button_found = True
-                                break
-                            except PlaywrightTimeoutError:
-                                continue
-                        except Exception as e:
-                            continue
-
-                    if bid_button_found:
-                        break
-
-                    # Try in main frame
-                    try:
-                        bid_button = target_frame.locator(selector)
-                        try:
-                            await bid_button.wait_for(timeout=2000)
-                            print(f"✅ Found bid button in main auction iframe with selector: {selector}")
-                            bid_button_found = True
-                            break
-                        except PlaywrightTimeoutError:
-                            continue
-                    except Exception as e:
-                        continue
-
-                if not bid_button_found:
+                # Every selector in every sub-frame and the main frame is awaited at once - one 2s
+                # timeout in the worst case instead of 2s per selector per frame
+                frames = list(sub_frames) + [target_frame]
+                winner, _ = await race(((index, selector), frame.locator(selector).first)
+                                       for selector in button_selectors for index, frame in enumerate(frames))
+                if not winner:
                     print("❌ No bid button found with any selector")
                     return False
 
+                index, selector = winner
+                button_frame = frames[index]
+                bid_button = button_frame.locator(selector)
+                if button_frame is target_frame:
+                    print(f"✅ Found bid button in main auction iframe with selector: {selector}")
+                else:
+                    print(f"✅ Found bid button in sub-frame {index} with selector: {selector}")
+
                 # Check count
                 count = await bid_button.count()
                 print(f"📊 Bid button elements found: {count}")
@@ -808,12 +797,26 @@ class AuctionMonitor:
 
         # Create context similar to copart_login.py - minimal configuration to avoid detection
         self.context = await self.browser.new_context()
+        self.route_policy = ResourcePolicy.from_env()
+        if self.route_policy:
+            await self.route_policy.apply(self.context)
 
         self.page = await self.context.new_page()
 
-        # Log console messages to file for debugging
-        self.page.on('console', lambda msg: logging.info(f'Console: {msg.text}'))
+        self._log_page_console()
+
+    def _log_page_console(self):
+        """Log every page console message to file - opt-in via AUCTION_MONITOR_LOG_CONSOLE=1 (costly on busy pages)"""
+        if os.environ.get('AUCTION_MONITOR_LOG_CONSOLE') == '1':
+            self.page.on('console', lambda msg: logging.info(f'Console: {msg.text}'))
 
+    async def _attach_to_context(self, context):
+        """Open a dedicated page for this auction in a shared browser context"""
+        self.context = context
+        self.browser = context.browser
+        self.page = await context.new_page()
+
+        self._log_page_console()
 
     async def _human_like_delay(self, min_delay=1, max_delay=3):
         """Add human-like delays between actions"""
@@ -865,57 +868,16 @@ class AuctionMonitor:
 
     async def _save_session_cookies(self):
         """Save authentication cookies for session persistence"""
-        try:
-            cookies = await self.context.cookies()
-            with open('copart_session.json', 'w') as f:
-                json.dump(cookies, f, indent=2)
-            logging.info('Session cookies saved')
-        except Exception as e:
-            logging.warning(f'Failed to save session cookies: {e}')
-
-    async def _load_session_cookies(self):
-        """Load saved session cookies"""
-        try:
-            if os.path.exists('copart_session.json'):
-                with open('copart_session.json', 'r') as f:
-                    cookies = json.load(f)
-                await self.context.add_cookies(cookies)
-                logging.info('Session cookies loaded')
-                return True
-        except Exception as e:
-            logging.warning(f'Failed to load session cookies: {e}')
-        return False
+        await self.session_store.save_context(self.context)
 
     async def _login_to_copart(self):
         """Login to Copart using credentials with enhanced anti-detection"""
         import random  # Ensure random is imported
         print('_login_to_copart method called')
 
-        # Try to load saved session first
-        if await self._load_session_cookies():
-            print('Attempting to use saved session...')
-            await self.page.goto("https://www.copart.com/dashboard", timeout=60000)
-            await self._human_like_delay(2, 4)
-
-            # Check if we're logged in
-            try:
-                # Look for dashboard elements or user menu
-                dashboard_elements = ['.dashboard', '.user-menu', '[data-uname*="user"]', '.member-info']
-                logged_in = False
-                for selector in dashboard_elements:
-                    try:
-                        element = self.page.locator(selector).first
-                        if await element.is_visible(timeout=3000):
-                            logged_in = True
-                            print('Successfully logged in using saved session')
-                            return
-                    except:
-                        continue
-
-                if not logged_in:
-                    print('Saved session expired, proceeding with fresh login')
-            except Exception as e:
-                print(f'Session check failed: {e}, proceeding with fresh login')
+        # Reuse the saved session; skips verification entirely while it was verified recently
+        if await self.session_store.resume(self.context):
+            return
 
         USERNAME = os.environ.get('COPART_USERNAME')
         PASSWORD = os.environ.get('COPART_PASSWORD')
@@ -928,12 +890,11 @@ class AuctionMonitor:
 
         # Navigate to login page with human-like behavior
         print('Navigating to login page...')
-        await self.page.goto("https://www.copart.com/login", timeout=60000)
+        await goto_ready(self.page, "https://www.copart.com/login", COPART_LOGIN)
         await self._human_like_delay(2, 4)
         await self._simulate_human_behavior()
 
         print(f'Page URL after navigation: {self.page.url}')
-        await self.page.wait_for_load_state('networkidle', timeout=60000)
         print('Page loaded, title:', await self.page.title())
 
         # Debug: Take screenshot and log page content
@@ -947,6 +908,7 @@ class AuctionMonitor:
         current_url = self.page.url
         if 'dashboard' in current_url or 'member' in current_url:
             print('Already logged in, skipping login process')
+            await self._save_session_cookies()
             return
 
         # Check for different login URLs
@@ -954,12 +916,12 @@ class AuctionMonitor:
             print(f'Redirected to non-login page: {current_url}')
             # Try alternative login URL
             print('Trying alternative login URL...')
-            await self.page.goto("https://www.copart.com/loginForm", timeout=60000)
+            await goto_ready(self.page, "https://www.copart.com/loginForm", COPART_LOGIN)
             await self._human_like_delay(2, 4)
             print(f'Alternative login URL: {self.page.url}')
             if 'login' not in self.page.url:
                 print('Still not on login page, trying member login...')
-                await self.page.goto("https://www.copart.com/memberLogin", timeout=60000)
+                await goto_ready(self.page, "https://www.copart.com/memberLogin", COPART_LOGIN)
                 await self._human_like_delay(2, 4)
                 print(f'Member login URL: {self.page.url}')
 
@@ -1174,9 +1136,8 @@ class AuctionMonitor:
             auction_url = f"https://www.copart.com{auction_url}"
 
         print('Going to auction URL...')
-        await self.page.goto(auction_url, timeout=60000)
-        print('Waiting for page load...')
-        await self.page.wait_for_load_state('load', timeout=30000)
+        # Ready as soon as the g2auction iframe is attached, not after every image and tag has loaded
+        await goto_ready(self.page, auction_url, COPART_AUCTION)
 
         print(f'Page title after navigation: {await self.page.title()}')
         print(f'Current URL: {self.page.url}')
@@ -1317,6 +1278,7 @@ class AuctionMonitor:
             print(f'Frame navigation detected: {frame.url}')
             if 'g2auction.copart.com' in frame.url:
                 print('Auction iframe navigated, re-establishing connection...')
+                self.frame_reattach_count += 1
                 # Re-establish iframe connection
                 await self._establish_iframe_connection()
                 # Re-setup mutation observer
@@ -1337,25 +1299,28 @@ class AuctionMonitor:
 
         print(f"Initial data: Bid={auction_data['current_bid']}, Bidder={auction_data['current_bidder']}, Time={auction_data['time_remaining']}, Status={auction_data['status']}")
 
-        # Emit initial data via WebSocket
-        if self.socketio:
-            try:
-                self.socketio.emit('auction_update', {
-                    'is_monitoring': self.is_monitoring,
-                    'current_auction': self.current_auction_data,
-                    'last_update': self.last_update,
-                    'content_change': False,
-                    'initial_load': True
-                })
-                print("Initial WebSocket data emitted")
-            except Exception as e:
-                print(f"Failed to emit initial WebSocket data: {e}")
+        # Emit initial data via WebSocket (version 1 carries every field)
+        if self._publish_state():
+            print("Initial WebSocket data emitted")
 
         # Keep monitoring active
+        self._open_command_queue()
+        try:
+            await self._monitoring_loop()
+        finally:
+            self._close_command_queue()
+
+    async def _monitoring_loop(self):
+        """Periodic health checks and snapshots; operator commands are run as soon as they are queued"""
         while self.is_monitoring:
             try:
-                # Sleep briefly to prevent busy waiting, but rely on MutationObserver for updates
-                await asyncio.sleep(1)
+                # Wait up to 1 s for operator commands (they run immediately); bid updates come from
+                # the WebSocket tap and MutationObserver, so this only paces the periodic checks
+                await self._wait_for_commands(1)
+
+                if self.recorder and time.monotonic() - self._last_snapshot > self.snapshot_interval:
+                    self._last_snapshot = time.monotonic()
+                    await self._record_dom_snapshot()
 
                 # Periodic health check - extract data every 30 seconds as fallback
                 current_time = time.time()
@@ -1363,18 +1328,25 @@ class AuctionMonitor:
                     self._last_health_check = current_time
 
                     try:
+                        # _extract_auction_data() swallows its own errors (counting extraction_errors)
+                        errors_before = self.extraction_errors
                         auction_data = await self._extract_auction_data()
+                        if self.extraction_errors > errors_before:
+                            self.health_check_failures += 1
                         self.current_auction_data = auction_data
                         self.last_update = datetime.now().isoformat()
+                        self._publish_state()
                         print(f"Health check update: Bid={auction_data['current_bid']}, Time={auction_data['time_remaining']}")
 
                         # Check for recent network activity
                         await self._check_recent_network_activity()
                     except Exception as extract_error:
+                        self.health_check_failures += 1
                         print(f"Data extraction failed during health check: {extract_error}")
                         # Try to reinitialize iframe access if it failed
                         if "destroyed" in str(extract_error).lower():
                             print("Execution context destroyed, attempting to reinitialize...")
+                            self.frame_reattach_count += 1
                             try:
                                 # Re-setup iframe access
                                 await self._navigate_to_auction(self.page.url)
@@ -1391,29 +1363,12 @@ class AuctionMonitor:
                 #         # Don't print periodic highlight errors to avoid spam
                 #         pass
 
-                # Check for manual highlight requests
-                if self._manual_bid_highlight_requested:
-                    try:
-                        print("🔵 Processing manual bid highlight request in monitoring thread...")
-                        await self._highlight_bid_button_manual_impl()
-                        self._manual_bid_highlight_requested = False  # Reset flag once applied to button
-                    except Exception as manual_error:
-                        print(f"❌ Manual bid highlight failed: {manual_error}")
-
-                # Check for manual plus highlight requests
-                if self._manual_plus_highlight_requested:
-                    try:
-                        print("🔴 Processing manual plus highlight request in monitoring thread...")
-                        await self._highlight_plus_button_manual_impl()
-                        self._manual_plus_highlight_requested = False  # Reset flag once applied to button
-                    except Exception as manual_error:
-                        print(f"❌ Manual plus highlight failed: {manual_error}")
-
             except Exception as e:
                 print(f'Monitoring error: {str(e)}')
                 # If it's an execution context destroyed error, try to recover
                 if "destroyed" in str(e).lower() or "context" in str(e).lower():
                     print("Execution context error detected, attempting recovery...")
+                    self.frame_reattach_count += 1
                     await asyncio.sleep(2)
                     try:
                         # Try to reinitialize the monitoring setup
@@ -1424,23 +1379,127 @@ class AuctionMonitor:
                 else:
                     await asyncio.sleep(5)
 
+    def submit_command(self, name, *args):
+        """Queue a command for the monitoring loop from any thread; returns a concurrent.futures.Future"""
+        future = concurrent.futures.Future()
+        if name not in self._command_handlers:
+            future.set_exception(ValueError(f"Unknown monitor command: {name}"))
+        elif self._command_queue is None or not self.is_monitoring:
+            future.set_exception(RuntimeError("Monitoring loop is not running"))
+        else:
+            self.loop.call_soon_threadsafe(self._enqueue_command, (name, args, future))
+        return future
+
+    async def run_command(self, name, *args):
+        """Awaitable submit_command, usable from any event loop"""
+        return await asyncio.wrap_future(self.submit_command(name, *args))
+
+    def _enqueue_command(self, command):
+        if self._command_queue is None:
+            command[2].set_exception(RuntimeError("Monitoring loop stopped"))
+            return
+        self._command_queue.put_nowait(command)
+
+    def _open_command_queue(self):
+        self.loop = asyncio.get_event_loop()
+        self._command_queue = asyncio.Queue()
+
+    def _close_command_queue(self):
+        """Fail commands that were queued but never run"""
+        if self._command_getter:
+            self._command_getter.cancel()
+            self._command_getter = None
+        queue, self._command_queue = self._command_queue, None
+        while queue and not queue.empty():
+            name, args, future = queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Monitoring loop stopped"))
+
+    async def _wait_for_commands(self, timeout):
+        """Sleep up to `timeout` seconds but wake as soon as a command arrives; returns commands run"""
+        # The pending get() is kept across calls instead of being cancelled on timeout, so no command is lost
+        if self._command_getter is None:
+            self._command_getter = asyncio.ensure_future(self._command_queue.get())
+        done, _ = await asyncio.wait({self._command_getter}, timeout=timeout)
+        if not done:
+            return 0
+
+        commands = [self._command_getter.result()]
+        self._command_getter = None
+        while not self._command_queue.empty():
+            commands.append(self._command_queue.get_nowait())
+        for name, args, future in commands:
+            await self._run_command(name, args, future)
+        return len(commands)
+
+    async def _run_command(self, name, args, future):
+        if not future.set_running_or_notify_cancel():
+            return  # caller gave up before the command started
+        try:
+            result = await self._command_handlers[name](*args)
+        except Exception as e:
+            print(f"❌ Command {name} failed: {e}")
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    async def _ping(self):
+        """No-op command: round-trip check for the monitoring loop"""
+        return time.monotonic()
+
     async def _check_recent_network_activity(self):
         """Check for recent network activity that might indicate auction updates"""
         try:
-            if hasattr(self, 'websocket_messages') and self.websocket_messages:
-                # Check for messages in the last 30 seconds
-                recent_messages = [msg for msg in self.websocket_messages
-                                 if (datetime.now() - datetime.fromisoformat(msg['timestamp'])).seconds < 30]
-
-                if recent_messages:
-                    print(f"Found {len(recent_messages)} recent WebSocket messages")
-                    for msg in recent_messages[-3:]:  # Show last 3 messages
-                        print(f"Recent WS: {msg['url']} - {str(msg['data'])[:100]}...")
+            # Messages in the last 30 seconds - binary search on monotonic timestamps, no rescans
+            recent_count = self.websocket_messages.count_since(30)
+            if recent_count:
+                print(f"Found {recent_count} recent WebSocket messages")
+                for msg in self.websocket_messages.latest(min(recent_count, 3)):  # Show last 3 messages
+                    print(f"Recent WS: {msg['url']} - {str(msg['data'])[:100]}...")
 
         except Exception as e:
             print(f"Error checking recent network activity: {e}")
 
-    async def _extract_auction_data(self):
+    async def _record_dom_snapshot(self):
+        """Save page + auction iframe HTML with the data extracted from them, for replay regression checks"""
+        try:
+            frame = self._get_auction_frame_handle()
+            page_html = await self.page.content()
+            frame_html = await frame.content() if frame else ''
+            extracted = await self._extract_auction_data()
+            self.recorder.record_dom_snapshot(page_html, frame_html, extracted)
+        except Exception as e:
+            print(f"DOM snapshot failed: {e}")
+
+    def _get_auction_frame_handle(self):
+        """Return the g2auction Frame object (evaluate() needs a Frame, not a FrameLocator)"""
+        if not self.page or self.page.is_closed():
+            return None
+        for frame in self.page.frames:
+            if 'g2auction.copart.com' in frame.url:
+                return frame
+        return None
+
+    async def _extract_data_with_plan(self, data):
+        """Resolve every field in one evaluate() per frame; returns False when the frame is unavailable"""
+        frame = self._get_auction_frame_handle()
+        if not frame:
+            return False
+
+        # Main page status and iframe fields are independent, so both round trips run concurrently
+        # Rules are ordered by the selector cache, so each field's usual winner is checked first in the frame
+        frame_plan = selector_cache.order_plan('g2auction_frame', FRAME_PLAN)
+        page_result, frame_result = await asyncio.gather(
+            self.page.evaluate(EXTRACTION_PLAN_JS, PAGE_PLAN),
+            frame.evaluate(EXTRACTION_PLAN_JS, frame_plan)
+        )
+        selector_cache.record_plan('g2auction_frame', FRAME_PLAN, frame_plan, frame_result)
+        apply_plan_result(data, page_result)
+        apply_plan_result(data, frame_result)
+        print(f"Batched extraction matched: {frame_result.get('matched')} (in-frame {frame_result.get('elapsedMs', 0):.1f} ms)")
+        return True
+
+    async def _extract_auction_data(self, batched=True):
         """Extract current auction data from the page"""
         data = {
             'auction_id': 'Unknown',
@@ -1465,23 +1524,39 @@ class AuctionMonitor:
             if 'auctionDetails=' in url:
                 data['auction_id'] = url.split('auctionDetails=')[1].split('&')[0]
 
-            # Extract lot details from main page
-            await self._extract_lot_details_from_main_page(data)
-
-            # Check for auction status indicators on main page
-            await self._check_main_page_auction_status(data)
-
-            # Try to extract data from iframe if accessible
-            if self.auction_frame:
+            started = time.perf_counter()
+            plan_done = False
+            if batched and self.auction_frame:
                 try:
-                    await self._extract_data_from_iframe(data)
+                    plan_done = await self._extract_data_with_plan(data)
                 except Exception as e:
-                    print(f"Could not extract data from iframe: {e}")
+                    print(f"Batched extraction failed, falling back to selector-by-selector: {e}")
+
+            if not plan_done:
+                # Extract lot details from main page
+                await self._extract_lot_details_from_main_page(data)
+
+                # Check for auction status indicators on main page
+                await self._check_main_page_auction_status(data)
+
+                # Try to extract data from iframe if accessible
+                if self.auction_frame:
+                    try:
+                        await self._extract_data_from_iframe(data)
+                    except Exception as e:
+                        print(f"Could not extract data from iframe: {e}")
+
+            mode = 'batched' if plan_done else 'sequential'
+            self.last_extraction_ms = (time.perf_counter() - started) * 1000
+            self.extraction_histogram.observe(self.last_extraction_ms)
+            print(f"⏱️ Extraction ({mode}) took {self.last_extraction_ms:.1f} ms")
+            logging.info(f'Extraction ({mode}) took {self.last_extraction_ms:.1f} ms')
 
             # Check network activity for auction data
             await self._check_network_auction_data(data)
 
         except Exception as e:
+            self.extraction_errors += 1
             print(f"Error extracting auction data: {e}")
 
         return data
@@ -1502,21 +1577,19 @@ class AuctionMonitor:
                 '[data-uname*="title"]'
             ]
 
-            for selector in title_selectors:
-                try:
-                    title_elem = self.auction_frame.locator(selector).first
-                    if await title_elem.is_visible(timeout=2000):
-                        # Try to get title from 'title' attribute first, then text content
-                        title_text = await title_elem.get_attribute('title')
-                        if not title_text:
-                            title_text = await title_elem.text_content()
-                        if title_text and title_text.strip():
-                            data['lot_title'] = title_text.strip()
-                            print(f"Found lot title with selector {selector}: {data['lot_title']}")
-                            break
-                except Exception as e:
-                    print(f"Error with title selector {selector}: {e}")
-                    continue
+            async def read_title(title_elem):
+                if await title_elem.is_visible():
+                    # Try to get title from 'title' attribute first, then text content
+                    title_text = await title_elem.get_attribute('title')
+                    if not title_text:
+                        title_text = await title_elem.text_content()
+                    return (title_text or '').strip()
+
+            selector, title_text = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'lot_title',
+                                                                title_selectors, read_title)
+            if title_text:
+                data['lot_title'] = title_text
+                print(f"Found lot title with selector {selector}: {data['lot_title']}")
 
             # Extract lot number using the provided Copart selector
             lot_number_selectors = [
@@ -1528,23 +1601,18 @@ class AuctionMonitor:
                 '[data-uname*="lot"]'
             ]
 
-            for selector in lot_number_selectors:
-                try:
-                    lot_elem = self.auction_frame.locator(selector).first
-                    if await lot_elem.is_visible(timeout=2000):
-                        # For Copart selector, get the text content (the lot number)
-                        lot_text = await lot_elem.text_content()
-                        if lot_text and lot_text.strip():
-                            # Extract just the numeric part
-                            import re
-                            lot_match = re.search(r'(\d+)', lot_text.strip())
-                            if lot_match:
-                                data['lot_number'] = lot_match.group(1)
-                                print(f"Found lot number with selector {selector}: {data['lot_number']}")
-                                break
-                except Exception as e:
-                    print(f"Error with lot number selector {selector}: {e}")
-                    continue
+            async def read_lot_number(lot_elem):
+                if await lot_elem.is_visible():
+                    # For Copart selector, get the text content (the lot number) and keep just the numeric part
+                    import re
+                    lot_match = re.search(r'(\d+)', (await lot_elem.text_content() or '').strip())
+                    return lot_match.group(1) if lot_match else None
+
+            selector, lot_number = await selector_cache.resolve(self.auction_frame, 'g2auction_frame', 'lot_number',
+                                                                lot_number_selectors, read_lot_number)
+            if lot_number:
+                data['lot_number'] = lot_number
+                print(f"Found lot number with selector {selector}: {data['lot_number']}")
 
         except Exception as e:
             print(f"Error extracting lot details from iframe: {e}")
@@ -1614,25 +1682,17 @@ class AuctionMonitor:
             else:
                 # Fallback to other selectors
                 bid_selectors = ['.current-bid', '.bid-amount', '.bid-price', '[data-uname*="bid"]', 'input[name="bidAmount"]']
-                for selector in bid_selectors:
-                    try:
-                        bid_elem = target.locator(selector).first
-                        if await bid_elem.is_visible(timeout=1000):
-                            if selector == 'input[name="bidAmount"]':
-                                value = await bid_elem.get_attribute('value')
-                                if value:
-                                    data['current_bid'] = value
-                                else:
-                                    data['current_bid'] = await bid_elem.text_content()
-                            else:
-                                data['current_bid'] = await bid_elem.text_content()
-                            print(f"Found bid with selector {selector}: {data['current_bid']}")
-                            break
-                        else:
-                            print(f"Bid selector {selector} not visible")
-                    except Exception as e:
-                        print(f"Error with bid selector {selector}: {e}")
-                        continue
+
+                async def read_bid(bid_elem):
+                    if await bid_elem.is_visible():
+                        # input[name="bidAmount"] carries the amount in its value
+                        return await bid_elem.get_attribute('value') or await bid_elem.text_content()
+
+                selector, bid_text = await selector_cache.resolve(target, 'g2auction_frame', 'current_bid_fallback',
+                                                                  bid_selectors, read_bid)
+                if bid_text:
+                    data['current_bid'] = bid_text
+                    print(f"Found bid with selector {selector}: {data['current_bid']}")
         except Exception as e:
             print(f"Error extracting bid from iframe: {e}")
 
@@ -1652,18 +1712,11 @@ class AuctionMonitor:
             print(f"Error extracting bidder from iframe: {e}")
             # Fallback to other selectors
             bidder_selectors = ['.current-bidder', '.bidder-name', '.winning-bidder']
-            for selector in bidder_selectors:
-                try:
-                    bidder_elem = target.locator(selector).first
-                    if await bidder_elem.is_visible(timeout=1000):
-                        data['current_bidder'] = await bidder_elem.text_content()
-                        print(f"Found bidder with selector {selector}: {data['current_bidder']}")
-                        break
-                    else:
-                        print(f"Bidder selector {selector} not visible")
-                except Exception as e:
-                    print(f"Error with bidder selector {selector}: {e}")
-                    continue
+            selector, bidder_text = await selector_cache.resolve(target, 'g2auction_frame', 'current_bidder_fallback',
+                                                                 bidder_selectors, visible_text)
+            if bidder_text:
+                data['current_bidder'] = bidder_text
+                print(f"Found bidder with selector {selector}: {data['current_bidder']}")
 
         # Time remaining - look for countdown timers and circular progress
         time_selectors = [
@@ -1671,95 +1724,142 @@ class AuctionMonitor:
             '.countdown-timer', '.auction-timer', '.time-display',
             '[class*="countdown"]', '[class*="timer"]'
         ]
-        for selector in time_selectors:
-            try:
-                time_elem = target.locator(selector).first
-                if await time_elem.is_visible(timeout=1000):
-                    time_text = await time_elem.text_content()
-                    if time_text and time_text.strip():
-                        data['time_remaining'] = time_text.strip()
-                        print(f"Found time with selector {selector}: {data['time_remaining']}")
-                        break
-                else:
-                    print(f"Time selector {selector} not visible")
-            except Exception as e:
-                print(f"Error with time selector {selector}: {e}")
-                continue
+        selector, time_text = await selector_cache.resolve(target, 'g2auction_frame', 'time_remaining',
+                                                           time_selectors, visible_text)
+        if time_text:
+            data['time_remaining'] = time_text
+            print(f"Found time with selector {selector}: {data['time_remaining']}")
 
         # Active bidders count
         bidders_selectors = ['.active-bidders', '.bidder-count', '.bidders-online']
-        for selector in bidders_selectors:
-            try:
-                bidders_elem = target.locator(selector).first
-                if await bidders_elem.is_visible(timeout=1000):
-                    bidders_text = await bidders_elem.text_content()
-                    # Extract number from text
-                    import re
-                    numbers = re.findall(r'\d+', bidders_text)
-                    if numbers:
-                        data['active_bidders'] = int(numbers[0])
-                        print(f"Found bidders with selector {selector}: {data['active_bidders']}")
-                    break
-                else:
-                    print(f"Bidders selector {selector} not visible")
-            except Exception as e:
-                print(f"Error with bidders selector {selector}: {e}")
-                continue
+        selector, bidders_text = await selector_cache.resolve(target, 'g2auction_frame', 'active_bidders',
+                                                              bidders_selectors, visible_text)
+        if bidders_text:
+            # Extract number from text
+            import re
+            numbers = re.findall(r'\d+', bidders_text)
+            if numbers:
+                data['active_bidders'] = int(numbers[0])
+                print(f"Found bidders with selector {selector}: {data['active_bidders']}")
 
     async def _check_network_auction_data(self, data):
-        """Check recent network activity for auction data"""
+        """Overlay the WebSocket feed state on DOM data - frames are the primary source while fresh,
+        once they have agreed with the DOM"""
         try:
-            # Check recent WebSocket messages for auction data
-            if hasattr(self, 'websocket_messages') and self.websocket_messages:
-                recent_messages = [msg for msg in self.websocket_messages
-                                 if (datetime.now() - datetime.fromisoformat(msg['timestamp'])).seconds < 30]
+            state = self.ws_feed_state
+            if not state or time.monotonic() - state.get('updated_at', 0) > 30:
+                return
+            if not self._verify_ws_feed(data):
+                return
 
-                for msg in recent_messages:
-                    try:
-                        msg_data = msg['data']
-                        if isinstance(msg_data, str):
-                            msg_json = json.loads(msg_data)
-                        else:
-                            msg_json = msg_data
-
-                        # Look for auction data in message
-                        if 'bid' in str(msg_json).lower():
-                            print(f"Found auction data in WebSocket: {msg_json}")
-                            # Extract relevant data
-                            if 'currentBid' in msg_json:
-                                data['current_bid'] = str(msg_json['currentBid'])
-                            if 'currentBidder' in msg_json:
-                                data['current_bidder'] = str(msg_json['currentBidder'])
-                            if 'timeRemaining' in msg_json:
-                                data['time_remaining'] = str(msg_json['timeRemaining'])
-                            if 'status' in msg_json:
-                                data['status'] = str(msg_json['status'])
-
-                    except:
-                        continue
+            for key in ('lot_number', 'current_bid', 'current_bidder', 'status'):
+                if state.get(key):
+                    data[key] = state[key]
+            print(f"Applied WebSocket feed state: Bid={state.get('current_bid')}, Bidder={state.get('current_bidder')}")
 
         except Exception as e:
             print(f"Error checking network auction data: {e}")
 
+    def _setup_websocket_tap(self):
+        """Decode g2auction WebSocket frames into typed events (registered once per page)"""
+        if self.ws_tap:
+            return
+        self.ws_tap = WebSocketTap(self._handle_ws_event, on_frame=self._record_ws_frame)
+        self.ws_tap.attach(self.page)
+        print('WebSocket tap attached for g2auction frames')
+
+    def _record_ws_frame(self, url, payload):
+        """Keep raw frames for the periodic network activity report (bounded, monotonic-timestamped)"""
+        self.websocket_messages.append({
+            'url': url,
+            'data': payload,
+            'timestamp': datetime.now().isoformat()  # display only; queries use the buffer's monotonic index
+        })
+        if self.recorder:
+            self.recorder.record_ws_frame(url, payload)
+
+    def _verify_ws_feed(self, dom_data):
+        """True once the feed's lot and bid have matched the page's; until then the DOM is the only source.
+        The frame schema is undocumented, so a decode that never agrees with the page never overrides it"""
+        state = self.ws_feed_state
+        if state.get('verified'):
+            return True
+        if not dom_data or not state.get('lot_number') or not state.get('current_bid'):
+            return False
+        same_lot = str(dom_data.get('lot_number')) == state['lot_number']
+        same_bid = parse_amount(dom_data.get('current_bid')) == parse_amount(state['current_bid'])
+        if same_lot and same_bid:
+            state['verified'] = True
+            print(f"✅ WebSocket feed matches the page (lot {state['lot_number']}, bid {state['current_bid']}), "
+                  f"using it as the primary bid source")
+        return state.get('verified', False)
+
+    def _handle_ws_event(self, event):
+        """Apply a decoded WebSocket event; DOM observer updates only fill in what frames miss"""
+        state = self.ws_feed_state
+        state['updated_at'] = time.monotonic()
+
+        if isinstance(event, LotChangeEvent):
+            state.update({'lot_number': event.lot_number, 'current_bid': None,
+                          'current_bidder': None, 'status': 'active'})
+            if not state.get('verified'):
+                return  # the page's lot stays authoritative until the feed has been verified
+            print(f"📦 Lot change from WebSocket: {event.previous_lot_number} -> {event.lot_number}")
+            self._last_applied_bid = None
+            if self.current_auction_data is not None:
+                self.current_auction_data['lot_number'] = event.lot_number
+                self._publish_state()
+            self._record_event('lot_change', lot_number=event.lot_number, source='websocket',
+                               payload={'previous_lot_number': event.previous_lot_number})
+
+        elif isinstance(event, SoldEvent):
+            state['status'] = 'sold'
+            if not state.get('verified'):
+                return
+            message = f"🔨 LOT SOLD: Lot #{event.lot_number} for {format_amount(event.amount)} to {event.bidder or 'N/A'}"
+            print(message)
+            if self.current_auction_data is not None:
+                self.current_auction_data['status'] = 'sold'
+                self._publish_state()
+            self._record_event('sold', lot_number=event.lot_number, amount=event.amount,
+                               bidder=event.bidder, source='websocket')
+            if self.socketio:
+                try:
+                    self.socketio.emit('bid_change_notification', {
+                        'message': message,
+                        'type': 'sold',
+                        'timestamp': datetime.now().isoformat()
+                    })
+                except Exception as e:
+                    print(f"Failed to emit WebSocket event: {e}")
+
+        elif isinstance(event, (BidEvent, BidderEvent)):
+            if isinstance(event, BidEvent):
+                state['current_bid'] = format_amount(event.amount)
+            if event.bidder:
+                state['current_bidder'] = event.bidder
+            if not state.get('current_bid') or not self._verify_ws_feed(self.current_auction_data):
+                return
+
+            received_epoch_ms = time.time() * 1000
+            bid_data = {
+                'bid': state['current_bid'],
+                'bidder': state.get('current_bidder'),
+                'timestamp': datetime.now().isoformat(),
+                'source': 'websocket',
+                'sourceEpochMs': received_epoch_ms,  # the frame is the source; it has no earlier timestamp
+                'receivedEpochMs': received_epoch_ms
+            }
+            if event.lot_number:
+                bid_data['lotNumber'] = event.lot_number
+            self._apply_bid_change(bid_data)
+
     async def _setup_network_monitoring(self):
         """Set up network monitoring to capture auction data from WebSocket/API calls"""
         try:
             print('Setting up network monitoring for auction data...')
 
-            # Monitor WebSocket connections
-            self.websocket_messages = []
-
-            def handle_websocket_message(msg):
-                try:
-                    if 'g2auction.copart.com' in msg.url or 'auction' in msg.url.lower():
-                        print(f'WebSocket message from {msg.url}: {msg}')
-                        self.websocket_messages.append({
-                            'url': msg.url,
-                            'data': msg,
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except:
-                    pass
+            # WebSocket frames are captured by the tap registered in _setup_websocket_tap
 
             # Monitor network requests to auction domains
             def handle_request(request):
@@ -1814,6 +1914,9 @@ class AuctionMonitor:
                 print(f'Auction content not loaded within 30 seconds: {e}')
                 print('Proceeding with observer setup anyway...')
 
+            # Bid changes are delivered through an exposed binding instead of console scraping
+            await self._setup_bid_channel()
+
             # JavaScript code to set up MutationObserver for auctionrunningdiv-MACRO content changes
             observer_js = """
             (function() {
@@ -1828,6 +1931,19 @@ class AuctionMonitor:
                 let lastBidder = null;
                 let mutationCount = 0;
 
+                // Deliver a bid change to Python: exposed binding when available, console as fallback
+                function publishBidChange(bidInfo, mutationEpochMs, mutationPerfMs) {
+                    window.__auctionBidSeq = (window.__auctionBidSeq || 0) + 1;
+                    bidInfo.seq = window.__auctionBidSeq;
+                    bidInfo.mutationEpochMs = mutationEpochMs;  // performance.timeOrigin + performance.now()
+                    bidInfo.mutationPerfMs = mutationPerfMs;    // in-frame high-resolution clock
+                    if (typeof window.__auctionBidChannel === 'function') {
+                        window.__auctionBidChannel(bidInfo);
+                    } else {
+                        console.log('BID_CHANGE:' + JSON.stringify(bidInfo));
+                    }
+                }
+
                 // Function to extract current bid, bidder, bid suggestion, and lot information
                 function getCurrentBidInfo() {
                     const auctionDiv = document.querySelector('.auctionrunningdiv-MACRO');
@@ -1929,14 +2045,15 @@ class AuctionMonitor:
                     console.log('Found .auctionrunningdiv-MACRO, setting up observer');
 
                     const observer = new MutationObserver(function(mutations) {
+                        const mutationPerfMs = performance.now();
+                        const mutationEpochMs = performance.timeOrigin + mutationPerfMs;
                         mutationCount++;
-                        console.log('Mutation detected #' + mutationCount);
 
                         const bidInfo = getCurrentBidInfo();
                         if (bidInfo && bidInfo.bid && bidInfo.bidder) {
                             // Check if bid or bidder changed
                             if (bidInfo.bid !== lastBid || bidInfo.bidder !== lastBidder) {
-                                console.log('BID_CHANGE:' + JSON.stringify(bidInfo));
+                                publishBidChange(bidInfo, mutationEpochMs, mutationPerfMs);
                                 lastBid = bidInfo.bid;
                                 lastBidder = bidInfo.bidder;
                             }
@@ -1988,8 +2105,10 @@ class AuctionMonitor:
             except Exception as e:
                 print(f'JavaScript injection failed: {e}')
 
-            # Set up console message listener to capture updates
-            self.page.on('console', self._handle_console_message)
+            # Console messages are only parsed when the binding could not be installed
+            if not self._bid_channel_ready and not self._console_listener_installed:
+                self.page.on('console', self._handle_console_message)
+                self._console_listener_installed = True
 
             print('Bid change observer setup complete')
             logging.info('Bid change observer setup complete - monitoring for bid changes')
@@ -2005,60 +2124,12 @@ class AuctionMonitor:
                 # Parse the bid change update
                 json_data = text[11:]  # Remove 'BID_CHANGE:' prefix
                 bid_data = json.loads(json_data)
-
-                # Extract current lot information from the bid change data (sent by JavaScript)
-                current_lot_title = bid_data.get('lotTitle', self.current_auction_data.get('lot_title', 'N/A'))
-                current_lot_number = bid_data.get('lotNumber', self.current_auction_data.get('lot_number', 'N/A'))
-
-                # Update stored lot information if it changed
-                if current_lot_title != 'N/A':
-                    self.current_auction_data['lot_title'] = current_lot_title
-                if current_lot_number != 'N/A':
-                    self.current_auction_data['lot_number'] = current_lot_number
-
-                # Update current data
-                bid_suggestion = bid_data.get('bidSuggestion', 'N/A')
-                self.current_auction_data.update({
-                    'current_bid': bid_data.get('bid', 'N/A'),
-                    'current_bidder': bid_data.get('bidder', 'N/A'),
-                    'bid_suggestion': bid_suggestion
-                })
-                self.last_update = datetime.now().isoformat()
-
-                print(f"Updated auction data - Bid: {bid_data.get('bid', 'N/A')}, Suggestion: {bid_suggestion}")
-
-                # Print bid change notification with suggestion
-                bid_suggestion = bid_data.get('bidSuggestion', 'N/A')
-                suggestion_text = f", Suggestion={bid_suggestion}" if bid_suggestion != 'N/A' else ""
-                console_message = f"🚨 BID CHANGE DETECTED: Bid={bid_data.get('bid', 'N/A')}, Bidder={bid_data.get('bidder', 'N/A')}{suggestion_text} at {bid_data.get('timestamp', 'N/A')}"
-                lot_message = f"   📋 Lot: {current_lot_title} (#{current_lot_number})"
-
-                print(console_message)
-                print(lot_message)
-
-                # Emit WebSocket event for bid change notification
-                if self.socketio:
-                    try:
-                        # Emit the formatted message to display in web interface
-                        self.socketio.emit('bid_change_notification', {
-                            'message': console_message + '\n' + lot_message,
-                            'type': 'bid_change',
-                            'timestamp': bid_data.get('timestamp', datetime.now().isoformat())
-                        })
-
-                        # Also emit regular auction update
-                        self.socketio.emit('auction_update', {
-                            'is_monitoring': self.is_monitoring,
-                            'current_auction': self.current_auction_data,
-                            'last_update': self.last_update,
-                            'content_change': True,
-                            'lot_title': current_lot_title,
-                            'lot_number': current_lot_number,
-                            'bid_suggestion': bid_suggestion
-                        })
-                        print("WebSocket events emitted for bid change")
-                    except Exception as e:
-                        print(f"Failed to emit WebSocket event: {e}")
+                bid_data['receivedEpochMs'] = time.time() * 1000
+                if bid_data.get('mutationEpochMs'):
+                    bid_data['sourceEpochMs'] = bid_data['mutationEpochMs']
+                if self.recorder:
+                    self.recorder.record_observer_event(bid_data)
+                self._apply_bid_change(bid_data)
 
             elif text.startswith('AUCTION_UPDATE:'):
                 # Parse the general auction data update (fallback)
@@ -2068,10 +2139,173 @@ class AuctionMonitor:
                 # Update current data
                 self.current_auction_data.update(auction_data)
                 self.last_update = datetime.now().isoformat()
+                self._publish_state()
 
                 # Print update for debugging
                 print(f"Real-time update: Bid={auction_data.get('current_bid', 'N/A')}, Bidder={auction_data.get('current_bidder', 'N/A')}, Time={auction_data.get('time_remaining', 'N/A')}")
 
         except Exception as e:
             # Ignore non-auction-update console messages
-            pass
\ No newline at end of file
+            pass
+
+    async def _setup_bid_channel(self):
+        """Expose the __auctionBidChannel binding to every frame of the page (once per page)"""
+        if self._bid_channel_ready:
+            return
+        try:
+            await self.page.expose_binding('__auctionBidChannel', self._handle_binding_event)
+            self._bid_channel_ready = True
+            print('Bid change binding channel installed')
+        except Exception as e:
+            print(f'Could not install bid change binding, falling back to console messages: {e}')
+
+    def _handle_binding_event(self, source, bid_data):
+        """Receive a bid change from the in-frame observer through the exposed binding"""
+        received_epoch_ms = time.time() * 1000
+        try:
+            # Same machine, so the frame's epoch clock and ours agree closely enough for ms delays
+            mutation_epoch_ms = bid_data.get('mutationEpochMs')
+            bid_data['receivedEpochMs'] = received_epoch_ms
+            if mutation_epoch_ms:
+                delay_ms = received_epoch_ms - mutation_epoch_ms
+                self.bid_channel_delays_ms.append(delay_ms)
+                bid_data['sourceEpochMs'] = mutation_epoch_ms
+
+            # A sequence number lower than the last one means the observer was re-injected into a new frame
+            seq = bid_data.get('seq')
+            if seq is not None:
+                if self._last_bid_seq is not None and seq > self._last_bid_seq + 1:
+                    self.bid_channel_missed += seq - self._last_bid_seq - 1
+                self._last_bid_seq = seq
+            self.bid_channel_received += 1
+
+            if self.recorder:
+                self.recorder.record_observer_event(bid_data)
+            self._apply_bid_change(bid_data)
+        except Exception as e:
+            print(f"Failed to handle bid channel event: {e}")
+
+    def _publish_state(self, **meta):
+        """Emit the fields of current_auction_data that changed since the last publish as an auction_delta"""
+        if self.current_auction_data is None:
+            return None
+        delta = self.state.publish(self.current_auction_data, is_monitoring=self.is_monitoring,
+                                   last_update=self.last_update, **meta)
+        if delta and self.socketio:
+            try:
+                self.socketio.emit('auction_delta', delta)
+            except Exception as e:
+                print(f"Failed to emit auction delta: {e}")
+        return delta
+
+    def get_state_snapshot(self):
+        """Full published state for clients that are new or have fallen behind"""
+        return self.state.snapshot(is_monitoring=self.is_monitoring, last_update=self.last_update)
+
+    def _record_event(self, event_type, **fields):
+        """Queue an event for the durable history (write-behind, never blocks the monitor)"""
+        if self.event_store:
+            self.event_store.append(event_type, **fields)
+
+    def get_bid_channel_stats(self):
+        """Mutation-to-callback delay statistics for the binding channel"""
+        delays = sorted(self.bid_channel_delays_ms)
+        stats = {
+            'received': self.bid_channel_received,
+            'missed': self.bid_channel_missed,
+            'transport': 'binding' if self._bid_channel_ready else 'console'
+        }
+        if delays:
+            stats.update({
+                'delay_ms_last': round(self.bid_channel_delays_ms[-1], 2),
+                'delay_ms_p50': round(delays[len(delays) // 2], 2),
+                'delay_ms_p95': round(delays[min(len(delays) - 1, int(len(delays) * 0.95))], 2),
+                'delay_ms_max': round(delays[-1], 2)
+            })
+        return stats
+
+    def _apply_bid_change(self, bid_data):
+        """Apply a bid change reported by the WebSocket feed or the in-frame MutationObserver"""
+        if self.current_auction_data is None:
+            self.current_auction_data = {}
+
+        # The same bid usually arrives twice: first as a WebSocket frame, then as an SVG re-render
+        # A new bidder at the same amount (BidderEvent, a corrected re-render) still goes through
+        amount = parse_amount(bid_data.get('bid'))
+        bidder = bid_data.get('bidder')
+        last = self._last_applied_bid
+        if bid_data.get('source') != 'websocket':
+            self._verify_ws_feed({'lot_number': bid_data.get('lotNumber', self.current_auction_data.get('lot_number')),
+                                  'current_bid': bid_data.get('bid')})
+        if last and amount == last[0] and (not bidder or bidder == last[1]):
+            return
+        self._last_applied_bid = (amount, bidder)
+        self.bid_changes_applied += 1
+
+        # Extract current lot information from the bid change data (sent by JavaScript)
+        current_lot_title = bid_data.get('lotTitle', self.current_auction_data.get('lot_title', 'N/A'))
+        current_lot_number = bid_data.get('lotNumber', self.current_auction_data.get('lot_number', 'N/A'))
+
+        # Update stored lot information if it changed
+        if current_lot_title != 'N/A':
+            self.current_auction_data['lot_title'] = current_lot_title
+        if current_lot_number != 'N/A':
+            self.current_auction_data['lot_number'] = current_lot_number
+
+        # Update current data
+        bid_suggestion = bid_data.get('bidSuggestion', 'N/A')
+        self.current_auction_data.update({
+            'current_bid': bid_data.get('bid', 'N/A'),
+            'current_bidder': bid_data.get('bidder', 'N/A'),
+            'bid_suggestion': bid_suggestion
+        })
+        self.last_update = datetime.now().isoformat()
+        self._record_event('bid', lot_number=current_lot_number, amount=amount, bidder=bid_data.get('bidder'),
+                           source=bid_data.get('source', 'dom'), payload=bid_data)
+
+        print(f"Updated auction data - Bid: {bid_data.get('bid', 'N/A')}, Suggestion: {bid_suggestion}")
+
+        # Print bid change notification with suggestion
+        bid_suggestion = bid_data.get('bidSuggestion', 'N/A')
+        suggestion_text = f", Suggestion={bid_suggestion}" if bid_suggestion != 'N/A' else ""
+        console_message = f"🚨 BID CHANGE DETECTED: Bid={bid_data.get('bid', 'N/A')}, Bidder={bid_data.get('bidder', 'N/A')}{suggestion_text} at {bid_data.get('timestamp', 'N/A')}"
+        lot_message = f"   📋 Lot: {current_lot_title} (#{current_lot_number})"
+
+        print(console_message)
+        print(lot_message)
+
+        # Stage timestamps travel with the update; the dashboard acks them back after rendering
+        self._bid_change_id += 1
+        latency = {
+            'id': self._bid_change_id,
+            'auction_id': self.auction_id,
+            'sourceEpochMs': bid_data.get('sourceEpochMs'),
+            'receivedEpochMs': bid_data.get('receivedEpochMs')
+        }
+
+        # Emit WebSocket event for bid change notification
+        if self.socketio:
+            try:
+                # Emit the formatted message to display in web interface
+                self.socketio.emit('bid_change_notification', {
+                    'message': console_message + '\n' + lot_message,
+                    'type': 'bid_change',
+                    'timestamp': bid_data.get('timestamp', datetime.now().isoformat())
+                })
+            except Exception as e:
+                print(f"Failed to emit WebSocket event: {e}")
+
+        # Only the changed fields (bid, bidder, suggestion, lot) go out, tagged with the next version.
+        # The outbox stamps emitEpochMs when it actually sends the delta (see outbox.stamp_emit)
+        self._publish_state(latency=[latency])
+
+        self.latency.observe(latency, stages=('source_to_receipt',))
+
+
+async def copart_login(page, context):
+    """Log an existing context in with AuctionMonitor's login flow (saved session first) - used by ContextPool"""
+    monitor = AuctionMonitor(context=context)
+    monitor._load_env()
+    monitor.browser = context.browser
+    monitor.page = page
+    await monitor._login_to_copart()
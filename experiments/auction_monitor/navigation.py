@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Readiness-based navigation
+Copart and IAAI pages keep analytics, long-polls and sockets open, so `networkidle` rarely settles and the
+old flows paid its full timeout plus a fixed sleep on almost every page. Instead, goto_ready() waits for
+DOMContentLoaded and then for a per-page readiness predicate - the element or data the next step actually
+reads (login form, lot JSON, auction iframe...). It returns as soon as that holds.
+A predicate that never holds is logged and the flow carries on, as it did after a networkidle timeout.
+"""
+
+import json
+import time
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+READY_TIMEOUT = 30000
+
+
+class Ready:
+    """Page is ready when any of `selectors` is attached or the JS `function` returns truthy"""
+
+    def __init__(self, name, selectors=(), function=None):
+        self.name = name
+        self.selectors = tuple(selectors)
+        self.function = function
+
+    def expression(self, new_document=False):
+        checks = []
+        if self.selectors:
+            checks.append(f"!!document.querySelector({json.dumps(', '.join(self.selectors))})")
+        if self.function:
+            checks.append(f"!!({self.function})()")
+        condition = " || ".join(checks) or "true"
+        if new_document:
+            # click_ready marks the old document so its elements cannot satisfy the predicate
+            condition = f"!window.__navigationMarker && ({condition})"
+        return "() => " + condition
+
+
+# Copart
+COPART_LOGIN = Ready('copart login', ['input[name="username"]', 'button[data-uname="loginSigninmemberbutton"]'],
+                     # an existing session redirects away from the login page instead
+                     "() => !/login/i.test(location.pathname)")
+COPART_VEHICLE_FINDER = Ready('vehicle finder', ['input#input-search'])
+COPART_SEARCH_RESULTS = Ready('search results', ['.search_result_lot_number a', '.no-results', '#serverSideDataTable'])
+COPART_LOT = Ready('lot details', ['.lot-title', 'span[data-uname="lotdetailVinvalue"]'],
+                   "() => !!(window.appInit && window.appInit.cachedSolrLotDetailsStr)")
+COPART_LOT_BID_PANEL = Ready('lot bid panel', ['input#your-max-bid', 'input[name="maxBid"]', '.bid_amount_input',
+                                               '.dynamic-bid-inc', '.btn-yellow-norm'])
+COPART_WATCHLIST = Ready('watch list', ['.search_result_lot_number a', '.no-results', '.watchlist-empty',
+                                        '#serverSideDataTable'])
+COPART_TODAYS_AUCTIONS = Ready('todays auctions', ['a[href*="auctionDashboard"]', '.btn.btn-green.joinsearch.small',
+                                                   'a[href*="/lot/"]'])
+COPART_AUCTION = Ready('auction dashboard', ['iframe[src*="g2auction.copart.com"]'])
+
+# IAAI
+IAAI_CAPTCHA = ['iframe[src*="hcaptcha"]', 'iframe[src*="recaptcha"]', '[data-sitekey]', '.g-recaptcha']
+IAAI_LOGIN = Ready('iaai login', ['input[name="Input.Email"]'] + IAAI_CAPTCHA)
+IAAI_DASHBOARD = Ready('iaai dashboard', ['a[href*="gbplogout"]', 'input[name="Input.Email"]'] + IAAI_CAPTCHA,
+                       # an expired session redirects to login.iaai.com
+                       "() => location.hostname.startsWith('login.')")
+IAAI_LIVE_CALENDAR = Ready('iaai live auctions calendar',
+                           ['.auction-item', '.calendar-item', '.auction-card', '[data-auction-id]', '.auction-row']
+                           + IAAI_CAPTCHA)
+IAAI_SALE_LIST = Ready('iaai sale list', ['.join-auction', '[data-action="join-auction"]', '.btn-join', 'table',
+                                          '.table-row'])
+IAAI_LIVE_AUCTION = Ready('iaai live auction', ['iframe', 'canvas', '#liveAuction', '.live-auction'])
+
+
+async def wait_ready(page, ready, timeout=READY_TIMEOUT, new_document=False):
+    """Wait for `ready` on the current page; True when it held, False (logged) when it timed out"""
+    started = time.perf_counter()
+    try:
+        await page.wait_for_function(ready.expression(new_document), timeout=timeout)
+        print(f"⏱️ {ready.name} ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return True
+    except PlaywrightTimeoutError:
+        print(f"⚠️ {ready.name} not ready after {timeout / 1000:.0f}s, continuing ({page.url})")
+        return False
+
+
+async def goto_ready(page, url, ready, timeout=60000, ready_timeout=READY_TIMEOUT):
+    """page.goto up to DOMContentLoaded, then wait for the page's readiness predicate"""
+    await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+    return await wait_ready(page, ready, ready_timeout)
+
+
+async def click_ready(page, locator, ready, ready_timeout=READY_TIMEOUT):
+    """Click a link that loads a new page and wait for that page's readiness predicate"""
+    await page.evaluate("() => { window.__navigationMarker = true; }")
+    await locator.click()
+    return await wait_ready(page, ready, ready_timeout, new_document=True)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Per-client emit outbox
+Monitors call emit() as if it were socketio.emit, but nothing is sent from the monitor's thread:
+events land in one small queue per connected client and a flusher sends them every `window` seconds.
+Auction deltas queued for the same auction within a window are merged into one (latest values win),
+so a busy lane or a slow client never backs up into the Playwright callbacks.
+A delta's `latency` entries (one per bid change it carries) get their emitEpochMs when the flusher
+sends it, so the coalescing wait counts as receipt-to-emit time rather than emit-to-render time.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_WINDOW = float(os.getenv('AUCTION_EMIT_WINDOW_MS', '50')) / 1000
+STATE_EVENTS = ('auction_delta', 'auction_snapshot')
+
+
+def merge_deltas(older, newer):
+    """One delta equivalent to applying `older` then `newer`"""
+    changes = dict(older.get('changes', {}))
+    for key in newer.get('removed', []):
+        changes.pop(key, None)
+    changes.update(newer.get('changes', {}))
+    removed = {key for key in older.get('removed', []) if key not in newer.get('changes', {})}
+    removed.update(newer.get('removed', []))
+
+    merged = dict(newer, changes=changes, base_version=older['base_version'])
+    if removed:
+        merged['removed'] = sorted(removed)
+    else:
+        merged.pop('removed', None)
+    # Both bid changes were rendered by this one delta, so both are measured
+    latency = older.get('latency', []) + newer.get('latency', [])
+    if latency:
+        merged['latency'] = latency
+    return merged
+
+
+def stamp_emit(event, data):
+    """Copy of a delta with emitEpochMs set on its latency entries (the same delta is queued for every client)"""
+    if event != 'auction_delta' or not isinstance(data, dict) or not data.get('latency'):
+        return data
+    emitted = time.time() * 1000
+    return dict(data, latency=[dict(entry, emitEpochMs=emitted) for entry in data['latency']])
+
+
+def fold_delta_into_snapshot(snapshot, delta):
+    data = dict(snapshot['data'])
+    for key in delta.get('removed', []):
+        data.pop(key, None)
+    data.update(delta.get('changes', {}))
+    folded = dict(snapshot, data=data, version=delta['version'])
+    for key in ('is_monitoring', 'last_update'):
+        if key in delta:
+            folded[key] = delta[key]
+    return folded
+
+
+class ClientQueue:
+    """Pending events for one client; state events are keyed by auction so newer ones replace older ones"""
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self.pending = OrderedDict()
+        self._sequence = 0
+
+    def put(self, event, data, stats):
+        if event in STATE_EVENTS and isinstance(data, dict) and data.get('auction_id') is not None:
+            key = ('state', data['auction_id'])
+            queued = self.pending.get(key)
+            if queued is not None:
+                stats['coalesced'] += 1
+                queued_event, queued_data = queued
+                if event == 'auction_snapshot':
+                    pass  # a snapshot supersedes anything pending for the auction
+                elif queued_event == 'auction_snapshot':
+                    event, data = queued_event, fold_delta_into_snapshot(queued_data, data)
+                elif queued_data['version'] == data.get('base_version'):
+                    data = merge_deltas(queued_data, data)
+                # Out-of-order versions are sent as-is; the client resyncs from the gap
+                del self.pending[key]
+        else:
+            self._sequence += 1
+            key = ('event', self._sequence)
+
+        self.pending[key] = (event, data)
+
+        # Full: drop the oldest intermediate events, never the latest state of an auction
+        while len(self.pending) > self.max_pending:
+            oldest = next((k for k in self.pending if k[0] == 'event'), None)
+            if oldest is None:
+                break
+            del self.pending[oldest]
+            stats['dropped'] += 1
+
+    def drain(self):
+        items = list(self.pending.values())
+        self.pending.clear()
+        return items
+
+
+class EmitOutbox:
+    """Drop-in emit() target for monitors; call add_client/remove_client from the Socket.IO handlers"""
+
+    def __init__(self, window=DEFAULT_WINDOW, max_pending=100):
+        self.window = window
+        self.max_pending = max_pending
+        self.clients = {}
+        self.stats = {'queued': 0, 'coalesced': 0, 'dropped': 0, 'sent': 0, 'flushes': 0}
+        self.running = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def add_client(self, sid):
+        with self._lock:
+            self.clients.setdefault(sid, ClientQueue(self.max_pending))
+
+    def remove_client(self, sid):
+        with self._lock:
+            self.clients.pop(sid, None)
+
+    def emit(self, event, data=None, to=None, room=None, **kwargs):
+        """Queue an event for every client (or one sid); never blocks on the network"""
+        target = to or room
+        with self._lock:
+            queues = [self.clients[target]] if target in self.clients else (
+                [] if target else list(self.clients.values()))
+            for queue in queues:
+                queue.put(event, data, self.stats)
+                self.stats['queued'] += 1
+        if queues:
+            self._wake.set()
+
+    def drain(self):
+        """[(sid, [(event, data), ...])] for every client with pending events"""
+        with self._lock:
+            batches = [(sid, queue.drain()) for sid, queue in self.clients.items() if queue.pending]
+            self.stats['flushes'] += 1
+        return batches
+
+    def queue_depths(self):
+        with self._lock:
+            return {sid: len(queue.pending) for sid, queue in self.clients.items()}
+
+    def _send_batches(self, batches, send):
+        for sid, items in batches:
+            for event, data in items:
+                try:
+                    send(event, stamp_emit(event, data), sid)
+                    self.stats['sent'] += 1
+                except Exception as e:
+                    print(f"Failed to send {event} to client {sid}: {e}")
+
+    def run_forever(self, send, sleep):
+        """Flusher for threaded servers: send(event, data, sid); sleep is socketio.sleep"""
+        self.running = True
+        while self.running:
+            self._wake.wait(1)
+            if not self._wake.is_set():
+                continue
+            sleep(self.window)  # let updates for the same auction pile up, then send the merged result
+            self._wake.clear()
+            self._send_batches(self.drain(), send)
+
+    async def run_forever_async(self, send):
+        """Flusher for the async server: await send(event, data, sid)"""
+        self.running = True
+        while self.running:
+            await asyncio.sleep(self.window)
+            if not self._wake.is_set():
+                continue
+            self._wake.clear()
+            for sid, items in self.drain():
+                for event, data in items:
+                    try:
+                        await send(event, stamp_emit(event, data), sid)
+                        self.stats['sent'] += 1
+                    except Exception as e:
+                        print(f"Failed to send {event} to client {sid}: {e}")
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
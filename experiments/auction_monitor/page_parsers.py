@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Browserless page parsers
+Turns page HTML (saved fixtures or pages fetched without a browser) into records: IAAI My Vehicles
+rows, IAAI vehicle details, Copart lot details and the Copart watch list. Pages are parsed with lxml
+(in requirements.txt); without it they fall back to a tree built by the stdlib html.parser; both give
+ElementTree-style elements, so the extraction code is shared. parse_many() spreads a batch of pages
+over a process pool.
+AUCTION_PAGE_PARSER=stdlib uses html.parser even when lxml is installed.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from xml.etree.ElementTree import TreeBuilder
+from lot_details import parse_lot_html
+from ws_feed import parse_amount, format_amount
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError as e:
+    LXML_AVAILABLE = False
+    print(f"lxml not available, pages are parsed with the slower stdlib html.parser: {e}")
+    print("Install with: pip install lxml")
+
+USE_LXML = LXML_AVAILABLE and os.getenv('AUCTION_PAGE_PARSER', 'lxml') != 'stdlib'
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+             'source', 'track', 'wbr'}
+SKIPPED_TAGS = {'script', 'style', 'svg', 'noscript'}
+
+_SPACE = re.compile(r'\s+')
+_ITEM_ID = re.compile(r'/VehicleDetail/([^/?#"]+)')
+_ODOMETER = re.compile(r'^[\d,]+\s*(mi|km)\b', re.I)
+_STOCK = re.compile(r'Stock\s*#:?\s*(\d+)')
+
+
+class _TreeParser(HTMLParser):
+    """html.parser -> ElementTree elements, tolerant of the unclosed tags real pages are full of"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.builder = TreeBuilder()
+        self.open_tags = []
+        self.skipping = 0
+        self.builder.start('html', {})
+        self.open_tags.append('html')
+
+    def handle_starttag(self, tag, attrs):
+        if self.skipping:
+            if tag in SKIPPED_TAGS:
+                self.skipping += 1
+            return
+        if tag in SKIPPED_TAGS:
+            self.skipping = 1
+            return
+        self.builder.start(tag, {name: value or '' for name, value in attrs})
+        if tag in VOID_TAGS:
+            self.builder.end(tag)
+        else:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.skipping or tag in SKIPPED_TAGS:
+            return
+        self.builder.start(tag, {name: value or '' for name, value in attrs})
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        if self.skipping:
+            if tag in SKIPPED_TAGS:
+                self.skipping -= 1
+            return
+        if tag not in self.open_tags[1:]:
+            return  # stray end tag
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.builder.end(open_tag)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.builder.data(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.builder.end(self.open_tags.pop())
+        return self.builder.close()
+
+
+def parse_tree(page_html):
+    """Root element of `page_html` (lxml when available, else html.parser)"""
+    if USE_LXML:
+        return lxml.html.document_fromstring(page_html)
+    parser = _TreeParser()
+    parser.feed(page_html)
+    return parser.close()
+
+
+def classes(elem):
+    return (elem.get('class') or '').split()
+
+
+def is_hidden(elem):
+    return 'display:none' in (elem.get('style') or '').replace(' ', '')
+
+
+def walk(elem, skip_classes=()):
+    """Elements under `elem` in document order, leaving out subtrees with one of `skip_classes`"""
+    for child in elem:
+        if not isinstance(child.tag, str) or child.tag in SKIPPED_TAGS:
+            continue  # lxml comments and processing instructions, script/style bodies
+        if skip_classes and any(name in skip_classes for name in classes(child)):
+            continue
+        yield child
+        yield from walk(child, skip_classes)
+
+
+def text_of(elem, skip_hidden=False):
+    """Whitespace-normalised text of `elem` (None when empty)"""
+    parts = []
+
+    def collect(node):
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in SKIPPED_TAGS and not (skip_hidden and is_hidden(child)):
+                collect(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    collect(elem)
+    text = _SPACE.sub(' ', ''.join(parts)).strip()
+    return text or None
+
+
+def find_class(elem, name, skip_classes=()):
+    """First element under `elem` with class `name`"""
+    return next((node for node in walk(elem, skip_classes) if name in classes(node)), None)
+
+
+def data_list_pairs(elem, skip_classes=()):
+    """{label: value} of the `data-list__item` label/value pairs under `elem`; the first visible value wins"""
+    pairs = {}
+    for item in walk(elem, skip_classes):
+        if 'data-list__item' not in classes(item):
+            continue
+        label = value = None
+        for node in walk(item):
+            names = classes(node)
+            if label is None and 'data-list__label' in names:
+                label = text_of(node)
+            elif value is None and 'data-list__value' in names and not is_hidden(node):
+                value = text_of(node, skip_hidden=True)
+        if label:
+            label = label.rstrip(':').strip()
+            if label not in pairs or pairs[label] is None:
+                pairs[label] = value
+    return pairs
+
+
+@dataclass
+class MyVehicleRow:
+    """One vehicle on the IAAI My Vehicles page"""
+    item_id: Optional[str] = None
+    stock_number: Optional[str] = None
+    title: Optional[str] = None
+    vin: Optional[str] = None
+    odometer: Optional[str] = None
+    branch: Optional[str] = None
+    lane: Optional[str] = None
+    aisle: Optional[str] = None
+    seller: Optional[str] = None
+    seller_type: Optional[str] = None
+    damage: Optional[str] = None
+    auction_date: Optional[str] = None
+    time_left: Optional[str] = None
+    current_bid: Optional[float] = None
+    buy_now_price: Optional[float] = None
+    bidder: Optional[str] = None
+    watching: bool = False
+    badges: List[str] = field(default_factory=list)
+
+
+@dataclass
+class VehicleDetail:
+    """The IAAI vehicle detail page; `fields` holds every label/value pair outside the dialogs"""
+    item_id: Optional[str] = None
+    stock_number: Optional[str] = None
+    title: Optional[str] = None
+    vin: Optional[str] = None
+    selling_branch: Optional[str] = None
+    vehicle_location: Optional[str] = None
+    loss: Optional[str] = None
+    primary_damage: Optional[str] = None
+    secondary_damage: Optional[str] = None
+    title_doc: Optional[str] = None
+    start_code: Optional[str] = None
+    key: Optional[str] = None
+    odometer: Optional[str] = None
+    auction_date: Optional[str] = None
+    current_bid: Optional[float] = None
+    buy_now_price: Optional[float] = None
+    fields: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    def summary(self):
+        details = {key: value for key, value in asdict(self).items() if key != 'fields'}
+        for key in ('current_bid', 'buy_now_price'):
+            details[key] = format_amount(details[key])
+        return {key: 'N/A' if value is None else value for key, value in details.items()}
+
+
+def _titled(elem, prefix):
+    """Text of the first element under `elem` whose title attribute starts with `prefix`"""
+    for node in walk(elem, ('modal',)):
+        if (node.get('title') or '').startswith(prefix):
+            return text_of(node)
+    return None
+
+
+def _my_vehicle_row(row):
+    record = MyVehicleRow()
+    heading = find_class(row, 'table-cell--heading')
+    link = next((node for node in walk(heading) if node.tag == 'a'), None) if heading is not None else None
+    if link is not None:
+        record.title = text_of(link)
+        match = _ITEM_ID.search(link.get('href') or '')
+        record.item_id = match.group(1) if match else None
+
+    for node in walk(row, ('modal',)):
+        names = classes(node)
+        if node.tag == 'li' and 'data-list__item' in names:
+            text = text_of(node)
+            if not text:
+                continue
+            stock = _STOCK.match(text)
+            if stock and not record.stock_number:
+                record.stock_number = stock.group(1)
+            elif _ODOMETER.match(text) and not record.odometer:
+                record.odometer = text
+        elif node.tag == 'ul' and 'data-list-bidnow' in names:
+            first = next((item for item in walk(node) if item.tag == 'li'), None)
+            record.damage = text_of(first) if first is not None else None
+        elif 'timecountdown' in names:
+            record.time_left = text_of(node)
+        elif 'bid-name' in names:
+            record.bidder = text_of(node)
+        elif 'badge' in names:
+            record.badges.append(text_of(node))
+        elif 'btn-watch' in names:
+            record.watching = 'is-watching' in names
+        elif 'pre-bid__status' in names:
+            amount = next((item for item in walk(node) if 'mr-5' in classes(item)), None)
+            record.current_bid = parse_amount(text_of(amount)) if amount is not None else None
+        elif 'table-action__items' in names and record.auction_date is None:
+            date = next((child for child in node if child.tag == 'div'), None)
+            record.auction_date = text_of(date) if date is not None else None
+
+    record.vin = _titled(row, 'VIN')
+    record.branch = _titled(row, 'Branch:')
+    record.lane = _titled(row, 'Lane/Run#:')
+    record.aisle = _titled(row, 'Aisle/Stall:')
+    record.seller = _titled(row, 'Seller:')
+    record.seller_type = _titled(row, 'Seller Type:')
+    record.buy_now_price = parse_amount(data_list_pairs(row).get('Buy Now Price'))
+    return record
+
+
+def parse_my_vehicles(page_html):
+    """MyVehicleRow for every vehicle row of an IAAI My Vehicles page"""
+    root = parse_tree(page_html)
+    return [_my_vehicle_row(row) for row in walk(root)
+            if 'table-row' in classes(row) and 'table-row-border' in classes(row)]
+
+
+def parse_vehicle_detail(page_html):
+    """VehicleDetail of an IAAI vehicle detail page; None when the page has no vehicle information"""
+    root = parse_tree(page_html)
+    pairs = data_list_pairs(root, ('modal',))
+    if not pairs:
+        return None
+    heading = next((node for node in walk(root, ('modal',)) if node.tag == 'h1'), None)
+    canonical = next((node.get('href') for node in walk(root)
+                      if node.tag == 'link' and node.get('rel') == 'canonical'), None)
+    item_id = _ITEM_ID.search(canonical or '')
+    vin = pairs.get('VIN (Status)')
+    return VehicleDetail(
+        item_id=item_id.group(1) if item_id else None,
+        stock_number=pairs.get('Stock #'),
+        title=text_of(heading) if heading is not None else None,
+        vin=vin.split(' (')[0] if vin else None,
+        selling_branch=pairs.get('Selling Branch'),
+        vehicle_location=pairs.get('Vehicle Location'),
+        loss=pairs.get('Loss'),
+        primary_damage=pairs.get('Primary Damage'),
+        secondary_damage=pairs.get('Secondary Damage'),
+        title_doc=pairs.get('Title/Sale Doc'),
+        start_code=pairs.get('Start Code'),
+        key=pairs.get('Key'),
+        odometer=pairs.get('Odometer'),
+        auction_date=pairs.get('Auction Date and Time'),
+        current_bid=parse_amount(pairs.get('Current Bid')),
+        buy_now_price=parse_amount(pairs.get('Buy Now Price')),
+        fields=pairs,
+    )
+
+
+def parse_watchlist(page_html):
+    """Lot numbers listed on the Copart watch list page"""
+    root = parse_tree(page_html)
+    lots = []
+    for cell in walk(root):
+        if 'search_result_lot_number' in classes(cell):
+            for link in (node for node in walk(cell) if node.tag == 'a'):
+                text = text_of(link)
+                if text and text.isdigit():
+                    lots.append(text)
+    return lots
+
+
+PARSERS = {
+    'iaai_my_vehicles': parse_my_vehicles,
+    'iaai_vehicle_detail': parse_vehicle_detail,
+    'copart_lot': parse_lot_html,
+    'copart_watchlist': parse_watchlist,
+}
+
+
+def parse_page(kind, page_html):
+    """Record(s) of one page; `kind` is a PARSERS key"""
+    if kind not in PARSERS:
+        raise ValueError(f"Unknown page kind '{kind}', expected one of {', '.join(PARSERS)}")
+    return PARSERS[kind](page_html)
+
+
+def _parse_job(job):
+    kind, page_html = job
+    try:
+        return parse_page(kind, page_html)
+    except Exception as e:
+        print(f"⚠️ Could not parse {kind} page: {e}")
+        return None
+
+
+def parse_many(pages, workers=None):
+    """parse_page() over (kind, html) pairs, in order, in a process pool (workers=1 parses in this process)"""
+    started = time.perf_counter()
+    pages = list(pages)
+    if workers is not None and workers <= 1:
+        results = [_parse_job(job) for job in pages]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_job, pages, chunksize=max(1, len(pages) // (4 * (workers or 4)))))
+    print(f"📄 Parsed {len(pages)} pages in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return results
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded auction session through the monitor - no network or login needed
+Record a live session first with AUCTION_MONITOR_RECORD_DIR=recordings python app_simple.py
+
+Usage: python replay_session.py recordings/833-A_20250101_120000.jsonl [--speed 1.0] [--extract] [--repeat 5]
+Without --speed the session is replayed as fast as possible (throughput benchmark).
+With --extract every DOM snapshot is loaded into a local browser page and re-extracted; fields that
+differ from what the live monitor extracted are reported and the script exits with status 1.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from monitor_simple import AuctionMonitor
+from session_recording import SessionReplayer, load_recording
+
+AUCTION_URL = 'https://www.copart.com/auctionDashboard?auctionDetails=replay'
+FRAME_URL = 'https://g2auction.copart.com/g2/#/'
+
+
+def strip_scripts(html):
+    """Snapshots are static: drop scripts so the live app does not re-render them"""
+    return re.sub(r'<script\b[^>]*>.*?</script>', '', html, flags=re.IGNORECASE | re.DOTALL)
+
+
+def point_iframe_locally(page_html):
+    """Make sure the snapshot's auction iframe loads from the routed g2auction URL"""
+    page_html = re.sub(r'<iframe\b[^>]*g2auction[^>]*>', f'<iframe src="{FRAME_URL}" width="900" height="600">',
+                       page_html, flags=re.IGNORECASE)
+    if 'g2auction' not in page_html:
+        page_html += f'<iframe src="{FRAME_URL}" width="900" height="600"></iframe>'
+    return page_html
+
+
+async def replay_with_browser(replayer, monitor, headless=True):
+    from playwright.async_api import async_playwright
+
+    current = {'page': '', 'frame': ''}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        await context.route('**/*', lambda route: route.abort())
+        await context.route('https://www.copart.com/**',
+                            lambda route: route.fulfill(content_type='text/html', body=current['page']))
+        await context.route('https://g2auction.copart.com/**',
+                            lambda route: route.fulfill(content_type='text/html', body=current['frame']))
+        await monitor._attach_to_context(context)
+        monitor.auction_frame = monitor.page.frame_locator('iframe[src*="g2auction.copart.com"]')
+
+        async def load_snapshot(page_html, frame_html):
+            current['page'] = point_iframe_locally(strip_scripts(page_html))
+            current['frame'] = strip_scripts(frame_html)
+            await monitor.page.goto(AUCTION_URL, wait_until='load')
+
+        try:
+            return await replayer.replay(monitor, snapshot_loader=load_snapshot)
+        finally:
+            await browser.close()
+
+
+async def run(path, speed, extract, repeat, headless):
+    entries = load_recording(path)
+    meta = next((entry for entry in entries if entry.get('kind') == 'meta'), {})
+    print(f"Loaded {len(entries)} entries from {path} (recorded {meta.get('started_at', 'unknown')})")
+
+    failed = False
+    for run_number in range(1, repeat + 1):
+        monitor = AuctionMonitor()
+        replayer = SessionReplayer(entries, speed=speed)
+        if extract:
+            stats = await replay_with_browser(replayer, monitor, headless=headless)
+        else:
+            stats = await replayer.replay(monitor)
+
+        print(f"Run {run_number}: {json.dumps(stats.as_dict())}")
+        for mismatch in stats.mismatches[:20]:
+            print(f"   ❌ t={mismatch['t']}s {mismatch['field']}: recorded={mismatch['recorded']!r} "
+                  f"replayed={mismatch['replayed']!r}")
+        failed = failed or bool(stats.mismatches)
+        print(f"   Final state: {monitor.current_auction_data}")
+
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded auction session offline')
+    parser.add_argument('recording', help='Path to a .jsonl session recording')
+    parser.add_argument('--speed', type=float, default=None, help='Replay speed factor (1.0 = real time); default is max speed')
+    parser.add_argument('--extract', action='store_true', help='Re-run extraction on DOM snapshots in a local browser')
+    parser.add_argument('--repeat', type=int, default=1, help='Number of replays (for throughput benchmarks)')
+    parser.add_argument('--headed', action='store_true', help='Show the browser when using --extract')
+    args = parser.parse_args()
+
+    failed = asyncio.run(run(args.recording, args.speed, args.extract, args.repeat, not args.headed))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
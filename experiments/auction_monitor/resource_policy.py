@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Resource policy for monitored pages
+A context.route layer that aborts requests the monitor never needs - images, fonts, media and
+analytics/ad scripts (tag.js, dataLayer, pixels) - before they are fetched or executed.
+Rules are checked in order and the first match wins; anything unmatched is let through, and the
+g2auction.copart.com iframe is always allowed in full so live bidding keeps working.
+
+Note: Playwright disables the HTTP cache for routed contexts, so only enable this where the blocked
+bytes outweigh cache hits (long-lived auction tabs, not short scripted visits).
+
+The policy is opt-in: AUCTION_RESOURCE_POLICY is 'off' unless set to 'default' (DEFAULT_RULES)
+or a path to a JSON rules file, e.g.
+    [{"action": "allow", "domains": ["g2auction.copart.com"]},
+     {"action": "deny", "types": ["image", "font", "media"]}]
+"""
+
+import json
+import os
+from collections import Counter
+from urllib.parse import urlsplit
+
+ALWAYS_ALLOWED = ('g2auction.copart.com',)
+
+TRACKER_DOMAINS = (
+    'googletagmanager.com', 'google-analytics.com', 'googleadservices.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'facebook.com', 'mc.yandex.ru', 'optimizely.com',
+    'kampyle.com', 'evgnet.com', 'instana.io', 'smetrics.copart.com', 'bat.bing.com', 'clarity.ms',
+    'hotjar.com', 'snap.licdn.com', 'analytics.tiktok.com', 'nr-data.net', 'js-agent.newrelic.com',
+    'adnxs.com', 'criteo.com', 'quantserve.com', 'demdex.net', 'omtrdc.net'
+)
+
+# Captcha challenges are images served from these; blocking them would make a login challenge unsolvable
+CAPTCHA_DOMAINS = ('hcaptcha.com', 'recaptcha.net', 'google.com', 'gstatic.com')
+
+DEFAULT_RULES = [
+    {'action': 'allow', 'domains': list(ALWAYS_ALLOWED)},
+    {'action': 'deny', 'domains': list(TRACKER_DOMAINS)},
+    {'action': 'allow', 'domains': list(CAPTCHA_DOMAINS)},
+    {'action': 'deny', 'types': ['image', 'media', 'font']},
+]
+
+
+def domain_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+
+class ResourcePolicy:
+    """Ordered allow/deny rules keyed on Playwright resource type and request domain"""
+
+    def __init__(self, rules=None, name='default'):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.name = name
+        self.allowed = Counter()  # resource type -> requests let through
+        self.blocked = Counter()  # resource type -> requests aborted
+
+    @classmethod
+    def from_env(cls):
+        """Policy named by AUCTION_RESOURCE_POLICY, or None when it is 'off' (the default)"""
+        setting = os.getenv('AUCTION_RESOURCE_POLICY') or 'off'
+        if setting == 'off':
+            return None
+        if setting == 'default':
+            return cls()
+        try:
+            with open(setting, 'r') as f:
+                return cls(json.load(f), name=os.path.basename(setting))
+        except Exception as e:
+            print(f"⚠️ Could not load resource policy {setting}, using the default rules: {e}")
+            return cls()
+
+    def decide(self, url, resource_type):
+        """'allow' or 'deny' for one request"""
+        host = (urlsplit(url).hostname or '').lower()
+        if any(domain_matches(host, domain) for domain in ALWAYS_ALLOWED):
+            return 'allow'
+        for rule in self.rules:
+            domains = rule.get('domains')
+            types = rule.get('types')
+            if domains and not any(domain_matches(host, domain) for domain in domains):
+                continue
+            if types and resource_type not in types:
+                continue
+            return rule['action']
+        return 'allow'
+
+    async def _handle(self, route):
+        request = route.request
+        if self.decide(request.url, request.resource_type) == 'deny':
+            self.blocked[request.resource_type] += 1
+            await route.abort('blockedbyclient')
+        else:
+            self.allowed[request.resource_type] += 1
+            await route.fallback()  # later-registered or page-level routes still see the request
+
+    async def apply(self, context):
+        """Install the policy on a browser context (covers every page and iframe in it)"""
+        await context.route('**/*', self._handle)
+        print(f"🛡️ Resource policy '{self.name}' active")
+        return self
+
+    def stats(self):
+        return {'name': self.name, 'allowed': dict(self.allowed), 'blocked': dict(self.blocked)}
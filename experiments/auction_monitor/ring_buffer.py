@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Fixed-capacity, time-indexed ring buffer
+Keeps the most recent N items with monotonic timestamps so a long-running monitor
+never grows without bound, and "items in the last N seconds" is a binary search.
+"""
+
+import time
+
+
+class TimedRingBuffer:
+    """Ring buffer of (monotonic timestamp, item); the oldest entries are overwritten when full"""
+
+    def __init__(self, capacity=5000, clock=time.monotonic):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.clock = clock
+        self._timestamps = [0.0] * capacity
+        self._items = [None] * capacity
+        self._start = 0   # physical index of the oldest entry
+        self._size = 0
+        self.total_appended = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        """Iterate items from oldest to newest"""
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.capacity]
+
+    def append(self, item, timestamp=None):
+        """Add an item; timestamps must not go backwards (later ones are clamped to the newest)"""
+        if timestamp is None:
+            timestamp = self.clock()
+        if self._size and timestamp < self._timestamp_at(self._size - 1):
+            timestamp = self._timestamp_at(self._size - 1)
+
+        if self._size < self.capacity:
+            index = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            # Full: overwrite the oldest entry
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._timestamps[index] = timestamp
+        self._items[index] = item
+        self.total_appended += 1
+
+    def _timestamp_at(self, logical_index):
+        return self._timestamps[(self._start + logical_index) % self.capacity]
+
+    def _first_index_at_or_after(self, timestamp):
+        """Binary search over the logical (oldest -> newest) order"""
+        low, high = 0, self._size
+        while low < high:
+            mid = (low + high) // 2
+            if self._timestamp_at(mid) < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def count_since(self, seconds, now=None):
+        """Number of items appended in the last `seconds` - O(log n)"""
+        now = self.clock() if now is None else now
+        return self._size - self._first_index_at_or_after(now - seconds)
+
+    def since(self, seconds, now=None):
+        """Items appended in the last `seconds`, oldest first - O(log n + k)"""
+        now = self.clock() if now is None else now
+        first = self._first_index_at_or_after(now - seconds)
+        return [self._items[(self._start + i) % self.capacity] for i in range(first, self._size)]
+
+    def latest(self, count=1):
+        """The newest `count` items, oldest first"""
+        count = min(count, self._size)
+        return [self._items[(self._start + i) % self.capacity] for i in range(self._size - count, self._size)]
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
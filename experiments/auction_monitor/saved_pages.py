@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Saved page fixtures
+The pages saved in experiments/ (copart_place_bid.html, iaai_MyVehiclesNew.html, ...) are mostly
+Chrome view-source captures: the original markup is HTML-escaped inside one table cell per source
+line. page_source() returns the original HTML either way, for benchmarks and offline parsing.
+"""
+
+import html
+import os
+import re
+
+SAVED_PAGES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE_CELL = re.compile(r'<td class="line-content">(.*?)</td>', re.S)
+_TAG = re.compile(r'<[^>]+>')
+
+
+def is_view_source(text):
+    return 'class="line-gutter-backdrop"' in text[:2000] and 'class="line-content"' in text
+
+
+def recover_source(text):
+    """Original HTML of a view-source capture (unchanged when `text` is not one)"""
+    if not is_view_source(text):
+        return text
+    return '\n'.join(html.unescape(_TAG.sub('', line)) for line in _LINE_CELL.findall(text))
+
+
+def page_source(name):
+    """Original HTML of a saved page in experiments/ (name or absolute path)"""
+    path = name if os.path.isabs(name) else os.path.join(SAVED_PAGES_DIR, name)
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return recover_source(f.read())
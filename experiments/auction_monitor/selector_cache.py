@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Adaptive selector resolution
+Most lookups walk an ordered fallback list (bid input, bid button, current bid, timer...) and
+the same entry wins nearly every time, yet every miss before it still costs a round trip.
+SelectorCache remembers, per page type and selector group, which candidate matched last and
+tries it first; the remaining candidates follow in hit-count order, so when the cached selector
+stops matching (site redesign, different auction state) the full list is still walked and the
+new winner takes its place. A winner is only promoted when every candidate ranked above it in the
+original list was tried and missed, and catch-alls (a bare tag or a lone substring match such as
+[class*="timer"]) are never promoted: they keep their place in the list so a specific selector
+that appears later is still tried before them.
+Hit statistics are persisted to AUCTION_SELECTOR_STATS so a fresh process starts warm.
+"""
+
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from selector_race import race_selectors
+
+SELECTOR_STATS_FILE = os.getenv('AUCTION_SELECTOR_STATS', 'selector_stats.json')
+SAVE_INTERVAL = float(os.getenv('AUCTION_SELECTOR_STATS_SAVE_SECONDS', '30'))
+
+# 'h1', '[data-uname*="bid"]', 'button[aria-label*="Increase bid"]'...
+_CATCH_ALL = re.compile(r'^[a-z][a-z0-9]*$|^[a-z0-9]*\[[\w-]+[*^$~|]=\s*["\'][^"\']*["\'](\s+i)?\]$', re.I)
+
+
+def is_catch_all(selector):
+    """True for selectors that match almost anything on the page and so must not be promoted"""
+    return bool(_CATCH_ALL.match(selector.strip()))
+
+
+def promotable(candidates, missed, selector):
+    """A winner may become preferred when it is specific and every candidate above it was tried and missed"""
+    if selector not in candidates or is_catch_all(selector):
+        return False
+    missed = set(missed)
+    return all(candidate in missed for candidate in candidates[:candidates.index(selector)])
+
+
+async def visible(locator):
+    """Default check: the locator itself when its first match is attached and visible"""
+    if await locator.count() > 0 and await locator.is_visible():
+        return locator
+    return None
+
+
+async def visible_text(locator):
+    """Check: stripped text of a visible element ('' when hidden or empty)"""
+    if await locator.is_visible():
+        return (await locator.text_content() or '').strip()
+    return ''
+
+
+class SelectorCache:
+    """Per page type / selector group memory of the winning fallback selector"""
+
+    def __init__(self, path=SELECTOR_STATS_FILE, save_interval=SAVE_INTERVAL):
+        self.path = path
+        self.save_interval = save_interval
+        self.groups = self._load()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('page_types', {})
+        except Exception as e:
+            print(f"⚠️ Could not read selector stats {self.path}, starting cold: {e}")
+            return {}
+
+    def _entry(self, page_type, group):
+        return self.groups.setdefault(page_type, {}).setdefault(group, {
+            'preferred': None, 'hits': {}, 'lookups': 0, 'first_try': 0, 'fallbacks': 0, 'not_found': 0
+        })
+
+    def _preferred(self, page_type, group):
+        preferred = self.groups.get(page_type, {}).get(group, {}).get('preferred')
+        # Stats saved before catch-alls were excluded may still name one
+        return None if preferred is None or is_catch_all(preferred) else preferred
+
+    def order(self, page_type, group, candidates):
+        """Candidates with the cached winner first, then by hit count (ties keep the original order);
+        catch-alls stay where they are in the original list"""
+        candidates = list(candidates)
+        entry = self.groups.get(page_type, {}).get(group)
+        if not entry:
+            return candidates
+        hits = entry['hits']
+        slots = [index for index, selector in enumerate(candidates) if not is_catch_all(selector)]
+        ranked = sorted((candidates[index] for index in slots), key=lambda selector: -hits.get(selector, 0))
+        preferred = self._preferred(page_type, group)
+        if preferred in ranked:
+            ranked.remove(preferred)
+            ranked.insert(0, preferred)
+        for index, selector in zip(slots, ranked):
+            candidates[index] = selector
+        return candidates
+
+    def record(self, page_type, group, selector, promote=True):
+        """Note the outcome of one lookup; `selector` is the winner or None when nothing matched.
+        promote=False counts the lookup without letting the winner move up (see promotable())"""
+        with self._lock:
+            entry = self._entry(page_type, group)
+            entry['lookups'] += 1
+            if selector is None:
+                entry['not_found'] += 1  # keep the old winner - the element may simply be absent right now
+            elif selector == entry['preferred'] and not is_catch_all(selector):
+                entry['first_try'] += 1
+                entry['hits'][selector] = entry['hits'].get(selector, 0) + 1
+            else:
+                if entry['preferred'] not in (None, selector):
+                    entry['fallbacks'] += 1
+                if promote and not is_catch_all(selector):
+                    if entry['preferred'] is not None:
+                        print(f"🔁 Selector cache {page_type}/{group}: '{entry['preferred']}' stopped matching, now '{selector}'")
+                    entry['preferred'] = selector
+                    entry['hits'][selector] = entry['hits'].get(selector, 0) + 1
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= self.save_interval
+        if due:
+            self.flush()
+
+    async def resolve(self, scope, page_type, group, candidates, check=visible):
+        """First candidate whose `check(locator)` is truthy -> (selector, value), or (None, None)
+
+        `scope` is a Page, Frame or FrameLocator; `check` gets `scope.locator(selector).first`
+        and returns whatever the caller needs (the locator, its text, a parsed amount...).
+        """
+        candidates = list(candidates)
+        missed = []
+        for selector in self.order(page_type, group, candidates):
+            try:
+                value = await check(scope.locator(selector).first)
+            except Exception:
+                value = None
+            if value:
+                self.record(page_type, group, selector, promotable(candidates, missed, selector))
+                return selector, value
+            missed.append(selector)
+        self.record(page_type, group, None)
+        return None, None
+
+    async def race(self, scope, page_type, group, candidates, timeout=2000):
+        """Like resolve() for elements that may still be rendering: the cached winner if it is visible
+        right now, otherwise every candidate is awaited at once (selector_race) -> (selector, locator).
+        Candidates ranked above the winner were checked and absent when it was picked, so they count as missed"""
+        candidates = list(candidates)
+        ordered = self.order(page_type, group, candidates)
+        preferred = self._preferred(page_type, group)
+        if preferred in ordered:
+            try:
+                locator = await visible(scope.locator(preferred).first)
+            except Exception:
+                locator = None
+            if locator:
+                self.record(page_type, group, preferred)
+                return preferred, locator
+        selector, locator = await race_selectors(scope, ordered, timeout)
+        missed = ordered[:ordered.index(selector)] if selector in ordered else []
+        self.record(page_type, group, selector, promotable(candidates, missed, selector))
+        return selector, locator
+
+    def order_plan(self, page_type, plan):
+        """Copy of an extraction plan with each field's rules in cached order"""
+        fields = {}
+        for field, rules in plan.get('fields', {}).items():
+            by_css = {rule['css']: rule for rule in rules}
+            fields[field] = [by_css[css] for css in self.order(page_type, field, list(by_css))]
+        return dict(plan, fields=fields)
+
+    def record_plan(self, page_type, plan, ordered_plan, result):
+        """Record every field of a batched extraction result (see extraction_plan.py); `plan` is the
+        original plan and `ordered_plan` the order_plan() copy that was evaluated"""
+        matched = (result or {}).get('matched', {})
+        for field, rules in plan.get('fields', {}).items():
+            selector = matched.get(field)
+            tried = [rule['css'] for rule in ordered_plan.get('fields', {}).get(field, [])]
+            # The plan walks each field's rules in order, so everything before the match missed
+            missed = tried[:tried.index(selector)] if selector in tried else []
+            self.record(page_type, field, selector, promotable([rule['css'] for rule in rules], missed, selector))
+
+    def stats(self):
+        """{page_type: {group: counters}} with the current winner per group"""
+        with self._lock:
+            return {page_type: {group: {key: value for key, value in entry.items() if key != 'hits'}
+                                for group, entry in groups.items()}
+                    for page_type, groups in self.groups.items()}
+
+    def flush(self):
+        """Write the hit statistics now (atomic replace, last writer wins across processes)"""
+        if not self._dirty or not self.path:
+            return
+        with self._lock:
+            payload = json.dumps({'version': 1, 'saved_at': time.time(), 'page_types': self.groups},
+                                 indent=2, sort_keys=True)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.selector_stats.', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except Exception as e:
+            print(f"⚠️ Could not save selector stats to {self.path}: {e}")
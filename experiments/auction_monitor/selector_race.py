@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Concurrent selector racing
+Fallback lists used to be probed one candidate at a time, each with its own 2-5 s wait, so a
+missing element cost the sum of every timeout (12 bid-button selectors, times every sub-frame).
+race() starts a wait_for() on every candidate at once and returns the first that reaches the
+wanted state, cancelling the rest - the worst case is a single timeout. Which wait_for() finishes
+first is down to timing, so once one does, the candidates listed before it are checked right away
+and the highest-priority one already present wins: a catch-all cannot beat a specific selector
+that is on the page too.
+"""
+
+import asyncio
+import time
+
+
+async def _present(locator, state):
+    """Instant (no waiting) check that `locator` is in `state` already"""
+    try:
+        if state == 'visible':
+            return await locator.is_visible()
+        if state == 'attached':
+            return await locator.count() > 0
+    except Exception:
+        pass
+    return False
+
+
+async def race(candidates, timeout=2000, state='visible'):
+    """Wait on every (key, locator) at once -> (key, locator) of the first to reach `state`, or (None, None)
+
+    A candidate that fails (timeout, invalid selector, detached frame) just drops out of the race.
+    List order expresses preference: when one finishes, the earlier candidates that are already in
+    `state` are preferred over it.
+    """
+    candidates = list(candidates)
+    if not candidates:
+        return None, None
+    tasks = [asyncio.ensure_future(locator.wait_for(state=state, timeout=timeout)) for _, locator in candidates]
+    pending = set(tasks)
+    started = time.perf_counter()
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winners = [index for index, task in enumerate(tasks)
+                       if task in done and not task.cancelled() and task.exception() is None]
+            if winners:
+                first = winners[0]
+                if first > 0 and state in ('visible', 'attached'):
+                    present = await asyncio.gather(*(_present(locator, state) for _, locator in candidates[:first]))
+                    first = next((index for index, ok in enumerate(present) if ok), first)
+                key, locator = candidates[first]
+                print(f"🏁 {key} won the selector race in {(time.perf_counter() - started) * 1000:.0f} ms "
+                      f"({len(candidates)} candidates)")
+                return key, locator
+        return None, None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def race_selectors(scope, selectors, timeout=2000, state='visible'):
+    """race() over the first match of each selector in one Page, Frame or FrameLocator -> (selector, locator)"""
+    return await race(((selector, scope.locator(selector).first) for selector in selectors), timeout, state)
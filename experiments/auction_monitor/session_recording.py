@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Auction session recording and replay
+The recorder writes a live session to JSON Lines: g2auction WebSocket frames, MutationObserver
+bid events and periodic DOM snapshots (with what the monitor extracted from them).
+The replayer feeds a recording back into an AuctionMonitor offline, in real time or as fast as possible.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+RECORDING_VERSION = 1
+
+
+def recording_path(auction_url, directory):
+    """recordings/<auction>_<YYYYmmdd_HHMMSS>.jsonl"""
+    auction = auction_url.split('auctionDetails=')[1].split('&')[0] if 'auctionDetails=' in auction_url else 'session'
+    auction = re.sub(r'[^A-Za-z0-9_-]+', '_', auction)
+    return os.path.join(directory, f"{auction}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+
+
+class SessionRecorder:
+    """Appends timestamped session entries to a JSON Lines file"""
+
+    def __init__(self, path, auction_url=None):
+        self.path = path
+        self.started = time.monotonic()
+        self.entries = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write('meta', {'version': RECORDING_VERSION, 'auction_url': auction_url,
+                             'started_at': datetime.now().isoformat()})
+        print(f"🎙️ Recording auction session to {path}")
+
+    def _write(self, kind, entry):
+        if self._file.closed:
+            return
+        entry = dict(entry, kind=kind, t=round(time.monotonic() - self.started, 4))
+        self._file.write(json.dumps(entry, default=str) + '\n')
+        self.entries += 1
+
+    def record_ws_frame(self, url, payload):
+        if isinstance(payload, bytes):
+            self._write('ws_frame', {'url': url, 'payload_b64': base64.b64encode(payload).decode('ascii')})
+        else:
+            self._write('ws_frame', {'url': url, 'payload': payload})
+
+    def record_observer_event(self, bid_data):
+        self._write('observer', {'bid_data': bid_data})
+
+    def record_dom_snapshot(self, page_html, frame_html, extracted=None):
+        self._write('dom_snapshot', {'page_html': page_html, 'frame_html': frame_html, 'extracted': extracted})
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            print(f"🎙️ Recording saved: {self.path} ({self.entries} entries)")
+
+
+def load_recording(path):
+    """Read a recording into a list of entries ordered by time"""
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    entries.sort(key=lambda entry: entry.get('t', 0))
+    return entries
+
+
+class ReplayStats:
+    """Counters and timings collected while replaying a recording"""
+
+    def __init__(self):
+        self.entries = {}
+        self.bid_changes_applied = 0
+        self.extraction_ms = []
+        self.mismatches = []
+        self.elapsed = 0.0
+
+    def as_dict(self):
+        events = sum(count for kind, count in self.entries.items() if kind in ('ws_frame', 'observer'))
+        return {
+            'entries': self.entries,
+            'bid_changes_applied': self.bid_changes_applied,
+            'elapsed_s': round(self.elapsed, 3),
+            'events_per_s': round(events / self.elapsed, 1) if self.elapsed else None,
+            'extractions': len(self.extraction_ms),
+            'extraction_ms_mean': round(sum(self.extraction_ms) / len(self.extraction_ms), 2) if self.extraction_ms else None,
+            'extraction_mismatches': len(self.mismatches)
+        }
+
+
+class SessionReplayer:
+    """Feeds a recording into a monitor's event pipeline, optionally re-running extraction on DOM snapshots"""
+
+    COMPARED_FIELDS = ('current_bid', 'current_bidder', 'lot_number', 'lot_title', 'status')
+
+    def __init__(self, entries, speed=None):
+        self.entries = entries
+        self.speed = speed  # None = as fast as possible, 1.0 = original timing
+
+    async def replay(self, monitor, snapshot_loader=None):
+        """Replay into `monitor`; snapshot_loader(page_html, frame_html) prepares a browser page for extraction"""
+        from ws_feed import WebSocketTap
+
+        stats = ReplayStats()
+        if monitor.ws_tap is None:
+            # No live page: the tap is only used through handle_frame()
+            monitor.ws_tap = WebSocketTap(monitor._handle_ws_event, on_frame=monitor._record_ws_frame)
+
+        apply_bid_change = monitor._apply_bid_change
+
+        def counting_apply(bid_data):
+            before = monitor._last_applied_bid
+            apply_bid_change(bid_data)
+            if monitor._last_applied_bid is not before:
+                stats.bid_changes_applied += 1
+
+        monitor._apply_bid_change = counting_apply
+        started = time.monotonic()
+        try:
+            for entry in self.entries:
+                kind = entry.get('kind')
+                stats.entries[kind] = stats.entries.get(kind, 0) + 1
+
+                if self.speed:
+                    delay = entry.get('t', 0) / self.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if kind == 'ws_frame':
+                    payload = entry.get('payload')
+                    if 'payload_b64' in entry:
+                        payload = base64.b64decode(entry['payload_b64'])
+                    monitor.ws_tap.handle_frame(entry.get('url', ''), payload)
+                elif kind == 'observer':
+                    # Straight to _apply_bid_change, without the recorded stage timestamps, which would
+                    # skew the latency histograms
+                    bid_data = dict(entry.get('bid_data') or {})
+                    for key in ('sourceEpochMs', 'receivedEpochMs'):
+                        bid_data.pop(key, None)
+                    monitor._apply_bid_change(bid_data)
+                elif kind == 'dom_snapshot' and snapshot_loader:
+                    await snapshot_loader(entry.get('page_html') or '', entry.get('frame_html') or '')
+                    extraction_started = time.perf_counter()
+                    data = await monitor._extract_auction_data()
+                    stats.extraction_ms.append((time.perf_counter() - extraction_started) * 1000)
+                    self._compare(entry.get('extracted'), data, entry.get('t'), stats)
+        finally:
+            del monitor._apply_bid_change  # back to the class method
+            stats.elapsed = time.monotonic() - started
+        return stats
+
+    def _compare(self, recorded, replayed, t, stats):
+        if not recorded:
+            return
+        for field in self.COMPARED_FIELDS:
+            if recorded.get(field) != replayed.get(field):
+                stats.mismatches.append({'t': t, 'field': field,
+                                         'recorded': recorded.get(field), 'replayed': replayed.get(field)})
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Shared Copart session store
+One copart_session.json for the monitor, copart_bid.py and auction_bid_button_finder.py. Alongside the cookies
+it records when the session was last verified and when its auth cookies expire, so a session verified
+recently is reused without the /dashboard verification page load. Reads and writes take a file lock and
+writes are atomic, so several processes can share the file.
+Older files holding a bare cookie list are still read (treated as never verified).
+"""
+
+import json
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False  # Windows: no cross-process lock, writes are still atomic
+
+SESSION_FILE = os.getenv('COPART_SESSION_FILE', 'copart_session.json')
+FRESH_SECONDS = float(os.getenv('COPART_SESSION_FRESH_SECONDS', '1200'))
+VERIFY_URL = 'https://www.copart.com/dashboard'
+AUTH_COOKIE_HINTS = ('session', 'auth', 'token', 'login')
+
+
+def is_auth_cookie(cookie):
+    return any(hint in cookie.get('name', '').lower() for hint in AUTH_COOKIE_HINTS)
+
+
+def cookies_expire_at(cookies):
+    """Earliest expiry (epoch seconds) of the persistent auth cookies, or None if none carry one"""
+    expiries = [cookie['expires'] for cookie in cookies if is_auth_cookie(cookie) and cookie.get('expires', -1) > 0]
+    return min(expiries) if expiries else None
+
+
+async def session_is_live(context):
+    """Cheap server-side check: fetch the member dashboard with the context's cookies, no page navigation"""
+    try:
+        response = await context.request.get(VERIFY_URL, timeout=15000)
+        return response.ok and 'login' not in response.url.lower()
+    except Exception as e:
+        print(f"⚠️ Session liveness check failed: {e}")
+        return False
+
+
+class _FileLock:
+    """flock on a sidecar .lock file (shared for reads, exclusive for writes)"""
+
+    def __init__(self, path, exclusive):
+        self.path = path + '.lock'
+        self.exclusive = exclusive
+        self._file = None
+
+    def __enter__(self):
+        if FCNTL_AVAILABLE:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class SessionStore:
+    """Cookies plus saved_at / verified_at / expires_at for the shared Copart session"""
+
+    def __init__(self, path=SESSION_FILE, fresh_seconds=FRESH_SECONDS):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+
+    def load(self):
+        """The stored session dict, or None if there is none or it cannot be read"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with _FileLock(self.path, exclusive=False):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+        except Exception as e:
+            print(f'Failed to read session file {self.path}: {e}')
+            return None
+        if isinstance(data, list):  # legacy format: just the cookie list
+            data = {'cookies': data, 'saved_at': None, 'verified_at': None}
+        data.setdefault('expires_at', cookies_expire_at(data.get('cookies', [])))
+        return data
+
+    def _write(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.copart_session.', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save(self, cookies, verified=True):
+        """Store cookies from a freshly logged-in (or just verified) context"""
+        now = time.time()
+        data = {
+            'saved_at': now,
+            'verified_at': now if verified else None,
+            'expires_at': cookies_expire_at(cookies),
+            'cookies': cookies
+        }
+        try:
+            with _FileLock(self.path, exclusive=True):
+                self._write(data)
+            print('Session cookies saved')
+        except Exception as e:
+            print(f'Failed to save session cookies: {e}')
+
+    def mark_verified(self):
+        """Record a successful verification without rewriting the cookies another process may have refreshed"""
+        try:
+            with _FileLock(self.path, exclusive=True):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    data = {'saved_at': None, 'expires_at': cookies_expire_at(data), 'cookies': data}
+                data['verified_at'] = time.time()
+                self._write(data)
+        except Exception as e:
+            print(f'Failed to update session verification time: {e}')
+
+    def is_fresh(self, data, now=None):
+        """Verified within fresh_seconds and no auth cookie has expired since"""
+        if not data or not data.get('verified_at'):
+            return False
+        now = now or time.time()
+        if data.get('expires_at') and data['expires_at'] <= now:
+            return False
+        return now - data['verified_at'] < self.fresh_seconds
+
+    async def restore(self, context):
+        """Add the stored, unexpired cookies to `context`; returns 'fresh', 'stale' or None (nothing stored)"""
+        data = self.load()
+        if not data or not data.get('cookies'):
+            return None
+        now = time.time()
+        cookies = [cookie for cookie in data['cookies'] if not (0 < cookie.get('expires', -1) <= now)]
+        if not cookies:
+            return None
+        try:
+            await context.add_cookies(cookies)
+        except Exception as e:
+            print(f'Failed to load session cookies: {e}')
+            return None
+        print('Session cookies loaded')
+        return 'fresh' if self.is_fresh(data, now) else 'stale'
+
+    async def resume(self, context):
+        """Restore the session and confirm it without a page load; True when the context is logged in"""
+        state = await self.restore(context)
+        if state == 'fresh':
+            print('Saved session verified recently - skipping verification')
+            return True
+        if state == 'stale':
+            if await session_is_live(context):
+                print('Saved session is still valid')
+                self.mark_verified()
+                return True
+            print('Saved session expired, proceeding with fresh login')
+        return False
+
+    async def save_context(self, context):
+        try:
+            self.save(await context.cookies())
+        except Exception as e:
+            print(f'Failed to save session cookies: {e}')
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events and long-poll support for the dashboard fallback
+Both are driven by the versioned auction state: a request waits until a published version moves
+past what the client has, then gets only the missing deltas (or a snapshot when those are gone).
+Idle dashboards cost one open connection instead of a request every two seconds.
+"""
+
+import asyncio
+import json
+import threading
+from auction_state import add_publish_listener
+
+KEEPALIVE_SECONDS = 15
+LONG_POLL_SECONDS = 25
+
+
+class StateWaiter:
+    """Wakes blocked request threads (Flask threading mode) whenever any auction publishes"""
+
+    def __init__(self):
+        self.generation = 0
+        self._condition = threading.Condition()
+        add_publish_listener(self._on_publish)
+
+    def _on_publish(self, state, delta):
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """Block until the generation moves past `generation` or timeout; returns the current generation"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class AsyncStateWaiter:
+    """Same as StateWaiter for the async server, where publishes happen on the shared loop"""
+
+    def __init__(self):
+        self.generation = 0
+        self._event = asyncio.Event()
+        add_publish_listener(self._on_publish)
+
+    def _on_publish(self, state, delta):
+        self.generation += 1
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self, generation, timeout):
+        if self.generation == generation:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.generation
+
+
+def catch_up(monitor, version):
+    """[(event, payload)] that bring a client at `version` up to date; empty when it already is"""
+    if version is not None and monitor.state.version == version:
+        return []
+    deltas = monitor.state.deltas_since(version) if version is not None else None
+    if not deltas:
+        return [('auction_snapshot', monitor.get_state_snapshot())]
+    return [('auction_delta', dict(delta, is_monitoring=monitor.is_monitoring, last_update=monitor.last_update))
+            for delta in deltas]
+
+
+def sent_version(updates, version):
+    """Version a client reaches by applying `updates` (catch_up output); `version` when there are none.
+    Read from the payloads, not the live state, which may already have moved past what was sent"""
+    for _, payload in reversed(updates):
+        if payload.get('version') is not None:
+            return payload['version']
+    return version
+
+
+def etag_for(monitor, version=None):
+    version = monitor.state.version if version is None else version
+    return f'"{monitor.state.auction_id}-{version}"'
+
+
+def version_from_request(version_arg, if_none_match, monitor):
+    """Client version from ?version= or an If-None-Match ETag for this auction"""
+    if version_arg not in (None, ''):
+        try:
+            return int(version_arg)
+        except ValueError:
+            return None
+    if if_none_match:
+        tag = if_none_match.strip()
+        tag = (tag[2:] if tag.startswith('W/') else tag).strip('"')
+        prefix = f"{monitor.state.auction_id}-"
+        if tag.startswith(prefix) and tag[len(prefix):].isdigit():
+            return int(tag[len(prefix):])
+    return None
+
+
+def format_sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def sse_updates(versions, monitors):
+    """SSE chunks for every monitor whose version moved past versions[key] (updates `versions`)"""
+    chunks = []
+    for key, monitor in monitors:
+        updates = catch_up(monitor, versions.get(key))
+        for event, payload in updates:
+            chunks.append(format_sse(event, payload))
+        versions[key] = sent_version(updates, versions.get(key))
+    return chunks
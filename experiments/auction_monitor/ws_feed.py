@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+g2auction WebSocket feed
+Taps the auction iframe's WebSocket frames and decodes them into typed events.
+Frames arrive before the SVG bid display re-renders, so this is the monitor's primary bid source once
+its values have agreed with the page (see AuctionMonitor._verify_ws_feed).
+Only frames with a validated shape become bid events: an explicit numeric lot number and a plain
+numeric amount. Anything looser is counted as ignored rather than guessed at.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+G2AUCTION_HOST = 'g2auction.copart.com'
+
+# The g2auction payload schema is not documented; these alias lists (matched case-insensitively)
+# are the place to extend when a recorded session shows new field names.
+FIELD_ALIASES = {
+    'lot_number': ['lotNumber', 'lotNo', 'lot', 'lotId', 'LOTNO', 'LOT_NUMBER'],
+    'amount': ['currentBid', 'bidAmount', 'bid', 'amount', 'highBid', 'BIDAMOUNT', 'CURRENTBID'],
+    'bidder': ['currentBidder', 'bidder', 'highBidder', 'bidderName', 'BIDDER'],
+    'status': ['status', 'lotStatus', 'state', 'STATUS'],
+    'type': ['type', 'event', 'eventType', 'messageType', 'msgType', 'TYPE'],
+    'sold_price': ['soldPrice', 'salePrice', 'finalBid', 'SOLDPRICE'],
+}
+SOLD_MARKERS = ('sold', 'sale_complete', 'lotsold', 'hammer')
+
+_LOT_NUMBER = re.compile(r'^\d{5,}$')
+_STRICT_AMOUNT = re.compile(r'^\$?\s*\d[\d,]*(\.\d+)?$')
+
+
+@dataclass
+class AuctionFeedEvent:
+    """Base class for decoded feed events"""
+    lot_number: Optional[str] = None
+    received_at: float = field(default_factory=time.monotonic)
+    raw: Any = None
+
+
+@dataclass
+class BidEvent(AuctionFeedEvent):
+    amount: float = 0.0
+    bidder: Optional[str] = None
+
+
+@dataclass
+class BidderEvent(AuctionFeedEvent):
+    bidder: Optional[str] = None
+
+
+@dataclass
+class LotChangeEvent(AuctionFeedEvent):
+    previous_lot_number: Optional[str] = None
+
+
+@dataclass
+class SoldEvent(AuctionFeedEvent):
+    amount: Optional[float] = None
+    bidder: Optional[str] = None
+
+
+def format_amount(amount):
+    """Format a numeric amount the way the auction SVG shows it, e.g. 1250 -> '$1,250'"""
+    if amount is None:
+        return 'N/A'
+    if float(amount).is_integer():
+        return f"${int(amount):,}"
+    return f"${amount:,.2f}"
+
+
+def parse_amount(value):
+    """Parse 1250, '1250', '$1,250.00' -> 1250.0; None when not a number"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = re.search(r'[0-9][0-9,]*\.?\d*', str(value))
+    if not match:
+        return None
+    try:
+        return float(match.group(0).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def strict_amount(value):
+    """A number, or a string that is only an amount ('1250', '$1,250.00'); None for anything else"""
+    if isinstance(value, str) and not _STRICT_AMOUNT.match(value.strip()):
+        return None
+    return parse_amount(value)
+
+
+def lot_number_of(value):
+    """Lot numbers are all digits (Copart uses 8); None for ids, names or nested values"""
+    if value is None or isinstance(value, (bool, dict, list)):
+        return None
+    text = str(value).strip()
+    return text if _LOT_NUMBER.match(text) else None
+
+
+class G2AuctionFrameDecoder:
+    """Turns raw WebSocket frames into BidEvent / BidderEvent / LotChangeEvent / SoldEvent"""
+
+    def __init__(self):
+        self.current_lot = None
+        self.current_bidder = None
+        self.frames_decoded = 0
+        self.frames_ignored = 0
+        self._aliases = {name: [alias.lower() for alias in aliases] for name, aliases in FIELD_ALIASES.items()}
+
+    def decode(self, payload) -> List[AuctionFeedEvent]:
+        """Decode one frame payload (str or bytes) into zero or more events"""
+        messages = self._unwrap(payload)
+        if not messages:
+            self.frames_ignored += 1
+            return []
+
+        events = []
+        for message in messages:
+            events.extend(self._classify(message))
+        if events:
+            self.frames_decoded += 1
+        else:
+            self.frames_ignored += 1
+        return events
+
+    def _unwrap(self, payload):
+        """Strip transport envelopes (Socket.IO, STOMP) and return a list of JSON objects"""
+        if isinstance(payload, bytes):
+            try:
+                payload = payload.decode('utf-8')
+            except UnicodeDecodeError:
+                return []
+        if not payload:
+            return []
+
+        text = payload.strip()
+        if text.startswith('MESSAGE'):
+            # STOMP: headers, blank line, body, NUL terminator
+            text = text.split('\n\n', 1)[-1].rstrip('\x00').strip()
+        else:
+            # Engine.IO / Socket.IO packet type prefix, e.g. '42["bid", {...}]'
+            text = re.sub(r'^\d+(?=[\[{])', '', text)
+
+        try:
+            decoded = json.loads(text)
+        except ValueError:
+            return []
+        return self._flatten(decoded)
+
+    def _flatten(self, decoded):
+        if isinstance(decoded, dict):
+            # Common wrappers: {"data": {...}} / {"payload": {...}}
+            for wrapper in ('data', 'payload', 'body', 'message'):
+                inner = decoded.get(wrapper)
+                if isinstance(inner, str):
+                    try:
+                        inner = json.loads(inner)
+                    except ValueError:
+                        inner = None
+                if isinstance(inner, (dict, list)):
+                    flattened = self._flatten(inner)
+                    if decoded.get('type') or decoded.get('event'):
+                        for item in flattened:
+                            item.setdefault('type', decoded.get('type') or decoded.get('event'))
+                    return flattened
+            return [decoded]
+        if isinstance(decoded, list):
+            if len(decoded) == 2 and isinstance(decoded[0], str) and isinstance(decoded[1], (dict, list)):
+                # Socket.IO event: ["eventName", payload]
+                items = self._flatten(decoded[1])
+                for item in items:
+                    item.setdefault('type', decoded[0])
+                return items
+            items = []
+            for entry in decoded:
+                items.extend(self._flatten(entry))
+            return items
+        return []
+
+    def _get(self, message, name):
+        lowered = {str(key).lower(): value for key, value in message.items()}
+        for alias in self._aliases[name]:
+            if alias in lowered and lowered[alias] not in (None, ''):
+                return lowered[alias]
+        return None
+
+    def _classify(self, message):
+        events = []
+        lot = lot_number_of(self._get(message, 'lot_number'))
+        amount = strict_amount(self._get(message, 'amount'))
+        bidder = self._get(message, 'bidder')
+        bidder = str(bidder) if bidder is not None and not isinstance(bidder, (dict, list)) else None
+        kind = ' '.join(str(self._get(message, name) or '') for name in ('type', 'status')).lower()
+        sold_price = strict_amount(self._get(message, 'sold_price'))
+        if not lot:
+            # Without its own lot number a message cannot be tied to the lot being monitored
+            return events
+
+        if lot != self.current_lot:
+            events.append(LotChangeEvent(lot_number=lot, previous_lot_number=self.current_lot, raw=message))
+            self.current_lot = lot
+            self.current_bidder = None
+
+        compact_kind = kind.replace(' ', '')
+        is_sold = any(marker in compact_kind for marker in SOLD_MARKERS) and 'unsold' not in compact_kind
+        if sold_price is not None or is_sold:
+            events.append(SoldEvent(lot_number=lot, amount=sold_price if sold_price is not None else amount,
+                                    bidder=bidder or self.current_bidder, raw=message))
+        elif amount is not None:
+            events.append(BidEvent(lot_number=lot, amount=amount, bidder=bidder, raw=message))
+            if bidder:
+                self.current_bidder = bidder
+        elif bidder and bidder != self.current_bidder:
+            events.append(BidderEvent(lot_number=lot, bidder=bidder, raw=message))
+            self.current_bidder = bidder
+
+        return events
+
+
+class WebSocketTap:
+    """Registers page.on('websocket') and decodes framereceived payloads from g2auction sockets"""
+
+    def __init__(self, on_event, on_frame=None, host=G2AUCTION_HOST):
+        self.on_event = on_event      # called with each decoded AuctionFeedEvent
+        self.on_frame = on_frame      # optional raw hook: (url, payload)
+        self.host = host
+        self.decoder = G2AuctionFrameDecoder()
+        self.sockets = []
+        self.frames_received = 0
+
+    def attach(self, page):
+        """Must be called before navigation so the iframe's socket is seen when it opens"""
+        page.on('websocket', self._on_websocket)
+
+    def _on_websocket(self, websocket):
+        if self.host not in websocket.url:
+            return
+        print(f'🔌 Auction WebSocket opened: {websocket.url}')
+        self.sockets.append(websocket)
+        websocket.on('framereceived', lambda payload: self.handle_frame(websocket.url, payload))
+        websocket.on('close', lambda ws: self._on_close(websocket))
+
+    def _on_close(self, websocket):
+        print(f'🔌 Auction WebSocket closed: {websocket.url}')
+        if websocket in self.sockets:
+            self.sockets.remove(websocket)
+
+    def handle_frame(self, url, payload):
+        """Decode one frame and dispatch its events (also used to replay recorded frames)"""
+        self.frames_received += 1
+        if self.on_frame:
+            self.on_frame(url, payload)
+        for event in self.decoder.decode(payload):
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f'WebSocket event handler failed: {e}')
@@ -2,20 +2,31 @@
 """
 Copart Bid Script
 This script automates bidding on a Copart lot by:
-1. Taking a lot number as parameter
+1. Taking one or more lot numbers as parameters (one warm, logged-in browser context is reused)
 2. Navigating to the lot page
-3. Finding current bid and bid increment
-4. Calculating and placing a bid (current + increment)
+3. Finding current bid (increment from the local schedule, cross-checked against the page)
+4. Calculating and placing a bid (current + increment); --armed places it in one in-page action
 5. Staying on the page
 """
 
 import argparse
 import asyncio
-import json
 import os
 import random
 import re
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import sys
+import time
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auction_monitor'))
+from context_pool import ContextPool
+from session_store import SessionStore
+from navigation import goto_ready, COPART_LOGIN, COPART_LOT_BID_PANEL
+from selector_cache import SelectorCache
+from selector_race import race_selectors
+from armed_bid import ArmedBid
+from bid_increments import IncrementSchedule
+from lot_details import read_lot_details
 
 def load_env():
     """Load environment variables from .env file"""
@@ -28,6 +39,38 @@ def load_env():
                     os.environ[key.strip()] = value.strip()
 
 load_env()
+session_store = SessionStore()
+selector_cache = SelectorCache()  # remembers which lot-page selectors matched, across runs
+increment_schedule = IncrementSchedule.from_env()
+
+# Bid controls on the lot page, in order of preference
+BID_INPUT_SELECTORS = [
+    'input#your-max-bid',
+    'input[name="maxBid"]',
+    '.bid_amount_input',
+    'input[name="bidAmount"]',
+    'input#bidAmount',
+    'input.bid-input',
+    'input[data-uname*="bid"]',
+    '.bid-input input',
+    'input[placeholder*="bid"]',
+    'input[placeholder*="Bid"]'
+]
+
+BID_BUTTON_SELECTORS = [
+    'button:contains("Increase bid")',
+    '.btn-yellow-norm',
+    'button[ng-click*="openIncreaseBidModal"]',
+    'button[aria-label="Bid now"]',
+    'button:contains("Place Bid")',
+    'button:contains("Bid Now")',
+    'button:contains("Bid now")',
+    'button.bid-btn',
+    'button[data-uname*="placeBid"]',
+    '.place-bid-btn',
+    '.bid-button',
+    'button:contains("Submit Bid")'
+]
 
 async def login_to_copart(page, context):
     """Login to Copart using credentials from environment variables"""
@@ -40,8 +83,7 @@ async def login_to_copart(page, context):
     print("Logging in to Copart...")
 
     # Navigate to login page
-    await page.goto("https://www.copart.com/login", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
+    await goto_ready(page, "https://www.copart.com/login", COPART_LOGIN)
 
     # Handle cookie consent if present
     try:
@@ -106,13 +148,7 @@ async def login_to_copart(page, context):
     print("Login successful!")
 
     # Save session cookies for future use
-    try:
-        cookies = await context.cookies()
-        with open('copart_session.json', 'w') as f:
-            json.dump(cookies, f, indent=2)
-        print('Session cookies saved')
-    except Exception as e:
-        print(f'Failed to save session cookies: {e}')
+    await session_store.save_context(context)
 
 def extract_amount(text):
     """Extract numeric amount from text (e.g., '$1,250.00' or '($50.00 Bid increment)' -> 1250.00)"""
@@ -136,19 +172,28 @@ def extract_amount(text):
     except ValueError:
         return 0.0
 
-async def place_bid_on_lot(page, lot_number):
-    """Navigate to lot page and place a bid"""
+async def read_amount(elem):
+    """Selector check: the dollar amount shown by a visible element (0.0 when none)"""
+    if await elem.is_visible():
+        return extract_amount(await elem.text_content())
+    return 0.0
+
+async def place_bid_on_lot(page, lot_number, armed=False):
+    """Navigate to lot page and place a bid (armed: pre-resolve the controls and fire in one in-page call)"""
     lot_url = f"https://www.copart.com/lot/{lot_number}"
     print(f"Navigating to lot: {lot_url}")
 
-    await page.goto(lot_url, timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
+    # Ready once the bid panel has rendered - no fixed wait for dynamic content
+    await goto_ready(page, lot_url, COPART_LOT_BID_PANEL)
 
-    # Wait a bit for dynamic content
-    await asyncio.sleep(3)
+    armed_bid = None
+    if armed:
+        # Resolve the input and bid button before reading prices, so placing the bid is a single action
+        armed_bid = ArmedBid(page, BID_INPUT_SELECTORS, BID_BUTTON_SELECTORS, cache=selector_cache)
+        if not await armed_bid.arm():
+            return False
 
-    # Find current bid
-    current_bid = 0.0
+    # Current bid from the embedded lot record; otherwise the selectors (each lookup tries last time's winner first)
     current_bid_selectors = [
         '.current-bid-amount',
         '.current-bid',
@@ -160,23 +205,21 @@ async def place_bid_on_lot(page, lot_number):
         '.lot-current-bid'
     ]
 
-    for selector in current_bid_selectors:
-        try:
-            elem = page.locator(selector).first
-            if await elem.is_visible(timeout=2000):
-                text = await elem.text_content()
-                current_bid = extract_amount(text)
-                if current_bid > 0:
-                    print(f"Found current bid: ${current_bid:.2f}")
-                    break
-        except:
-            continue
-
-    if current_bid == 0:
-        print("Warning: Could not find current bid amount")
-
-    # Find bid increment
-    bid_increment = 0.0
+    lot = await read_lot_details(page)
+    if lot and lot.current_bid is not None:
+        current_bid = lot.current_bid
+        print(f"Found current bid: ${current_bid:.2f} (lot {lot.source})")
+    else:
+        selector, current_bid = await selector_cache.resolve(page, 'copart_lot', 'current_bid', current_bid_selectors,
+                                                             read_amount)
+        if selector:
+            print(f"Found current bid: ${current_bid:.2f}")
+        else:
+            current_bid = 0.0
+            print("Warning: Could not find current bid amount")
+
+    # Bid increment comes from the local schedule; a visible increment on the page (checked instantly,
+    # no waiting) only cross-checks it
     increment_selectors = [
         '.dynamic-bid-inc',
         '.bid-increment',
@@ -186,56 +229,27 @@ async def place_bid_on_lot(page, lot_number):
         '.increment-amount'
     ]
 
-    for selector in increment_selectors:
-        try:
-            elem = page.locator(selector).first
-            if await elem.is_visible(timeout=2000):
-                text = await elem.text_content()
-                print(f"Found element with selector '{selector}': '{text}'")
-                bid_increment = extract_amount(text)
-                print(f"Extracted bid increment: ${bid_increment:.2f}")
-                if bid_increment > 0:
-                    print(f"Using bid increment: ${bid_increment:.2f}")
-                    break
-        except Exception as e:
-            print(f"Error with selector '{selector}': {e}")
-            continue
-
-    if bid_increment == 0:
-        print("Warning: Could not find bid increment on the page")
-        print("Cannot proceed with bidding without knowing the increment amount")
-        return False
+    selector, page_increment = await selector_cache.resolve(page, 'copart_lot', 'bid_increment', increment_selectors,
+                                                            read_amount)
+    bid_increment = increment_schedule.check(current_bid, page_increment)
+    source = f"page, selector '{selector}'" if selector else f"schedule '{increment_schedule.name}'"
+    print(f"Using bid increment: ${bid_increment:.2f} ({source})")
 
     # Calculate new bid (round to whole dollars)
     new_bid = round(current_bid + bid_increment)
     print(f"Calculated new bid: ${new_bid}")
 
-    # Find bid input field
-    bid_input_selectors = [
-        'input#your-max-bid',
-        'input[name="maxBid"]',
-        '.bid_amount_input',
-        'input[name="bidAmount"]',
-        'input#bidAmount',
-        'input.bid-input',
-        'input[data-uname*="bid"]',
-        '.bid-input input',
-        'input[placeholder*="bid"]',
-        'input[placeholder*="Bid"]'
-    ]
+    if armed_bid:
+        result = await armed_bid.fire(new_bid)
+        await armed_bid.disarm()
+        print("Staying on the lot page...")
+        return result.get('confirmClickedMs') is not None
 
-    bid_input = None
-    for selector in bid_input_selectors:
-        try:
-            input_elem = page.locator(selector).first
-            if await input_elem.is_visible(timeout=2000):
-                bid_input = input_elem
-                print(f"Found bid input with selector: {selector}")
-                break
-        except:
-            continue
-
-    if not bid_input:
+    # Find bid input field
+    selector, bid_input = await selector_cache.race(page, 'copart_lot', 'bid_input', BID_INPUT_SELECTORS)
+    if bid_input:
+        print(f"Found bid input with selector: {selector}")
+    else:
         print("Error: Could not find bid input field")
         return False
 
@@ -247,33 +261,10 @@ async def place_bid_on_lot(page, lot_number):
     print(f"Entered bid amount: ${int(new_bid)}")
 
     # Find and click bid button
-    bid_button_selectors = [
-        'button:contains("Increase bid")',
-        '.btn-yellow-norm',
-        'button[ng-click*="openIncreaseBidModal"]',
-        'button[aria-label="Bid now"]',
-        'button:contains("Place Bid")',
-        'button:contains("Bid Now")',
-        'button:contains("Bid now")',
-        'button.bid-btn',
-        'button[data-uname*="placeBid"]',
-        '.place-bid-btn',
-        '.bid-button',
-        'button:contains("Submit Bid")'
-    ]
-
-    bid_button = None
-    for selector in bid_button_selectors:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=2000):
-                bid_button = btn
-                print(f"Found bid button with selector: {selector}")
-                break
-        except:
-            continue
-
-    if not bid_button:
+    selector, bid_button = await selector_cache.race(page, 'copart_lot', 'bid_button', BID_BUTTON_SELECTORS)
+    if bid_button:
+        print(f"Found bid button with selector: {selector}")
+    else:
         print("Error: Could not find bid button")
         return False
 
@@ -281,38 +272,24 @@ async def place_bid_on_lot(page, lot_number):
     await bid_button.click()
     print("Clicked bid button")
 
-    # Wait for confirmation dialog to appear
-    await asyncio.sleep(2)
-
-    # Look for confirm bid button
+    # Wait for the confirm button of the confirmation dialog (all candidates at once, up to 5s)
     confirm_button_selectors = [
         'button:contains("Confirm your bid")',
         'button[ng-click*="increaseBidForLot"]',
-        '.btn-yellow-norm',
+        '.modal .btn-yellow-norm',  # scoped: the bid button itself is also .btn-yellow-norm and would win the race
         'button.btn:contains("Confirm")'
     ]
 
-    confirm_button = None
-    for selector in confirm_button_selectors:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=5000):
-                confirm_button = btn
-                print(f"Found confirm button with selector: {selector}")
-                break
-        except:
-            continue
-
+    selector, confirm_button = await selector_cache.race(page, 'copart_lot', 'confirm_button',
+                                                         confirm_button_selectors, timeout=5000)
     if confirm_button:
+        print(f"Found confirm button with selector: {selector}")
         await confirm_button.click()
         print("Clicked confirm bid button")
     else:
         print("Warning: Could not find confirm bid button")
 
-    # Wait a bit for bid submission
-    await asyncio.sleep(2)
-
-    # Check for success/error messages
+    # Check for success/error messages (the race waits for the submission to land)
     try:
         success_selectors = [
             '.bid-success',
@@ -320,14 +297,9 @@ async def place_bid_on_lot(page, lot_number):
             ':contains("Bid placed successfully")',
             ':contains("Bid submitted")'
         ]
-        for selector in success_selectors:
-            try:
-                success_elem = page.locator(selector).first
-                if await success_elem.is_visible(timeout=3000):
-                    print("Bid placed successfully!")
-                    break
-            except:
-                continue
+        selector, _ = await race_selectors(page, success_selectors, timeout=3000)
+        if selector:
+            print("Bid placed successfully!")
     except:
         pass
 
@@ -335,90 +307,45 @@ async def place_bid_on_lot(page, lot_number):
     print("Staying on the lot page...")
     return True
 
+async def ensure_session(page, context):
+    """Pool login: reuse the shared saved session while it is valid, otherwise log in"""
+    if await session_store.resume(context):
+        return
+    await login_to_copart(page, context)
+
 async def main():
-    parser = argparse.ArgumentParser(description='Place a bid on a Copart lot')
-    parser.add_argument('lot_number', help='The lot number to bid on')
+    parser = argparse.ArgumentParser(description='Place a bid on one or more Copart lots')
+    parser.add_argument('lot_numbers', nargs='+', help='The lot number(s) to bid on')
+    parser.add_argument('--armed', action='store_true',
+                        help='Pre-resolve the bid controls and place the bid in one in-page action')
     args = parser.parse_args()
 
-    print(f"Starting bid on lot: {args.lot_number}")
+    os.environ.setdefault('DISPLAY', ':99')
+    # Browser launch and login happen once; every lot after the first starts on a warm, logged-in page
+    pool = ContextPool(ensure_session, size=1)
 
-    async with async_playwright() as p:
-        os.environ.setdefault('DISPLAY', ':99')
-        browser = await p.chromium.launch(headless=False)
+    try:
+        for lot_number in args.lot_numbers:
+            print(f"Starting bid on lot: {lot_number}")
+            started = time.perf_counter()
+            async with pool.lease() as leased:
+                print(f"Logged-in page ready in {time.perf_counter() - started:.2f}s")
+
+                # Place bid
+                success = await place_bid_on_lot(leased.page, lot_number, armed=args.armed)
+                if success:
+                    print("Bid process completed successfully!")
+                else:
+                    print("Bid process failed")
+                    leased.needs_check = True
 
-        context = await browser.new_context()
-        page = await context.new_page()
+                # Keep browser open for 30 seconds to stay on page
+                await asyncio.sleep(30)
 
-        # Try to load saved session first
-        session_loaded = False
-        try:
-            if os.path.exists('copart_session.json'):
-                with open('copart_session.json', 'r') as f:
-                    cookies = json.load(f)
-                await context.add_cookies(cookies)
-                print('Session cookies loaded')
-                session_loaded = True
-        except Exception as e:
-            print(f'Failed to load session cookies: {e}')
-
-        try:
-            # Check if already logged in by trying to access a protected page
-            already_logged_in = False
-            if session_loaded:
-                print("Checking if session is still valid...")
-                # Try to access the lot page directly - if session is valid, we should stay on the lot page
-                # If session is invalid, we'll be redirected to login
-                test_url = f"https://www.copart.com/lot/{args.lot_number}"
-                await page.goto(test_url, timeout=60000)
-                await page.wait_for_load_state('networkidle', timeout=60000)
-                await asyncio.sleep(2)
-
-                current_url = page.url
-                # Check if we were redirected to login page
-                if "login" in current_url.lower() or "signin" in current_url.lower():
-                    print("Session expired - redirected to login page")
-                    already_logged_in = False
-                else:
-                    # Check for bid-related elements to confirm we're on a lot page
-                    bid_selectors = [
-                        'input#your-max-bid',
-                        'input[name="maxBid"]',
-                        '.bid_amount_input',
-                        'button:contains("Increase bid")',
-                        '.btn-yellow-norm'
-                    ]
-
-                    for selector in bid_selectors:
-                        try:
-                            elem = page.locator(selector).first
-                            if await elem.is_visible(timeout=2000):
-                                print("Session is valid - found bidding elements on lot page")
-                                already_logged_in = True
-                                break
-                        except:
-                            continue
-
-                    if not already_logged_in:
-                        print("Session may be expired - no bidding elements found")
-
-            # Login only if not already logged in
-            if not already_logged_in:
-                await login_to_copart(page, context)
-
-            # Place bid
-            success = await place_bid_on_lot(page, args.lot_number)
-            if success:
-                print("Bid process completed successfully!")
-            else:
-                print("Bid process failed")
-
-            # Keep browser open for 30 seconds to stay on page
-            await asyncio.sleep(30)
-
-        except Exception as e:
-            print(f"Error during bidding: {e}")
-        finally:
-            await browser.close()
+    except Exception as e:
+        print(f"Error during bidding: {e}")
+    finally:
+        await pool.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -10,6 +10,10 @@ import asyncio
 import json
 import random
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auction_monitor'))
+from navigation import goto_ready, COPART_LOGIN, COPART_WATCHLIST
 
 def load_env():
     """Load environment variables from .env file"""
@@ -50,9 +54,7 @@ async def main():
             for attempt in range(max_retries):
                 try:
                     print(f"Navigating to Copart login page (attempt {attempt + 1}/{max_retries})...")
-                    await page.goto("https://www.copart.com/login", timeout=60000)  # 2 minutes
-                    print("Waiting for page to load...")
-                    await page.wait_for_load_state('networkidle', timeout=60000)
+                    await goto_ready(page, "https://www.copart.com/login", COPART_LOGIN)
                     break  # Success, exit retry loop
                 except Exception as e:
                     if attempt == max_retries - 1:
@@ -285,8 +287,7 @@ async def main():
                 print("Login successful!")
 
                 # Navigate to My Wishlist
-                await page.goto("https://www.copart.com/watchList")
-                await page.wait_for_load_state('networkidle')
+                await goto_ready(page, "https://www.copart.com/watchList", COPART_WATCHLIST)
                 print(f"Wishlist page title: {await page.title()}")
                 print(f"Wishlist URL: {page.url}")
 
@@ -12,6 +12,17 @@ import asyncio
 import json
 import random
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auction_monitor'))
+from navigation import (Ready, goto_ready, wait_ready, click_ready, COPART_LOGIN, COPART_VEHICLE_FINDER,
+                        COPART_SEARCH_RESULTS, COPART_LOT, COPART_TODAYS_AUCTIONS, COPART_AUCTION)
+from selector_race import race_selectors
+from lot_details import read_lot_details
+from http_client import HTTPX_AVAILABLE, SessionHttpClient, fetch_watchlist
+
+# The first link on today's auctions is either an auction dashboard or a lot page
+OPENED_AUCTION = Ready('opened auction', COPART_AUCTION.selectors + COPART_LOT.selectors, COPART_LOT.function)
 
 def load_env():
     """Load environment variables from .env file"""
@@ -36,8 +47,7 @@ async def login_to_copart(page):
     print("Logging in to Copart...")
 
     # Navigate to login page
-    await page.goto("https://www.copart.com/login", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
+    await goto_ready(page, "https://www.copart.com/login", COPART_LOGIN)
 
     # Handle cookie consent if present
     try:
@@ -106,8 +116,7 @@ async def search_vehicle(page, query):
     print(f"Searching for: {query}")
 
     # Navigate to vehicle finder
-    await page.goto("https://www.copart.com/vehicleFinder", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
+    await goto_ready(page, "https://www.copart.com/vehicleFinder", COPART_VEHICLE_FINDER)
 
     # Fill search input
     search_input = page.locator('input#input-search').first
@@ -117,7 +126,7 @@ async def search_vehicle(page, query):
     # Click search button
     search_btn = page.locator('button.search-btn').first
     await search_btn.click()
-    await asyncio.sleep(3)  # Wait for results
+    await wait_ready(page, COPART_SEARCH_RESULTS)  # Wait for results
 
     print("Search completed")
 
@@ -136,32 +145,15 @@ async def open_lot_details(page, lot_url):
     if not lot_url.startswith('http'):
         lot_url = f"https://www.copart.com{lot_url}"
     print(f"Opening lot details: {lot_url}")
-    await page.goto(lot_url, timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
-
-    # Extract lot details - adjust selectors as needed
-    details = {}
-
-    try:
-        # Lot title
-        title_elem = page.locator('.lot-title, .vehicle-title, h1').first
-        details['title'] = await title_elem.text_content() if await title_elem.is_visible() else 'N/A'
-    except:
-        details['title'] = 'N/A'
+    await goto_ready(page, lot_url, COPART_LOT)
 
+    # Extract lot details from the embedded lot record (DOM selectors when it is missing)
     try:
-        # Lot number
-        lot_num_elem = page.locator('.lot-number, .lot-num, #LotNumber, span[data-uname="lotdetailVinvalue"]').first
-        details['lot_number'] = await lot_num_elem.text_content() if await lot_num_elem.is_visible() else 'N/A'
-    except:
-        details['lot_number'] = 'N/A'
-
-    try:
-        # Current bid
-        bid_elem = page.locator('.current-bid, .bid-amount, .bid-price').first
-        details['current_bid'] = await bid_elem.text_content() if await bid_elem.is_visible() else 'N/A'
-    except:
-        details['current_bid'] = 'N/A'
+        lot = await read_lot_details(page)
+        details = lot.summary() if lot else {'title': 'N/A', 'lot_number': 'N/A', 'current_bid': 'N/A'}
+    except Exception as e:
+        print(f"Error reading lot details: {e}")
+        details = {'title': 'N/A', 'lot_number': 'N/A', 'current_bid': 'N/A'}
 
     print("Lot Details:")
     for key, value in details.items():
@@ -189,16 +181,12 @@ async def add_to_watchlist(page):
         'button[aria-label="Add to watchlist"]'
     ]
 
-    for selector in add_btn_selectors:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=2000):
-                await btn.click()
-                await asyncio.sleep(2)
-                print("Added to watch list")
-                return True
-        except:
-            continue
+    selector, btn = await race_selectors(page, add_btn_selectors, timeout=2000)
+    if btn:
+        await btn.click()
+        await asyncio.sleep(2)
+        print("Added to watch list")
+        return True
 
     print("Could not find add to watch list button")
     return False
@@ -207,18 +195,13 @@ async def check_watchlist_presence(page, lot_number):
     """Check if lot is present in watch list"""
     print("Checking watch list presence...")
 
-    # Navigate to watch list
-    await page.goto("https://www.copart.com/watchList", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
-
-    # Get all lot numbers from watch list
-    lot_links = page.locator('.search_result_lot_number a')
-    watchlist_lots = []
-    for i in range(await lot_links.count()):
-        text = await lot_links.nth(i).text_content()
-        lot_num = text.strip()
-        if lot_num.isdigit():
-            watchlist_lots.append(lot_num)
+    # Read the watch list over HTTP with the browser's cookies (the browser loads it if that fails)
+    client = await SessionHttpClient.from_context(page.context) if HTTPX_AVAILABLE else None
+    try:
+        watchlist_lots = await fetch_watchlist(client, page)
+    finally:
+        if client:
+            await client.aclose()
 
     print(f"Watch list lots: {watchlist_lots}")
 
@@ -233,8 +216,7 @@ async def remove_from_watchlist(page, lot_url):
     if not lot_url.startswith('http'):
         lot_url = f"https://www.copart.com{lot_url}"
 
-    await page.goto(lot_url, timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
+    await goto_ready(page, lot_url, COPART_LOT)
 
     # Look for remove button on lot detail page
     remove_btn_selectors = [
@@ -247,16 +229,12 @@ async def remove_from_watchlist(page, lot_url):
         'button[desktoptext="Remove"]'
     ]
 
-    for selector in remove_btn_selectors:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=2000):
-                await btn.click()
-                await asyncio.sleep(2)
-                print("Removed from watch list")
-                return True
-        except:
-            continue
+    selector, btn = await race_selectors(page, remove_btn_selectors, timeout=2000)
+    if btn:
+        await btn.click()
+        await asyncio.sleep(2)
+        print("Removed from watch list")
+        return True
 
     print("Could not find remove button")
     return False
@@ -265,11 +243,8 @@ async def navigate_to_todays_auctions_and_open_first(page):
     """Navigate to today's auctions page and open the first auction"""
     print("Navigating to today's auctions...")
 
-    await page.goto("https://www.copart.com/todaysAuction", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
-
-    # Wait a bit more for dynamic content
-    await asyncio.sleep(5)
+    # Ready once the auction links have rendered - no extra wait for dynamic content
+    await goto_ready(page, "https://www.copart.com/todaysAuction", COPART_TODAYS_AUCTIONS)
 
     # Try multiple selectors for auction links
     selectors = [
@@ -283,22 +258,12 @@ async def navigate_to_todays_auctions_and_open_first(page):
         '.auction-item a'
     ]
 
-    first_auction = None
-    for selector in selectors:
-        try:
-            locator = page.locator(selector).first
-            if await locator.is_visible(timeout=5000):
-                first_auction = locator
-                print(f"Found auction link with selector: {selector}")
-                break
-        except:
-            continue
-
+    selector, first_auction = await race_selectors(page, selectors, timeout=5000)
     if first_auction:
+        print(f"Found auction link with selector: {selector}")
         href = await first_auction.get_attribute('href')
         print(f"Opening first auction: {href}")
-        await first_auction.click()
-        await page.wait_for_load_state('networkidle', timeout=60000)
+        await click_ready(page, first_auction, OPENED_AUCTION)
         print("First auction opened successfully")
         return True
     else:
@@ -49,6 +49,11 @@ import os
 import base64
 import requests
 from pathlib import Path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auction_monitor'))
+from navigation import (goto_ready, click_ready, IAAI_DASHBOARD, IAAI_LOGIN, IAAI_LIVE_CALENDAR, IAAI_SALE_LIST,
+                        IAAI_LIVE_AUCTION)
 
 # hCaptcha Challenger integration
 try:
@@ -1629,12 +1634,9 @@ async def login_to_iaai(page):
     for attempt in range(max_retries):
         try:
             print(f"Navigating to IAAI dashboard (attempt {attempt + 1}/{max_retries})...")
-            response = await page.goto("https://www.iaai.com/Dashboard/Default", timeout=60000)  # 2 minutes
-            print(f"Response status: {response.status if response else 'No response'}")
+            # Ready on the dashboard, after a redirect to login, or once a CAPTCHA has rendered
             print("Waiting for page to load...")
-            await page.wait_for_load_state('domcontentloaded', timeout=30000)
-            # Wait a bit more for dynamic content and potential redirect
-            await asyncio.sleep(5)  # Increased wait time for CAPTCHA to load
+            await goto_ready(page, "https://www.iaai.com/Dashboard/Default", IAAI_DASHBOARD)
 
             # Check for CAPTCHA immediately after navigation
             print("Checking for CAPTCHA on dashboard page...")
@@ -1701,9 +1703,7 @@ async def login_to_iaai(page):
                 # If we're not on login page or dashboard, try direct navigation to login
                 if attempt == max_retries - 1:
                     print("Trying direct navigation to login page...")
-                    response = await page.goto("https://login.iaai.com/Identity/Account/Login", timeout=60000)
-                    await page.wait_for_load_state('domcontentloaded', timeout=30000)
-                    await asyncio.sleep(2)
+                    await goto_ready(page, "https://login.iaai.com/Identity/Account/Login", IAAI_LOGIN)
                 break
 
         except Exception as e:
@@ -2032,11 +2032,8 @@ async def navigate_to_live_auctions_calendar(page):
 
         if live_auctions_link:
             print("Clicking Live Auctions link...")
-            await live_auctions_link.click()
-            await page.wait_for_load_state('networkidle', timeout=60000)
-
-            # Wait for dynamic content
-            await asyncio.sleep(5)
+            # Ready once auctions (or a captcha) are on the calendar page - no fixed wait for dynamic content
+            await click_ready(page, live_auctions_link, IAAI_LIVE_CALENDAR)
 
             # Check for CAPTCHA on calendar page
             print("Checking for CAPTCHA on calendar page...")
@@ -2067,11 +2064,7 @@ async def navigate_to_live_auctions_calendar(page):
         print("Could not find Auctions menu, trying direct navigation...")
 
     # Fallback to direct navigation
-    await page.goto("https://www.iaai.com/LiveAuctionsCalendar", timeout=60000)
-    await page.wait_for_load_state('networkidle', timeout=60000)
-
-    # Wait for dynamic content
-    await asyncio.sleep(5)
+    await goto_ready(page, "https://www.iaai.com/LiveAuctionsCalendar", IAAI_LIVE_CALENDAR)
 
     # Check for CAPTCHA on calendar page
     print("Checking for CAPTCHA on calendar page...")
@@ -2157,8 +2150,7 @@ async def find_first_auction_and_view_sale_list(page):
 
         if sale_list_link:
             print("Clicking View Sale List...")
-            await sale_list_link.click()
-            await page.wait_for_load_state('networkidle', timeout=60000)
+            await click_ready(page, sale_list_link, IAAI_SALE_LIST)
             print("Sale list opened successfully")
             return True
         else:
@@ -2202,8 +2194,7 @@ async def click_join_auction(page):
             join_btn = page.locator(selector).first
             if await join_btn.is_visible(timeout=5000):
                 print(f"Found Join Auction button with selector: {selector}")
-                await join_btn.click()
-                await page.wait_for_load_state('networkidle', timeout=60000)
+                await click_ready(page, join_btn, IAAI_LIVE_AUCTION)
                 print("Join Auction clicked successfully")
                 return True
         except:
@@ -2449,9 +2440,7 @@ async def test_captcha_resolution():
 
         try:
             print("Step 1: Navigate to IAAI dashboard to potentially trigger CAPTCHA")
-            await page.goto("https://www.iaai.com/Dashboard/Default", timeout=60000)
-            await page.wait_for_load_state('domcontentloaded', timeout=30000)
-            await asyncio.sleep(3)
+            await goto_ready(page, "https://www.iaai.com/Dashboard/Default", IAAI_DASHBOARD)
 
             # Check for initial CAPTCHA
             print("Step 2: Check for CAPTCHA on initial page load")